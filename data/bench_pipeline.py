@@ -0,0 +1,242 @@
+"""
+Offline benchmarks for pipeline stages against synthetic fixtures.
+
+Times fetch_oews, fetch_projections, fetch_onet, combine, validate, the
+history store build, trend features, the O*NET skill matrix and its top-K
+similarity, batch profile scoring (BENCH_PROFILES synthetic users) and both
+seeders (export mode, no Supabase) at each requested scale. Fixtures are
+generated on first use by synthetic_data.py and reused afterwards, so the
+suite needs no network access.
+
+Usage:
+  python bench_pipeline.py [--scale 1,10] [--rounds 3] [--only fetch_oews,combine]
+                           [--json results.json]
+
+Each benchmark reports min / median / mean seconds over `rounds` runs, in the
+spirit of pytest-benchmark, plus the number of items it produced.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, redirect_stdout
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import fetch_bls
+import fetch_onet
+import history_store
+import profile_recommendations
+import skill_similarity
+import seed_supabase
+import synthetic_data
+import trend_features
+from career_record import records_to_rows
+from collect_all import combine_all
+from validate_data import validate_careers
+
+BENCH_PROFILES = 100_000
+
+
+class BenchContext:
+    """Fixture paths and cached stage outputs shared by the benchmarks."""
+
+    def __init__(self, fixture_dir, out_dir):
+        self.fixture_dir = fixture_dir
+        self.out_dir = out_dir
+        info = synthetic_data.load_fixture_info(fixture_dir)
+        self.soc_codes = info["soc_codes"]
+        self.mapping = synthetic_data.synthetic_career_mapping(self.soc_codes)
+        self._cache = {}
+
+        # Point the fetchers at the fixtures; download_file skips existing files
+        fetch_bls.RAW_DIR = fixture_dir
+        fetch_onet.RAW_DIR = fixture_dir
+        # Seeders always run in export mode here
+        seed_supabase.SUPABASE_URL = None
+        seed_supabase.RAW_DIR = out_dir
+
+    def cached(self, key, fn):
+        if key not in self._cache:
+            with quiet():
+                self._cache[key] = fn()
+        return self._cache[key]
+
+    def sources(self):
+        oews = self.cached("oews", lambda: fetch_bls.fetch_oews(self.mapping))
+        proj = self.cached("projections", lambda: fetch_bls.fetch_projections(self.mapping))
+        onet = self.cached("onet", lambda: fetch_onet.fetch_onet(self.mapping))
+        return oews, proj, onet
+
+    def records(self):
+        def build():
+            oews, proj, onet = self.sources()
+            return combine_all(self.mapping, oews, proj, onet, {}, {}, {})
+        return self.cached("records", build)
+
+    def historical(self):
+        return self.cached("historical", lambda: synthetic_data.synthetic_historical(self.soc_codes))
+
+    def history_store(self):
+        return self.cached("history_store", lambda: history_store.HistoryStore.build(
+            self.historical(), directory=os.path.join(self.out_dir, "history")))
+
+    def profiles(self):
+        return self.cached("profiles", lambda: synthetic_data.synthetic_profiles(BENCH_PROFILES))
+
+    def skill_matrix(self):
+        return self.cached("skill_matrix", lambda: skill_similarity.SkillMatrix.build(
+            os.path.join(self.fixture_dir, "onet_database.zip"), directory=os.path.join(self.out_dir, "skills")))
+
+
+@contextmanager
+def quiet():
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        yield
+
+
+def bench_fetch_oews(ctx):
+    return lambda: fetch_bls.fetch_oews(ctx.mapping)
+
+
+def bench_fetch_projections(ctx):
+    return lambda: fetch_bls.fetch_projections(ctx.mapping)
+
+
+def bench_fetch_onet(ctx):
+    return lambda: fetch_onet.fetch_onet(ctx.mapping)
+
+
+def bench_combine(ctx):
+    oews, proj, onet = ctx.sources()
+    return lambda: combine_all(ctx.mapping, oews, proj, onet, {}, {}, {})
+
+
+def bench_validate(ctx):
+    records = ctx.records()
+
+    def run():
+        validate_careers(records)
+        return records
+    return run
+
+
+def bench_seed_careers(ctx):
+    records = ctx.records()
+
+    def run():
+        seed_supabase.seed_careers(records)
+        return records
+    return run
+
+
+def bench_history_store(ctx):
+    historical = ctx.historical()
+    directory = os.path.join(ctx.out_dir, "history_bench")
+    return lambda: history_store.HistoryStore.build(historical, directory=directory).socs
+
+
+def bench_trend_features(ctx):
+    store = ctx.history_store()
+    return lambda: trend_features.career_features(store, ctx.mapping)
+
+
+def bench_skill_matrix(ctx):
+    zip_path = os.path.join(ctx.fixture_dir, "onet_database.zip")
+    directory = os.path.join(ctx.out_dir, "skills_bench")
+    return lambda: skill_similarity.SkillMatrix.build(zip_path, directory=directory).socs
+
+
+def bench_skill_similarity(ctx):
+    matrix = ctx.skill_matrix()
+    return lambda: skill_similarity.career_similarities(matrix, ctx.mapping)
+
+
+def bench_profile_recommendations(ctx):
+    features = profile_recommendations.CareerFeatures(records_to_rows(ctx.records()))
+    profiles = ctx.profiles()
+    return lambda: profile_recommendations.recommendation_rows(profiles, features)
+
+
+def bench_seed_market_trends(ctx):
+    store = ctx.history_store()
+
+    def run():
+        seed_supabase.seed_market_trends(store, ctx.mapping)
+        return store.socs
+    return run
+
+
+BENCHMARKS = [
+    ("fetch_oews", bench_fetch_oews),
+    ("fetch_projections", bench_fetch_projections),
+    ("fetch_onet", bench_fetch_onet),
+    ("combine", bench_combine),
+    ("validate", bench_validate),
+    ("seed_careers", bench_seed_careers),
+    ("history_store", bench_history_store),
+    ("trend_features", bench_trend_features),
+    ("skill_matrix", bench_skill_matrix),
+    ("skill_similarity", bench_skill_similarity),
+    ("recommendations", bench_profile_recommendations),
+    ("seed_market_trends", bench_seed_market_trends),
+]
+
+
+def run_benchmark(name, setup, ctx, rounds):
+    fn = setup(ctx)
+    timings = []
+    result = None
+    for _ in range(rounds):
+        with quiet():
+            started = time.perf_counter()
+            result = fn()
+            timings.append(time.perf_counter() - started)
+    return {
+        "benchmark": name,
+        "rounds": rounds,
+        "min_s": round(min(timings), 4),
+        "median_s": round(statistics.median(timings), 4),
+        "mean_s": round(statistics.mean(timings), 4),
+        "items": len(result) if hasattr(result, "__len__") else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark pipeline stages on synthetic fixtures")
+    parser.add_argument("--scale", default="1", help="Comma-separated fixture scales (1, 10, 100)")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--only", help="Comma-separated benchmark names")
+    parser.add_argument("--fixtures", default=synthetic_data.FIXTURES_DIR)
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    args = parser.parse_args(argv)
+
+    only = set(args.only.split(",")) if args.only else None
+    results = []
+    for scale in [int(s) for s in args.scale.split(",")]:
+        fixture_dir = synthetic_data.generate(scale, args.fixtures)
+        with tempfile.TemporaryDirectory() as out_dir:
+            ctx = BenchContext(fixture_dir, out_dir)
+            print(f"\n--- Scale {scale}x ({len(ctx.soc_codes):,} occupations) ---")
+            print(f"  {'benchmark':<20} {'min':>9} {'median':>9} {'mean':>9} {'items':>8}")
+            for name, setup in BENCHMARKS:
+                if only and name not in only:
+                    continue
+                r = run_benchmark(name, setup, ctx, args.rounds)
+                r["scale"] = scale
+                results.append(r)
+                print(f"  {name:<20} {r['min_s']:>8.3f}s {r['median_s']:>8.3f}s "
+                      f"{r['mean_s']:>8.3f}s {r['items'] or 0:>8,}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n  [saved] {args.json_path}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Shared headless Chromium for the Playwright scrapers.
+
+Chromium is launched once per process, on first use, in a background event
+loop. Scrapers borrow isolated browser contexts from the pool instead of
+starting their own Playwright session, so only the first scraper pays the
+cold start and several scrapers can run side by side:
+
+    async def scrape(url):
+        async with browser_pool.context() as ctx:
+            page = await ctx.new_page()
+            ...
+
+    result = browser_pool.run(scrape(url))             # blocks until done
+    future = browser_pool.submit(scrape(url))          # concurrent.futures.Future
+
+A returned context has its cookies, permissions and routes cleared before the
+next scraper gets it, and is closed after BROWSER_CONTEXT_USES checkouts.
+At most BROWSER_MAX_CONTEXTS contexts are open at once; further checkouts wait.
+The browser is closed at exit (or with close()).
+"""
+import asyncio
+import atexit
+import contextlib
+import os
+import threading
+
+BROWSER_CONTEXT_USES = int(os.getenv("BROWSER_CONTEXT_USES", "20"))
+BROWSER_MAX_CONTEXTS = int(os.getenv("BROWSER_MAX_CONTEXTS", "4"))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class BrowserPool:
+    """One Chromium, many short-lived contexts, driven from a private event loop."""
+
+    def __init__(self, max_uses=BROWSER_CONTEXT_USES, max_contexts=BROWSER_MAX_CONTEXTS):
+        self.max_uses = max_uses
+        self.max_contexts = max_contexts
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="browser-pool", daemon=True)
+        self.thread.start()
+        self.stats = {"launches": 0, "contexts_created": 0, "contexts_reused": 0, "contexts_recycled": 0}
+        self._playwright = None
+        self._browser = None
+        self._idle = []     # [(context, uses)]
+        self._launch_lock = None
+        self._slots = None
+
+    # -- called on the pool's loop --------------------------------------------
+
+    async def _ensure_browser(self):
+        if self._launch_lock is None:
+            self._launch_lock = asyncio.Lock()
+            self._slots = asyncio.Semaphore(self.max_contexts)
+        async with self._launch_lock:
+            if self._browser is None or not self._browser.is_connected():
+                from playwright.async_api import async_playwright
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                print("  [browser] Launching shared Chromium")
+                self._browser = await self._playwright.chromium.launch(headless=True)
+                self._idle.clear()
+                self.stats["launches"] += 1
+        return self._browser
+
+    async def _checkout(self, **context_options):
+        browser = await self._ensure_browser()
+        await self._slots.acquire()
+        try:
+            if not context_options and self._idle:
+                self.stats["contexts_reused"] += 1
+                return self._idle.pop()
+            self.stats["contexts_created"] += 1
+            return await browser.new_context(**context_options), 0
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def _release(self, context, uses, reusable):
+        try:
+            uses += 1
+            if reusable and uses < self.max_uses and self._browser.is_connected():
+                try:
+                    await context.unroute_all(behavior="ignoreErrors")
+                    await context.clear_cookies()
+                    await context.clear_permissions()
+                    for page in context.pages:
+                        await page.close()
+                    self._idle.append((context, uses))
+                    return
+                except Exception:
+                    pass
+            if uses >= self.max_uses:
+                self.stats["contexts_recycled"] += 1
+            with contextlib.suppress(Exception):
+                await context.close()
+        finally:
+            self._slots.release()
+
+    @contextlib.asynccontextmanager
+    async def context(self, **context_options):
+        """Borrow an isolated BrowserContext. Must be used from run()/submit() coroutines.
+
+        Contexts created with options (viewport, user agent, ...) are not reused.
+        """
+        context, uses = await self._checkout(**context_options)
+        try:
+            yield context
+        finally:
+            await self._release(context, uses, reusable=not context_options)
+
+    async def _close(self):
+        for context, _ in self._idle:
+            with contextlib.suppress(Exception):
+                await context.close()
+        self._idle.clear()
+        if self._browser is not None:
+            with contextlib.suppress(Exception):
+                await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            with contextlib.suppress(Exception):
+                await self._playwright.stop()
+            self._playwright = None
+
+    # -- called from any thread -----------------------------------------------
+
+    def submit(self, coro):
+        """Schedule a coroutine on the pool's loop. Returns a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro):
+        """Run a coroutine on the pool's loop and wait for its result."""
+        future = self.submit(coro)
+        try:
+            return future.result()
+        except BaseException:
+            # e.g. DeadlineExceeded raised on the waiting thread
+            future.cancel()
+            raise
+
+    def close(self):
+        if not self.loop.is_running():
+            return
+        with contextlib.suppress(Exception):
+            self.submit(self._close()).result(timeout=30)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=5)
+
+
+def pool():
+    """Process-wide BrowserPool, created on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            atexit.register(_pool.close)
+        return _pool
+
+
+def context(**context_options):
+    return pool().context(**context_options)
+
+
+def submit(coro):
+    return pool().submit(coro)
+
+
+def run(coro):
+    return pool().run(coro)
+
+
+def close():
+    """Close the shared browser (a later call to pool() starts a new one)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
@@ -0,0 +1,161 @@
+"""
+Typed, compact career record shared by combine, validate and seed.
+
+CareerRecord mirrors the pipeline-owned columns of the `careers` table
+(see supabase/schema.sql). AI content columns (ai_*) and timestamps are
+owned by generate_ai_content.py / the database and are never written here,
+so upserts leave them untouched.
+
+Records use __slots__ instead of a per-instance __dict__, which keeps a
+full-OEWS-scale catalog (~800 occupations and beyond) small in memory.
+
+Run: python career_record.py   (memory comparison vs plain dicts)
+"""
+import json
+import sys
+
+# Column order matches the dict records the pipeline has always exported
+CAREER_FIELDS = (
+    "id", "title", "path_type", "category",
+    # Compensation
+    "salary_entry", "salary_year3", "salary_year5", "salary_year10",
+    "salary_median", "salary_p25", "salary_p75", "salary_p90",
+    "employment_total", "salary_source",
+    # Market data
+    "growth_rate", "growth_rate_numeric", "annual_openings", "minimum_degree",
+    "current_openings", "openings_source",
+    # O*NET
+    "description", "skills", "interests",
+    "layoff_risk",
+    # Static metadata from career_mapping.json
+    "preferred_majors", "alternative_paths", "work_style", "industries",
+    "typical_employers", "work_life_balance", "remote_options",
+    "geographic_concentration", "certifications", "experience",
+    "typical_path", "time_to_promotion", "career_ceiling",
+    "related_paths", "is_trending",
+)
+
+# Defaults for columns that are NOT NULL-ish in practice
+FIELD_DEFAULTS = {
+    "layoff_risk": "medium",
+    "is_trending": False,
+}
+
+LIST_FIELDS = frozenset((
+    "skills", "interests", "preferred_majors", "alternative_paths",
+    "work_style", "industries", "typical_employers",
+    "geographic_concentration", "certifications", "related_paths",
+))
+
+# Low-cardinality text columns; interning shares one string per value
+INTERNED_FIELDS = frozenset((
+    "path_type", "category", "salary_source", "growth_rate", "minimum_degree",
+    "openings_source", "layoff_risk", "remote_options",
+))
+
+
+class CareerRecord:
+    """One row of the `careers` table, as produced by the pipeline."""
+
+    __slots__ = CAREER_FIELDS
+
+    def __init__(self, **fields):
+        for name in CAREER_FIELDS:
+            value = fields.pop(name, FIELD_DEFAULTS.get(name))
+            if name in LIST_FIELDS and value is None:
+                value = []
+            elif name in INTERNED_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(self, name, value)
+        if fields:
+            raise TypeError(f"Unknown career fields: {', '.join(sorted(fields))}")
+
+    @classmethod
+    def from_row(cls, row):
+        """Build a record from a DB row or export dict, ignoring extra columns."""
+        return cls(**{k: v for k, v in row.items() if k in cls.__slots__})
+
+    def get(self, name, default=None):
+        """dict.get-compatible accessor so existing consumers keep working."""
+        return getattr(self, name, default)
+
+    def update(self, fields):
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    def to_row(self):
+        """Dict ready for a Supabase upsert."""
+        return {name: getattr(self, name) for name in CAREER_FIELDS}
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_row(), **kwargs)
+
+    def __eq__(self, other):
+        if not isinstance(other, CareerRecord):
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in CAREER_FIELDS)
+
+    def __repr__(self):
+        return f"CareerRecord(id={self.id!r}, title={self.title!r})"
+
+
+def records_to_rows(records):
+    return [r.to_row() for r in records]
+
+
+def records_from_rows(rows):
+    return [CareerRecord.from_row(r) for r in rows]
+
+
+def _sample_row(i):
+    return {
+        "id": f"career-{i}", "title": f"Career {i}",
+        "path_type": "industry-job", "category": "tech",
+        "salary_entry": 70000 + i, "salary_year3": 90000 + i,
+        "salary_year5": 110000 + i, "salary_year10": 140000 + i,
+        "salary_median": 95000 + i, "salary_p25": 72000 + i,
+        "salary_p75": 125000 + i, "salary_p90": 160000 + i,
+        "employment_total": 100000 + i, "salary_source": "BLS OEWS May 2024",
+        "growth_rate": "8%", "growth_rate_numeric": 8, "annual_openings": 12000 + i,
+        "minimum_degree": "Bachelor's degree", "current_openings": 9000 + i,
+        "openings_source": "Adzuna API",
+        "description": f"Description for career {i}",
+        "skills": ["Programming", "Critical Thinking"], "interests": ["Investigative"],
+        "layoff_risk": "low", "preferred_majors": ["Computer Science"],
+        "alternative_paths": [], "work_style": ["analytical"], "industries": ["Technology"],
+        "typical_employers": [], "work_life_balance": "Good", "remote_options": "hybrid",
+        "geographic_concentration": [], "certifications": [], "experience": None,
+        "typical_path": None, "time_to_promotion": None, "career_ceiling": None,
+        "related_paths": [], "is_trending": False,
+    }
+
+
+def compare_memory(n):
+    """Return (dict_bytes, record_bytes) for n records, measured with tracemalloc."""
+    import tracemalloc
+
+    # Rows are rebuilt from JSON so neither side shares string objects
+    payload = json.dumps([_sample_row(i) for i in range(n)])
+
+    tracemalloc.start()
+    rows = json.loads(payload)
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del rows
+
+    tracemalloc.start()
+    records = [CareerRecord.from_row(r) for r in json.loads(payload)]
+    record_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+
+    return dict_bytes, record_bytes
+
+
+if __name__ == "__main__":
+    print("CareerRecord vs dict memory (tracemalloc, retained bytes)")
+    for n in (1000, 10000):
+        dict_bytes, record_bytes = compare_memory(n)
+        print(f"  {n:>6,} records: dict {dict_bytes / 1024:,.0f} KB, "
+              f"CareerRecord {record_bytes / 1024:,.0f} KB "
+              f"({record_bytes / dict_bytes:.0%})")
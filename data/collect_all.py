@@ -1,10 +1,29 @@
 """
 Master data collection orchestrator.
-Run: python collect_all.py
+Run: python collect_all.py [--stages a,b] [--from stage] [--force] [--list]
+                           [--trace-memory] [--prom-file path] [--profile stages]
+                           [--budgets source=seconds,...]
+                           [--stale-only] [--ttls source=duration,...]
 
 Combines data from BLS, O*NET, Adzuna, levels.fyi, and layoffs.fyi
 to produce 35 career records and seed them into Supabase.
+
+The run is a DAG of named stages (see STAGES) whose outputs are checkpointed
+to data/raw/artifacts/. If a late stage fails, resume it without re-fetching:
+  python collect_all.py --from seed
+
+Every external source runs under a time budget (see deadlines.py); a source
+that runs out serves its last good result or compiled fallback, and the
+summary lists which sources hit their deadline.
+
+--stale-only refetches only sources whose TTL has expired (see freshness.py)
+and reseeds only careers whose rows changed; refresh.py runs it on a schedule.
+
+Edits to career_mapping.json or SALARY_OVERRIDES are applied incrementally
+(see incremental.py): only new SOC codes are fetched and only affected careers
+are recombined and reseeded. --force rebuilds everything.
 """
+import argparse
 import json
 import os
 import sys
@@ -12,14 +31,32 @@ import sys
 # Add parent dir to path
 sys.path.insert(0, os.path.dirname(__file__))
 
-from fetch_bls import load_career_mapping, get_oews_data, get_projections_data
-from fetch_onet import get_onet_data
-from fetch_job_openings import get_job_openings
+from fetch_bls import load_career_mapping, get_oews_data, get_projections_data, fetch_oews, fetch_projections
+from fetch_onet import get_onet_data, fetch_onet
+from fetch_job_openings import get_job_openings, fetch_job_openings
 from scrape_levels import get_levels_data
 from scrape_layoffs import get_layoff_data
-from fetch_bls_history import get_historical_data
+from fetch_bls_history import get_historical_data, fetch_from_bls
+import fetch_bls_history
 from validate_data import validate_careers
-from seed_supabase import seed_careers, seed_market_trends
+from seed_supabase import (save_careers_export, seed_careers, seed_market_trends, seed_market_aggregates,
+                           seed_trend_features, seed_skill_similarities, seed_career_transitions, seed_term_index)
+from career_record import CareerRecord
+from pipeline import (ArtifactStore, Stage, StageError, compute_fingerprint, downstream_of,
+                      run_pipeline, select_stages, topo_order)
+from metrics import RunMetrics
+from profiling import PROFILE_ENV, make_profiler
+import deadlines
+import fallbacks
+import freshness
+import incremental
+import history_store
+import market_aggregates
+import skill_similarity
+import snapshot_bundles
+import term_index
+import trend_features
+import transition_graph
 
 def estimate_salary_trajectory(oews_entry):
     """Estimate salary trajectory from BLS percentile data."""
@@ -140,192 +177,585 @@ SALARY_OVERRIDES = {
 }
 
 def combine_career_data(career_id, career_info, oews, projections, onet, openings, levels, layoffs):
-    """Combine all data sources into a single career record."""
+    """Combine all data sources into a single CareerRecord."""
     soc = career_info["soc_code"]
 
     # Start with mapping metadata
-    record = {
-        "id": career_id,
-        "title": career_info["title"],
-        "path_type": career_info["path_type"],
-        "category": career_info["category"],
-    }
+    record = CareerRecord(
+        id=career_id,
+        title=career_info["title"],
+        path_type=career_info["path_type"],
+        category=career_info["category"],
+    )
 
     # BLS OEWS (salary + employment)
     oews_data = oews.get(soc, {})
     trajectory = estimate_salary_trajectory(oews_data)
     record.update(trajectory)
-    record["employment_total"] = oews_data.get("employment")
+    record.employment_total = oews_data.get("employment")
 
     # Apply career-specific salary trajectory overrides
     if career_id in SALARY_OVERRIDES:
         overrides = SALARY_OVERRIDES[career_id]
         record.update(overrides)
         # Set median to year3 value if not already set from BLS
-        if not record.get("salary_median"):
-            record["salary_median"] = overrides.get("salary_year3")
-        record["salary_source"] = "BLS OEWS 2024 + research estimates"
+        if not record.salary_median:
+            record.salary_median = overrides.get("salary_year3")
+        record.salary_source = "BLS OEWS 2024 + research estimates"
 
     # Ensure salary_median is never None — use year3 as fallback
-    if not record.get("salary_median") and record.get("salary_year3"):
-        record["salary_median"] = record["salary_year3"]
+    if not record.salary_median and record.salary_year3:
+        record.salary_median = record.salary_year3
 
     # Override tech salaries with levels.fyi if available
     if career_id in levels:
         tech_comp = levels[career_id]
         # levels.fyi reflects total comp - use as median, adjust others
-        if tech_comp and record.get("salary_median"):
-            ratio = tech_comp / record["salary_median"] if record["salary_median"] else 1
-            record["salary_median"] = tech_comp
-            if record.get("salary_entry"):
-                record["salary_entry"] = int(record["salary_entry"] * ratio)
-            if record.get("salary_year3"):
-                record["salary_year3"] = tech_comp
-            if record.get("salary_year5"):
-                record["salary_year5"] = int(record["salary_year5"] * ratio)
-            if record.get("salary_year10"):
-                record["salary_year10"] = int(record["salary_year10"] * ratio)
-            record["salary_source"] = "BLS OEWS 2024 + levels.fyi"
+        if tech_comp and record.salary_median:
+            ratio = tech_comp / record.salary_median if record.salary_median else 1
+            record.salary_median = tech_comp
+            if record.salary_entry:
+                record.salary_entry = int(record.salary_entry * ratio)
+            if record.salary_year3:
+                record.salary_year3 = tech_comp
+            if record.salary_year5:
+                record.salary_year5 = int(record.salary_year5 * ratio)
+            if record.salary_year10:
+                record.salary_year10 = int(record.salary_year10 * ratio)
+            record.salary_source = "BLS OEWS 2024 + levels.fyi"
         else:
-            record["salary_source"] = "levels.fyi"
+            record.salary_source = "levels.fyi"
     else:
-        record["salary_source"] = "BLS OEWS May 2024"
+        record.salary_source = "BLS OEWS May 2024"
 
     # BLS Projections (growth + openings)
     proj_data = projections.get(soc, {})
-    record["growth_rate"] = proj_data.get("growth_rate")
-    record["growth_rate_numeric"] = proj_data.get("growth_rate_numeric")
-    record["annual_openings"] = proj_data.get("annual_openings")
-    record["minimum_degree"] = proj_data.get("minimum_degree") or career_info.get("minimum_degree")
+    record.growth_rate = proj_data.get("growth_rate")
+    record.growth_rate_numeric = proj_data.get("growth_rate_numeric")
+    record.annual_openings = proj_data.get("annual_openings")
+    record.minimum_degree = proj_data.get("minimum_degree") or career_info.get("minimum_degree")
 
     # Job openings (Adzuna or fallback)
-    record["current_openings"] = openings.get(career_id)
-    record["openings_source"] = "Adzuna API" if openings.get(career_id) else "BLS Projections (annual estimate)"
+    record.current_openings = openings.get(career_id)
+    record.openings_source = "Adzuna API" if openings.get(career_id) else "BLS Projections (annual estimate)"
 
     # O*NET (description, skills, interests)
     onet_data = onet.get(soc, {})
-    record["description"] = onet_data.get("description", f"Career in {career_info['category']}")
-    record["skills"] = onet_data.get("skills", [])
-    record["interests"] = onet_data.get("interests", [])
+    record.description = onet_data.get("description", f"Career in {career_info['category']}")
+    record.skills = onet_data.get("skills", [])
+    record.interests = onet_data.get("interests", [])
 
     # Layoff risk
-    record["layoff_risk"] = layoffs.get(career_id, "medium")
+    record.layoff_risk = layoffs.get(career_id, "medium")
 
     # Static metadata from career_mapping
-    record["preferred_majors"] = career_info.get("preferred_majors", [])
-    record["alternative_paths"] = career_info.get("alternative_paths", [])
-    record["work_style"] = career_info.get("work_style", [])
-    record["industries"] = career_info.get("industries", [])
-    record["typical_employers"] = career_info.get("typical_employers", [])
-    record["work_life_balance"] = career_info.get("work_life_balance")
-    record["remote_options"] = career_info.get("remote_options")
-    record["geographic_concentration"] = career_info.get("geographic_concentration", [])
-    record["certifications"] = career_info.get("certifications", [])
-    record["experience"] = career_info.get("experience")
-    record["typical_path"] = career_info.get("typical_path")
-    record["time_to_promotion"] = career_info.get("time_to_promotion")
-    record["career_ceiling"] = career_info.get("career_ceiling")
-    record["related_paths"] = career_info.get("related_paths", [])
-    record["is_trending"] = career_info.get("is_trending", False)
+    record.preferred_majors = career_info.get("preferred_majors", [])
+    record.alternative_paths = career_info.get("alternative_paths", [])
+    record.work_style = career_info.get("work_style", [])
+    record.industries = career_info.get("industries", [])
+    record.typical_employers = career_info.get("typical_employers", [])
+    record.work_life_balance = career_info.get("work_life_balance")
+    record.remote_options = career_info.get("remote_options")
+    record.geographic_concentration = career_info.get("geographic_concentration", [])
+    record.certifications = career_info.get("certifications", [])
+    record.experience = career_info.get("experience")
+    record.typical_path = career_info.get("typical_path")
+    record.time_to_promotion = career_info.get("time_to_promotion")
+    record.career_ceiling = career_info.get("career_ceiling")
+    record.related_paths = career_info.get("related_paths", [])
+    record.is_trending = career_info.get("is_trending", False)
 
     return record
 
-def main():
-    print("=" * 60)
-    print("PathIQ Data Collection Pipeline")
-    print("=" * 60)
-
-    # Load master career mapping
-    career_mapping = load_career_mapping()
-    print(f"\nLoaded {len(career_mapping)} careers from career_mapping.json")
+def combine_all(career_mapping, oews, projections, onet, openings, levels, layoffs):
+    """Combine every career in the mapping. Returns a list of CareerRecords."""
+    careers_data = []
+    for career_id, career_info in career_mapping.items():
+        record = combine_career_data(
+            career_id, career_info, oews, projections, onet, openings, levels, layoffs
+        )
+        careers_data.append(record)
+        print(f"  {career_id}: ${record.salary_median or 0:,} median, "
+              f"{record.growth_rate or 'N/A'} growth")
+    return careers_data
 
-    # Collect data from all sources
-    sources = {}
 
-    # Required sources
+def print_section(title):
     print("\n" + "=" * 40)
-    print("REQUIRED SOURCES")
+    print(title)
     print("=" * 40)
 
-    oews = get_oews_data(career_mapping)
-    sources["BLS OEWS"] = len(oews) > 0
 
-    projections = get_projections_data(career_mapping)
-    sources["BLS Projections"] = len(projections) > 0
+def stage_combine(catalog, fetch_oews, fetch_projections, fetch_onet,
+                  fetch_openings, fetch_levels, fetch_layoffs):
+    print_section("COMBINING DATA")
+    if PLAN and PLAN.combine_is_partial():
+        records = PLAN.patch_records(lambda career_id, info: combine_career_data(
+            career_id, info, fetch_oews, fetch_projections, fetch_onet,
+            fetch_openings, fetch_levels, fetch_layoffs["risk"]))
+    else:
+        records = combine_all(catalog, fetch_oews, fetch_projections, fetch_onet,
+                              fetch_openings, fetch_levels, fetch_layoffs["risk"])
+    # validate_data.py and seed_supabase.py read the export, so it follows every combine
+    save_careers_export(records)
+    print(f"  [saved] {len(records)} careers to careers_export.json")
+    return records
 
-    onet = get_onet_data(career_mapping)
-    sources["O*NET"] = len(onet) > 0
 
-    # Optional sources
-    print("\n" + "=" * 40)
-    print("OPTIONAL SOURCES")
-    print("=" * 40)
+def stage_validate(combine):
+    print_section("VALIDATING DATA")
+    warnings = validate_careers(combine)
+    if warnings:
+        print(f"  [warn] {len(warnings)} validation warnings (see above)")
+    else:
+        print("  [ok] All data passed validation")
+    return warnings
 
-    openings = get_job_openings(career_mapping)
-    sources["Adzuna"] = len(openings) > 0
 
-    levels = get_levels_data(career_mapping)
-    sources["levels.fyi"] = len(levels) > 0
+def stage_seed(combine, validate):
+    print_section("SEEDING DATABASE")
+    return seed_careers(combine, changed_only=not RESEED_ALL)
 
-    layoffs, layoffs_live = get_layoff_data(career_mapping)
-    if layoffs_live:
-        sources["layoffs.fyi"] = True
-    else:
-        sources["layoffs.fyi (fallback)"] = True
 
-    historical = get_historical_data(career_mapping)
-    sources["BLS Historical"] = len(historical) > 0
+def stage_history_store(history):
+    store = history_store.HistoryStore.build(history)
+    print(f"  [saved] History store: {len(store)} SOC codes x {len(store.years)} years "
+          f"-> {os.path.relpath(store.directory)}")
+    return store.index
 
-    # Combine all data
-    print("\n" + "=" * 40)
-    print("COMBINING DATA")
-    print("=" * 40)
 
-    careers_data = []
-    for career_id, career_info in career_mapping.items():
-        record = combine_career_data(
-            career_id, career_info, oews, projections, onet, openings, levels, layoffs
-        )
-        careers_data.append(record)
-        print(f"  {career_id}: ${record.get('salary_median', 0):,} median, "
-              f"{record.get('growth_rate', 'N/A')} growth")
+def stage_trend_features(history_store, catalog):
+    print_section("COMPUTING TREND FEATURES")
+    rows = trend_features.career_features(open_history_store(), catalog)
+    print(f"  [done] Trend features for {len(rows)}/{len(catalog)} careers")
+    return rows
 
-    # Validate data
-    print("\n" + "=" * 40)
-    print("VALIDATING DATA")
-    print("=" * 40)
 
-    warnings = validate_careers(careers_data)
-    if warnings:
-        print(f"  [warn] {len(warnings)} validation warnings (see above)")
-    else:
-        print("  [ok] All data passed validation")
+def stage_seed_trend_features(trend_features):
+    if not trend_features:
+        return False
+    return seed_trend_features(trend_features)
+
+
+def stage_aggregates(combine, validate):
+    print_section("COMPUTING MARKET AGGREGATES")
+    aggregates = market_aggregates.compute_aggregates(combine)
+    if aggregates:
+        market_aggregates.print_aggregates(aggregates)
+    return aggregates
+
+
+def stage_seed_aggregates(aggregates):
+    if not aggregates:
+        return False
+    return seed_market_aggregates(aggregates)
+
+
+def stage_skill_matrix(fetch_onet):
+    try:
+        matrix = skill_similarity.SkillMatrix.build()
+    except skill_similarity.SkillMatrixError as e:
+        # Compiled O*NET fallbacks carry skill names only, no ratings
+        print(f"  [warn] {e}; skipping skill similarity")
+        return None
+    print(f"  [saved] Skill matrix: {len(matrix)} SOC codes x {len(matrix.elements)} elements "
+          f"({', '.join(matrix.index['sheets'])}) -> {os.path.relpath(matrix.directory)}")
+    return matrix.index
+
+
+def stage_skill_similarity(skill_matrix, catalog):
+    print_section("COMPUTING SKILL SIMILARITY")
+    if skill_matrix is None:
+        print("  [skip] No skill matrix")
+        return []
+    rows = skill_similarity.career_similarities(open_skill_matrix(), catalog)
+    print(f"  [done] Top {skill_similarity.TOP_K} similar careers for {len(rows)}/{len(catalog)} careers")
+    return rows
+
+
+def stage_seed_skill_similarities(skill_similarity):
+    if not skill_similarity:
+        return False
+    return seed_skill_similarities(skill_similarity)
+
+
+def stage_transitions(combine, validate, skill_matrix, skill_similarity, catalog):
+    print_section("BUILDING TRANSITION GRAPH")
+    matrix = open_skill_matrix() if skill_matrix is not None else None
+    graph = transition_graph.build_graph(combine, catalog, skill_similarity, matrix)
+    transition_graph.save_graph(*graph)
+    transition_graph.print_summary(*graph[:3])
+    rows = transition_graph.transition_rows(*graph)
+    print(f"  [done] Routes for {len(rows)} career pairs -> {os.path.relpath(transition_graph.STORE_DIR)}")
+    return rows
+
+
+def stage_seed_transitions(transitions):
+    if not transitions:
+        return False
+    return seed_career_transitions(transitions)
 
-    # Seed to Supabase
-    print("\n" + "=" * 40)
-    print("SEEDING DATABASE")
-    print("=" * 40)
 
-    success = seed_careers(careers_data)
+def stage_bundles(combine, validate, seed, history_store, trend_features, skill_similarity, catalog):
+    print_section("WRITING SNAPSHOT BUNDLES")
+    manifest, written, removed = snapshot_bundles.write_bundles(
+        combine, open_history_store(), catalog, trend_features, snapshot_bundles.fetch_ai_content(),
+        similarities=skill_similarity)
+    if "br" not in manifest["encodings"]:
+        print("  [warn] brotli not installed, writing .gz only (pip install brotli)")
+    print(f"  [saved] {len(manifest['bundles'])} bundles ({written} new, {removed} pruned), "
+          f"version {manifest['version']} -> {os.path.relpath(snapshot_bundles.BUNDLE_DIR)}")
+    return {"version": manifest["version"], "bundles": len(manifest["bundles"])}
 
-    # Seed historical market trends
-    if historical:
-        seed_market_trends(historical, career_mapping)
+
+def stage_term_index(combine, validate):
+    print_section("BUILDING TERM INDEX")
+    index = term_index.build_index(combine)
+    term_index.print_index(index)
+    for field, values in index["unmapped"].items():
+        print(f"  [warn] {len(values)} {field} not in vocabulary.json: {', '.join(values[:5])}"
+              + (" ..." if len(values) > 5 else ""))
+    return index
+
+
+def stage_seed_term_index(term_index):
+    if not term_index["postings"]:
+        return False
+    return seed_term_index(term_index)
+
+
+def stage_catalog():
+    career_mapping = load_career_mapping()
+    print(f"\nLoaded {len(career_mapping)} careers from career_mapping.json")
+    return career_mapping
+
+
+def fetch_stage(source, stage, get_data, keyed_by, fetch_subset=None):
+    """Stage function for a source.
+
+    Normally calls get_data (full fetch with fallback). Under an incremental
+    PLAN it patches the cached output instead, fetching only new SOC codes or
+    careers through fetch_subset and filling gaps from the source's compiled
+    fallback table.
+    """
+    def run(catalog):
+        if PLAN is None or source in PLAN.full_sources:
+            return get_data(catalog, budget=BUDGETS[source])
+        subset_fetch = None
+        if fetch_subset:
+            def subset_fetch(subset):
+                return deadlines.run(source, fetch_subset, subset, budget=BUDGETS[source])
+        patch = PLAN.patch_socs if keyed_by == "soc" else PLAN.patch_careers
+        return patch(source, PLAN.previous[stage], subset_fetch, fallbacks.load(source))
+    return run
+
+
+def fetch_history_subset(subset):
+    if not fetch_bls_history.BLS_API_KEY:
+        return {}
+    return fetch_from_bls(sorted({info["soc_code"] for info in subset.values()}))
+
+
+def stage_layoffs(catalog):
+    if PLAN is not None and "layoffs" not in PLAN.full_sources:
+        previous = PLAN.previous["fetch_layoffs"]
+        risk = PLAN.patch_careers("layoffs", previous["risk"], fallback=fallbacks.load("layoffs"))
+        return {"risk": risk, "live": previous["live"]}
+    risk, live = get_layoff_data(catalog, budget=BUDGETS["layoffs"])
+    return {"risk": risk, "live": live}
+
+
+def stage_seed_market_trends(history_store, catalog):
+    only_ids = PLAN.affected_careers() if PLAN else None
+    return seed_market_trends(open_history_store(), catalog, only_ids=only_ids)
+
+
+def open_history_store():
+    try:
+        return history_store.HistoryStore.open()
+    except history_store.HistoryStoreError as e:
+        raise StageError(f"{e} (rebuild it with --stages history_store)") from e
+
+
+def open_skill_matrix():
+    try:
+        return skill_similarity.SkillMatrix.open()
+    except skill_similarity.SkillMatrixError as e:
+        raise StageError(f"{e} (rebuild it with --stages skill_matrix)") from e
+
+
+def read_mapping_file():
+    with open(MAPPING_PATH, "rb") as f:
+        return f.read()
+
+
+def read_vocabulary_file():
+    with open(term_index.VOCABULARY_PATH, "rb") as f:
+        return f.read()
+
+
+MAPPING_PATH = os.path.join(os.path.dirname(__file__), "career_mapping.json")
+
+# Per-source fetch budgets in seconds; main() applies --budgets / PATHIQ_BUDGETS
+BUDGETS = dict(deadlines.DEFAULT_BUDGETS)
+
+# Upsert every career, not only rows that changed since the last seed (--force)
+RESEED_ALL = False
+
+# IncrementalPlan for this run when the catalog or overrides were edited
+PLAN = None
+
+# Pipeline DAG. Fetch stages depend only on the catalog; everything downstream
+# is skipped automatically when the outputs it consumes have not changed.
+STAGES = [
+    Stage("catalog", stage_catalog, fingerprint=read_mapping_file),
+    Stage("fetch_oews", fetch_stage("oews", "fetch_oews", get_oews_data, "soc", fetch_oews),
+          ["catalog"], external=True),
+    Stage("fetch_projections", fetch_stage("projections", "fetch_projections", get_projections_data, "soc",
+                                           fetch_projections),
+          ["catalog"], external=True),
+    Stage("fetch_onet", fetch_stage("onet", "fetch_onet", get_onet_data, "soc", fetch_onet),
+          ["catalog"], external=True),
+    Stage("fetch_openings", fetch_stage("openings", "fetch_openings", get_job_openings, "career",
+                                        fetch_job_openings),
+          ["catalog"], external=True),
+    Stage("fetch_levels", fetch_stage("levels", "fetch_levels", get_levels_data, "career"),
+          ["catalog"], external=True),
+    Stage("fetch_layoffs", stage_layoffs, ["catalog"], external=True),
+    Stage("history", fetch_stage("history", "history", get_historical_data, "soc", fetch_history_subset),
+          ["catalog"], external=True),
+    Stage("combine", stage_combine,
+          ["catalog", "fetch_oews", "fetch_projections", "fetch_onet",
+           "fetch_openings", "fetch_levels", "fetch_layoffs"],
+          fingerprint=lambda: json.dumps(SALARY_OVERRIDES, sort_keys=True)),
+    Stage("validate", stage_validate, ["combine"]),
+    Stage("seed", stage_seed, ["combine", "validate"], checkpoint=bool),
+    Stage("history_store", stage_history_store, ["history"]),
+    Stage("seed_market_trends", stage_seed_market_trends, ["history_store", "catalog"], checkpoint=bool),
+    Stage("trend_features", stage_trend_features, ["history_store", "catalog"]),
+    Stage("seed_trend_features", stage_seed_trend_features, ["trend_features"], checkpoint=bool),
+    Stage("aggregates", stage_aggregates, ["combine", "validate"]),
+    Stage("seed_aggregates", stage_seed_aggregates, ["aggregates"], checkpoint=bool),
+    Stage("term_index", stage_term_index, ["combine", "validate"], fingerprint=read_vocabulary_file),
+    Stage("seed_term_index", stage_seed_term_index, ["term_index"], checkpoint=bool),
+    Stage("skill_matrix", stage_skill_matrix, ["fetch_onet"],
+          fingerprint=lambda: ",".join(skill_similarity.SKILL_SHEETS)),
+    Stage("skill_similarity", stage_skill_similarity, ["skill_matrix", "catalog"]),
+    Stage("seed_skill_similarities", stage_seed_skill_similarities, ["skill_similarity"], checkpoint=bool),
+    Stage("transitions", stage_transitions, ["combine", "validate", "skill_matrix", "skill_similarity", "catalog"]),
+    Stage("seed_transitions", stage_seed_transitions, ["transitions"], checkpoint=bool),
+    # external: also reads AI content back from the seeded careers table
+    Stage("bundles", stage_bundles,
+          ["combine", "validate", "seed", "history_store", "trend_features", "skill_similarity", "catalog"],
+          external=True),
+]
+
+# Stage outputs an incremental plan reuses
+REUSED_STAGES = list(freshness.SOURCE_STAGES.values()) + ["combine"]
+
+
+def source_status(outputs):
+    """Summarize which sources produced data (only for stages in this run)."""
+    sources = {}
+    checks = [
+        ("fetch_oews", "BLS OEWS"),
+        ("fetch_projections", "BLS Projections"),
+        ("fetch_onet", "O*NET"),
+        ("fetch_openings", "Adzuna"),
+        ("fetch_levels", "levels.fyi"),
+        ("history", "BLS Historical"),
+    ]
+    for stage_name, label in checks:
+        if stage_name in outputs:
+            sources[label] = len(outputs[stage_name]) > 0
+    if "fetch_layoffs" in outputs:
+        if outputs["fetch_layoffs"]["live"]:
+            sources["layoffs.fyi"] = True
+        else:
+            sources["layoffs.fyi (fallback)"] = True
+    return sources
+
+
+def stale_sources(store, ttls):
+    """Sources past their TTL, or with no saved artifact yet."""
+    if not store.has("catalog"):
+        return list(freshness.SOURCE_STAGES)
+    m = freshness.manifest()
+    return [source for source, stage in freshness.SOURCE_STAGES.items()
+            if m.is_stale(source, ttls[source]) or not store.has(stage)]
+
+
+def select_stale(store, stale):
+    """--stale-only: stages to run (stale fetches, catalog edits, downstream)."""
+    catalog = next(s for s in STAGES if s.name == "catalog")
+    if (PLAN is None and store.has("catalog")
+            and compute_fingerprint(catalog, store) != store.fingerprint("catalog")):
+        print("  [info] career_mapping.json changed, refreshing every source")
+        stale[:] = list(freshness.SOURCE_STAGES)
+
+    selected = set()
+    for source in stale:
+        selected |= downstream_of(STAGES, freshness.SOURCE_STAGES[source])
+    if PLAN:
+        selected |= downstream_of(STAGES, "catalog" if PLAN.diff.catalog_changed else "combine")
+    if selected:
+        selected.add("catalog")
+    return selected
+
+
+def record_freshness(store, status):
+    """Update the freshness manifest for every source fetched this run.
+
+    Returns {source: "changed" | "unchanged" | served} for the summary. Sources
+    that fell back are not marked fresh and are retried after an hour.
+    """
+    m = freshness.manifest()
+    result = {}
+    for source, stage in freshness.SOURCE_STAGES.items():
+        if status.get(stage) != "ran" or (PLAN and source in PLAN.patched):
+            continue
+        served = deadlines.REPORT.get(source, {}).get("served", "live")
+        if served == "live":
+            changed = m.mark_fetched(source, store.digest(stage))
+            result[source] = "changed" if changed else "unchanged"
+        else:
+            m.mark_attempt(source, served)
+            result[source] = served
+    m.save()
+    return result
+
+
+def print_deadline_report():
+    """List sources that hit their budget and what they served instead."""
+    hits = deadlines.deadline_hits()
+    if not deadlines.REPORT:
+        return
+    if not hits:
+        print("Deadlines: all sources finished within budget")
+        return
+    print(f"Deadlines: {len(hits)} source(s) hit their budget")
+    for source, r in hits.items():
+        served = "last good result" if r["served"] == "last_good" else "compiled fallback"
+        print(f"  {source}: {r['budget_s']:g}s budget exhausted after {r['elapsed_s']:.1f}s -> {served}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="PathIQ data collection pipeline")
+    parser.add_argument("--stages", help="Comma-separated stages to run (others load from artifacts)")
+    parser.add_argument("--from", dest="start", help="Run this stage and everything downstream of it")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-run selected stages even if inputs are unchanged, and reseed every career")
+    parser.add_argument("--list", action="store_true", help="List stages in execution order and exit")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Record per-stage tracemalloc peaks (slower)")
+    parser.add_argument("--prom-file", default=os.getenv("PATHIQ_PROM_TEXTFILE"),
+                        help="Also write metrics as a Prometheus textfile (env: PATHIQ_PROM_TEXTFILE)")
+    parser.add_argument("--profile", default=os.getenv(PROFILE_ENV),
+                        help="Comma-separated stages to profile, or 'all' (env: PATHIQ_PROFILE)")
+    parser.add_argument("--stale-only", action="store_true",
+                        help="Refetch only sources past their TTL (ignores --stages/--from)")
+    parser.add_argument("--ttls", default=os.getenv(freshness.TTLS_ENV),
+                        help="Per-source TTLs for --stale-only, e.g. 'openings=6h,layoffs=3d' "
+                             "(env: PATHIQ_TTLS)")
+    parser.add_argument("--budgets", default=os.getenv(deadlines.BUDGETS_ENV),
+                        help="Per-source fetch budgets, e.g. 'onet=120,levels=45' or one number "
+                             "for all sources (env: PATHIQ_BUDGETS)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    global RESEED_ALL, PLAN
+    args = parse_args(argv)
+
+    if args.list:
+        by_name = {s.name: s for s in STAGES}
+        for name in topo_order(STAGES):
+            deps = ", ".join(by_name[name].deps) or "-"
+            print(f"  {name:<20} <- {deps}")
+        return None
+
+    print("=" * 60)
+    print("PathIQ Data Collection Pipeline")
+    print("=" * 60)
+
+    # Record/replay HTTP traffic when PATHIQ_HTTP_MODE is set
+    import http_cassette
+    http_cassette.install()
+
+    BUDGETS.update(deadlines.resolve_budgets(args.budgets))
+    print(f"Fetch budgets: worst case {sum(BUDGETS.values()):.0f}s "
+          f"({', '.join(f'{k}={v:g}s' for k, v in BUDGETS.items())})")
+    deadlines.REPORT.clear()
+    RESEED_ALL = args.force
+
+    store = ArtifactStore()
+    stale = []
+    if args.stale_only:
+        ttls = freshness.resolve_ttls(args.ttls)
+        stale = stale_sources(store, ttls)
+
+    PLAN = None
+    if not (args.force or args.stages or args.start):
+        PLAN = incremental.plan_update(store, load_career_mapping(), SALARY_OVERRIDES,
+                                       REUSED_STAGES, full_sources=stale)
+
+    if args.stale_only:
+        selected = select_stale(store, stale)
+        if not selected:
+            print("\n  [fresh] All sources are within their TTL, nothing to refresh")
+            freshness.print_status(ttls)
+            return []
+        if stale:
+            print(f"\n  [stale] Refreshing: {', '.join(stale)}")
+        freshness.begin_refresh(stale)
+
+    only = [s.strip() for s in args.stages.split(",") if s.strip()] if args.stages else None
+    run_metrics = RunMetrics(trace_memory=args.trace_memory)
+    profiler = make_profiler(args.profile, run_metrics.run_dir)
+    try:
+        if not args.stale_only:
+            selected = select_stages(STAGES, only=only, start=args.start)
+        outputs, status = run_pipeline(STAGES, selected, store=store, force=args.force,
+                                       metrics=run_metrics, profiler=profiler)
+    except StageError as e:
+        print(f"\n[error] {e}")
+        sys.exit(1)
+    finally:
+        metrics_path = run_metrics.write_json()
+        if args.prom_file:
+            run_metrics.write_prometheus(args.prom_file)
+
+    refreshed = record_freshness(store, status)
+    careers_data = outputs.get("combine", [])
+    if status.get("combine") in ("ran", "skipped"):
+        incremental.save_snapshot(outputs["catalog"], SALARY_OVERRIDES)
 
     # Summary
     print("\n" + "=" * 60)
     print("SUMMARY")
     print("=" * 60)
+    if "catalog" in outputs:
+        print(f"Careers in catalog: {len(outputs['catalog'])}")
     print(f"Careers processed: {len(careers_data)}")
-    for source, status in sources.items():
-        icon = "✓" if status else "✗"
+    for source, ok in source_status(outputs).items():
+        icon = "✓" if ok else "✗"
         print(f"  {source}: {icon}")
+    print_deadline_report()
+    if refreshed:
+        print("Freshness: " + ", ".join(f"{s} {how}" for s, how in refreshed.items()))
 
-    if success:
-        print(f"\n✓ {len(careers_data)} careers seeded to Supabase")
-    else:
-        print(f"\n! Careers saved to data/raw/careers_export.json")
-        print("  Run 'python seed_supabase.py' after setting up Supabase credentials")
+    run_metrics.print_table()
+    print(f"\n  [metrics] {metrics_path}")
+
+    if "failed" in status.values():
+        sys.exit(1)
+
+    if status.get("seed") in ("ran", "skipped"):
+        if outputs.get("seed"):
+            print(f"\n✓ {len(careers_data)} careers seeded to Supabase")
+        else:
+            print(f"\n! Careers saved to data/raw/careers_export.json")
+            print("  Run 'python seed_supabase.py' after setting up Supabase credentials")
 
     return careers_data
 
@@ -0,0 +1,226 @@
+"""
+Per-source time budgets for the get_* fetchers.
+
+Each source runs under a Deadline. Inside the fetch, network timeouts and
+sleeps are clamped to the remaining budget, so in-flight requests stop when it
+runs out:
+
+    resp = requests.get(url, timeout=deadlines.timeout(120))
+    deadlines.sleep(2)                      # raises if the budget can't cover it
+    page.goto(url, timeout=deadlines.timeout_ms(30000))
+
+The helpers are no-ops when no budget is active, e.g. when a fetch module runs
+on its own. On the main thread a SIGALRM timer also enforces the budget as a
+hard limit, which interrupts slow parsing as well.
+
+When the deadline is hit, `run` returns None and the get_* function serves the
+last good live result (raw/last_good/<source>.pkl) or its compiled fallback.
+REPORT records what happened to each source, for the run summary.
+
+Budgets come from DEFAULT_BUDGETS, overridden by --budgets or PATHIQ_BUDGETS:
+    PATHIQ_BUDGETS="onet=120,levels=45" python collect_all.py
+    PATHIQ_BUDGETS=60 python collect_all.py      # same budget for every source
+"""
+import os
+import pickle
+import signal
+import threading
+import time
+from datetime import datetime, timezone
+
+BUDGETS_ENV = "PATHIQ_BUDGETS"
+LAST_GOOD_DIR = os.path.join(os.path.dirname(__file__), "raw", "last_good")
+
+# Seconds per source; the sum is the worst case for the fetch part of a run
+DEFAULT_BUDGETS = {
+    "oews": 180,
+    "projections": 60,
+    "onet": 360,
+    "openings": 90,
+    "levels": 120,
+    "layoffs": 60,
+    "history": 120,
+}
+
+REPORT = {}  # source -> {"budget_s", "elapsed_s", "deadline_hit", "served"}
+
+_current = None  # Deadline of the source currently fetching
+
+
+class DeadlineExceeded(BaseException):
+    """A source ran out of budget.
+
+    Derives from BaseException (like KeyboardInterrupt) so the fetchers'
+    broad `except Exception` handlers don't swallow it and keep going.
+    """
+
+
+class Deadline:
+    def __init__(self, source, budget_s=None):
+        self.source = source
+        self.budget_s = budget_s or None
+        self.started = time.monotonic()
+        self.expires_at = self.started + self.budget_s if self.budget_s else None
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def remaining(self):
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+
+def parse_budgets(spec):
+    """'onet=120,levels=45' -> {'onet': 120.0, 'levels': 45.0}; '60' -> every source."""
+    budgets = {}
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "=" in part:
+            name, value = part.split("=", 1)
+            budgets[name.strip()] = float(value)
+        else:
+            budgets.update(dict.fromkeys(DEFAULT_BUDGETS, float(part)))
+    return budgets
+
+
+def resolve_budgets(spec=None):
+    """DEFAULT_BUDGETS overridden by `spec` (or PATHIQ_BUDGETS)."""
+    budgets = dict(DEFAULT_BUDGETS)
+    budgets.update(parse_budgets(spec if spec is not None else os.getenv(BUDGETS_ENV)))
+    return budgets
+
+
+def remaining():
+    """Seconds left for the active source, or None without a budget."""
+    return _current.remaining() if _current else None
+
+
+def check():
+    """Raise DeadlineExceeded if the active source is out of budget."""
+    if _current and _current.expired():
+        raise DeadlineExceeded(f"{_current.source}: budget of {_current.budget_s:g}s exhausted")
+
+
+def timeout(cap):
+    """Network timeout in seconds: `cap`, clamped to the remaining budget."""
+    check()
+    left = remaining()
+    return cap if left is None else max(0.1, min(cap, left))
+
+
+def timeout_ms(cap_ms):
+    """Like timeout() but in milliseconds, for Playwright."""
+    return int(timeout(cap_ms / 1000) * 1000)
+
+
+def sleep(seconds):
+    """time.sleep that gives up early when the budget can't cover it."""
+    left = remaining()
+    if left is not None and left < seconds:
+        raise DeadlineExceeded(f"{_current.source}: no budget left for a {seconds:g}s wait")
+    time.sleep(seconds)
+
+
+def _can_alarm():
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+
+def _on_alarm(signum, frame):
+    raise DeadlineExceeded(f"{_current.source if _current else 'source'}: budget exhausted")
+
+
+def _disarm():
+    """Stop the timer. An alarm that lands while stopping it is too late to count."""
+    try:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+    except DeadlineExceeded:
+        pass
+
+
+def run(source, func, *args, budget=None):
+    """Call func(*args) within `budget` seconds.
+
+    Returns func's result, or None when the deadline was hit (the hit is
+    printed and recorded in REPORT). budget=None means no limit. A result of
+    None from func itself is not a deadline hit.
+    """
+    global _current
+    deadline = Deadline(source, budget)
+    previous, _current = _current, deadline
+    alarm = deadline.budget_s and _can_alarm()
+    if alarm:
+        old_handler = signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, deadline.budget_s)
+    hit = False
+    try:
+        result = func(*args)
+        if alarm:
+            _disarm()
+    except DeadlineExceeded:
+        hit, result = True, None
+    finally:
+        if alarm:
+            _disarm()
+            signal.signal(signal.SIGALRM, old_handler)
+        _current = previous
+
+    REPORT[source] = {
+        "budget_s": deadline.budget_s,
+        "elapsed_s": round(deadline.elapsed(), 2),
+        "deadline_hit": hit,
+        "served": "live",
+    }
+    if hit:
+        limit = f"budget of {deadline.budget_s:g}s exhausted" if deadline.budget_s else "deadline exceeded"
+        print(f"  [deadline] {source}: {limit} after {deadline.elapsed():.1f}s, abandoning fetch")
+    return result
+
+
+def last_good_path(source):
+    return os.path.join(LAST_GOOD_DIR, f"{source}.pkl")
+
+
+def remember(source, data):
+    """Keep a good live result to serve when a later run hits its deadline."""
+    os.makedirs(LAST_GOOD_DIR, exist_ok=True)
+    path = last_good_path(source)
+    with open(path + ".tmp", "wb") as f:
+        pickle.dump({"saved_at": datetime.now(timezone.utc).isoformat(), "data": data}, f,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + ".tmp", path)
+
+
+def fallback(source, default):
+    """Data to serve after a deadline hit: the last good result, else `default`."""
+    path = last_good_path(source)
+    if os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                saved = pickle.load(f)
+            print(f"  [fallback] Using last good {source} data from {saved['saved_at'][:19]}")
+            _served(source, "last_good")
+            return saved["data"]
+        except Exception as e:
+            print(f"  [warn] Could not read last good {source} data: {e}")
+    _served(source, "fallback")
+    return default
+
+
+def mark_fallback(source):
+    """Record that `source` served its compiled fallback (without a deadline hit)."""
+    _served(source, "fallback")
+
+
+def _served(source, how):
+    REPORT.setdefault(source, {"budget_s": None, "elapsed_s": None, "deadline_hit": False})
+    REPORT[source]["served"] = how
+
+
+def deadline_hits():
+    return {s: r for s, r in REPORT.items() if r["deadline_hit"]}
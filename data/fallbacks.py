@@ -0,0 +1,190 @@
+"""
+Compiled fallback datasets, stored in fallbacks.zip instead of Python literals.
+
+Each source's fallback is one JSON member of the archive, next to a
+manifest.json that records the data version, when and from what each table was
+built, and its row count and digest:
+
+  fallbacks.zip
+    manifest.json        {"format": 1, "version": 3, "tables": {"oews": {...}, ...}}
+    oews.json            {soc_code: {...}}
+    history.json         {soc_code: {"employment": {year: n}, "wage": {year: n}}}
+    ...
+
+Tables are read on first use and cached, so a run whose sources all succeed
+never decodes them. The fetch modules expose the old FALLBACK_* names through
+module __getattr__, so `from fetch_bls import FALLBACK_OEWS` still works.
+
+Refresh the tables from the latest successful live run (raw/last_good/):
+  python fallbacks.py --refresh             # every source with a last-good result
+  python fallbacks.py --refresh oews onet   # only these sources
+  python fallbacks.py                       # show the manifest
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import zipfile
+from datetime import datetime, timezone
+
+FALLBACKS_PATH = os.path.join(os.path.dirname(__file__), "fallbacks.zip")
+FORMAT_VERSION = 1
+
+# Tables whose nested dicts are keyed by year; JSON turns those keys into strings
+INT_KEY_TABLES = {"history"}
+
+TABLES = ["oews", "projections", "onet", "openings", "levels", "layoffs", "history"]
+
+_cache = {}
+_manifest = None
+
+
+class FallbackDataError(Exception):
+    """fallbacks.zip is missing, unreadable or from an unsupported format."""
+
+
+def _int_keys(obj):
+    """Restore int keys ('2014' -> 2014) that JSON stored as strings."""
+    return {int(k) if k.isdigit() else k: v for k, v in obj}
+
+
+def _digest(payload):
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def read_manifest(path=FALLBACKS_PATH):
+    try:
+        with zipfile.ZipFile(path) as zf:
+            data = json.loads(zf.read("manifest.json"))
+    except (OSError, KeyError, zipfile.BadZipFile) as e:
+        raise FallbackDataError(f"Cannot read fallback data from {path}: {e}") from e
+    if data.get("format") != FORMAT_VERSION:
+        raise FallbackDataError(f"{path} has format {data.get('format')}, expected {FORMAT_VERSION}")
+    return data
+
+
+def manifest():
+    """Manifest of fallbacks.zip, read once per process."""
+    global _manifest
+    if _manifest is None:
+        _manifest = read_manifest()
+    return _manifest
+
+
+def load(name):
+    """The fallback table for source `name`, read from fallbacks.zip on first use."""
+    if name not in _cache:
+        if name not in manifest()["tables"]:
+            raise FallbackDataError(f"No fallback table '{name}' in {FALLBACKS_PATH}")
+        with zipfile.ZipFile(FALLBACKS_PATH) as zf:
+            payload = zf.read(f"{name}.json")
+        hook = _int_keys if name in INT_KEY_TABLES else None
+        _cache[name] = json.loads(payload, object_pairs_hook=hook)
+    return _cache[name]
+
+
+def module_getattr(module_name, names):
+    """Module __getattr__ serving FALLBACK_* attributes from fallbacks.zip.
+
+    names maps attribute -> table, e.g. {"FALLBACK_OEWS": "oews"}.
+    """
+    def __getattr__(attr):
+        if attr in names:
+            return load(names[attr])
+        raise AttributeError(f"module {module_name!r} has no attribute {attr!r}")
+    return __getattr__
+
+
+def write(tables, path=FALLBACKS_PATH, sources=None, previous=None):
+    """Write `tables` ({name: data}) as a new version of the archive.
+
+    `previous` is the old manifest; tables not in `tables` must be carried over
+    by the caller. `sources` maps table -> where its data came from.
+    """
+    version = (previous or {}).get("version", 0) + 1
+    now = datetime.now(timezone.utc).isoformat()
+    entries = {}
+    members = {}
+    for name in TABLES:
+        if name not in tables:
+            continue
+        payload = json.dumps(tables[name], sort_keys=True, separators=(",", ":")).encode()
+        members[f"{name}.json"] = payload
+        old = (previous or {}).get("tables", {}).get(name, {})
+        unchanged = old.get("sha256") == _digest(payload)
+        entries[name] = {
+            "rows": len(tables[name]),
+            "sha256": _digest(payload),
+            "source": old.get("source") if unchanged else (sources or {}).get(name, "compiled"),
+            "updated_at": old.get("updated_at") if unchanged else now,
+        }
+    data = {"format": FORMAT_VERSION, "version": version, "created_at": now, "tables": entries}
+
+    tmp = path + ".tmp"
+    with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=9) as zf:
+        zf.writestr("manifest.json", json.dumps(data, indent=2, sort_keys=True))
+        for member, payload in members.items():
+            zf.writestr(member, payload)
+    os.replace(tmp, path)
+    return data
+
+
+def refresh(sources=None):
+    """Replace tables with the last good live results in raw/last_good/.
+
+    Returns the names of the tables that changed.
+    """
+    import deadlines
+
+    previous = manifest()
+    tables = {name: load(name) for name in previous["tables"]}
+    origin = {}
+    changed = []
+    for name in sources or TABLES:
+        last_good = deadlines.last_good_path(name)
+        if not os.path.exists(last_good):
+            print(f"  [skip] {name}: no last good live result")
+            continue
+        with open(last_good, "rb") as f:
+            saved = pickle.load(f)
+        if not saved["data"]:
+            print(f"  [skip] {name}: last good result is empty")
+            continue
+        data = json.loads(json.dumps(saved["data"], sort_keys=True),
+                          object_pairs_hook=_int_keys if name in INT_KEY_TABLES else None)
+        if data != tables.get(name):
+            changed.append(name)
+            print(f"  [update] {name}: {len(data)} rows from live run at {saved['saved_at'][:19]}")
+        else:
+            print(f"  [same] {name}: matches the last good live result")
+        tables[name] = data
+        origin[name] = f"live {saved['saved_at'][:19]}"
+
+    if not changed:
+        print("  [done] Fallback data already up to date")
+        return []
+    data = write(tables, sources=origin, previous=previous)
+    _cache.clear()
+    global _manifest
+    _manifest = None
+    print(f"  [saved] {FALLBACKS_PATH} (version {data['version']}, {os.path.getsize(FALLBACKS_PATH) / 1024:.0f} KB)")
+    return changed
+
+
+def print_manifest():
+    m = manifest()
+    print(f"{os.path.basename(FALLBACKS_PATH)}: version {m['version']}, built {m['created_at'][:19]}")
+    print(f"  {'table':<12} {'rows':>5}  {'updated':<19}  source")
+    for name, t in m["tables"].items():
+        print(f"  {name:<12} {t['rows']:>5}  {(t['updated_at'] or '')[:19]:<19}  {t['source']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or refresh the compiled fallback data")
+    parser.add_argument("--refresh", nargs="*", metavar="SOURCE",
+                        help="Rebuild tables from raw/last_good (default: every source)")
+    args = parser.parse_args()
+    if args.refresh is not None:
+        refresh(args.refresh or None)
+    print_manifest()
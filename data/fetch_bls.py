@@ -5,27 +5,42 @@ Downloads ZIP files, extracts Excel, and filters to our 35 career SOC codes.
 import json
 import os
 import zipfile
-import pandas as pd
-import requests
+import deadlines
+import fallbacks
+import freshness
+import metrics
 
 RAW_DIR = os.path.join(os.path.dirname(__file__), "raw")
-OEWS_URL = "https://www.bls.gov/oes/special-requests/oesm24nat.zip"
-PROJECTIONS_URL = "https://www.bls.gov/emp/ind-occ-matrix/occupation.xlsx"
+OEWS_URL = os.getenv("OEWS_URL", "https://www.bls.gov/oes/special-requests/oesm24nat.zip")
+PROJECTIONS_URL = os.getenv("PROJECTIONS_URL", "https://www.bls.gov/emp/ind-occ-matrix/occupation.xlsx")
 
 def ensure_raw_dir():
     os.makedirs(RAW_DIR, exist_ok=True)
 
 def download_file(url, filename):
+    import requests
     filepath = os.path.join(RAW_DIR, filename)
-    if os.path.exists(filepath):
+    cached = os.path.exists(filepath)
+    if cached and not freshness.should_revalidate(filename):
         print(f"  [skip] {filename} already exists")
         return filepath
     print(f"  [download] {url}")
     headers = {"User-Agent": "PathIQ-DataPipeline/1.0 (educational project)"}
-    resp = requests.get(url, headers=headers, timeout=120)
-    resp.raise_for_status()
-    with open(filepath, "wb") as f:
-        f.write(resp.content)
+    if cached:
+        headers.update(freshness.conditional_headers(filename))
+    with metrics.step("download"):
+        resp = requests.get(url, headers=headers, timeout=deadlines.timeout(120))
+        if cached and resp.status_code == 304:
+            freshness.record_download(filename, resp.headers)
+            print(f"  [fresh] {filename} not modified since last download")
+            return filepath
+        resp.raise_for_status()
+        # Write then rename, so an abandoned download never leaves a partial file
+        with open(filepath + ".part", "wb") as f:
+            f.write(resp.content)
+        os.replace(filepath + ".part", filepath)
+    metrics.count("bytes_downloaded", len(resp.content))
+    freshness.record_download(filename, resp.headers)
     print(f"  [saved] {filepath} ({len(resp.content) / 1024:.0f} KB)")
     return filepath
 
@@ -40,6 +55,7 @@ def get_soc_codes(career_mapping):
 
 def parse_clean_number(val):
     """Parse BLS numeric values, handling suppressed markers."""
+    import pandas as pd
     if pd.isna(val):
         return None
     s = str(val).strip().replace(",", "").replace("$", "")
@@ -52,6 +68,7 @@ def parse_clean_number(val):
 
 def fetch_oews(career_mapping):
     """Download and parse BLS OEWS data for salaries and employment."""
+    import pandas as pd
     print("\n--- Fetching BLS OEWS Data ---")
     ensure_raw_dir()
 
@@ -76,7 +93,9 @@ def fetch_oews(career_mapping):
             xlsx_path = os.path.join(RAW_DIR, xlsx_name)
 
         print(f"  [parse] {xlsx_name}")
-        df = pd.read_excel(xlsx_path)
+        with metrics.step("parse"):
+            df = pd.read_excel(xlsx_path)
+        metrics.count("rows_parsed", len(df))
 
         # Normalize column names
         df.columns = [c.strip().upper() for c in df.columns]
@@ -117,6 +136,7 @@ def fetch_oews(career_mapping):
 
 def fetch_projections(career_mapping):
     """Download and parse BLS Employment Projections data."""
+    import pandas as pd
     print("\n--- Fetching BLS Employment Projections ---")
     ensure_raw_dir()
 
@@ -129,18 +149,20 @@ def fetch_projections(career_mapping):
         print(f"  [parse] occupation_projections.xlsx")
         # Try reading with different header rows
         df = None
-        for header_row in range(0, 5):
-            try:
-                test_df = pd.read_excel(filepath, header=header_row)
-                cols = [str(c).lower() for c in test_df.columns]
-                if any("occupation" in c or "occ" in c for c in cols):
-                    df = test_df
-                    break
-            except Exception:
-                continue
-
-        if df is None:
-            df = pd.read_excel(filepath, header=1)
+        with metrics.step("parse"):
+            for header_row in range(0, 5):
+                try:
+                    test_df = pd.read_excel(filepath, header=header_row)
+                    cols = [str(c).lower() for c in test_df.columns]
+                    if any("occupation" in c or "occ" in c for c in cols):
+                        df = test_df
+                        break
+                except Exception:
+                    continue
+
+            if df is None:
+                df = pd.read_excel(filepath, header=1)
+        metrics.count("rows_parsed", len(df))
 
         df.columns = [str(c).strip() for c in df.columns]
 
@@ -189,91 +211,32 @@ def fetch_projections(career_mapping):
 
     return result
 
-# Fallback data when BLS download fails (real BLS data, manually compiled)
-FALLBACK_OEWS = {
-    "15-1252": {"median": 132270, "p25": 98540, "p75": 168070, "p90": 202960, "employment": 1795300},
-    "15-2051": {"median": 108020, "p25": 80420, "p75": 145560, "p90": 184550, "employment": 192300},
-    "11-2021": {"median": 156580, "p25": 109960, "p75": 208000, "p90": 239200, "employment": 316680},
-    "15-1255": {"median": 98540, "p25": 72840, "p75": 123860, "p90": 150880, "employment": 109600},
-    "15-1212": {"median": 120360, "p25": 92600, "p75": 153060, "p90": 182930, "employment": 175350},
-    "15-1244": {"median": 95360, "p25": 72820, "p75": 120970, "p90": 149830, "employment": 367500},
-    "13-1111": {"median": 99410, "p25": 72000, "p75": 134560, "p90": 167650, "employment": 806400},
-    "13-2051": {"median": 99890, "p25": 72130, "p75": 137140, "p90": 173890, "employment": 328600},
-    "13-2011": {"median": 79880, "p25": 63980, "p75": 101350, "p90": 130710, "employment": 1366800},
-    "13-1081": {"median": 79150, "p25": 61240, "p75": 100540, "p90": 126090, "employment": 191580},
-    "29-1215": {"median": 229300, "p25": 147380, "p75": 261390, "p90": 261390, "employment": 55810},
-    "29-1141": {"median": 86070, "p25": 68200, "p75": 106670, "p90": 132680, "employment": 3175390},
-    "29-1071": {"median": 130020, "p25": 109850, "p75": 152900, "p90": 170470, "employment": 148050},
-    "29-1051": {"median": 136030, "p25": 115000, "p75": 161040, "p90": 174160, "employment": 330100},
-    "19-1041": {"median": 83420, "p25": 64920, "p75": 108600, "p90": 132070, "employment": 8940},
-    "17-2141": {"median": 99200, "p25": 79750, "p75": 123530, "p90": 148680, "employment": 284140},
-    "17-2051": {"median": 95890, "p25": 76740, "p75": 119100, "p90": 145090, "employment": 316400},
-    "17-2071": {"median": 106950, "p25": 84020, "p75": 134510, "p90": 166900, "employment": 189580},
-    "17-2031": {"median": 100980, "p25": 78070, "p75": 125750, "p90": 158510, "employment": 18900},
-    "19-1042": {"median": 100890, "p25": 68520, "p75": 133520, "p90": 168020, "employment": 136620},
-    "19-2041": {"median": 78980, "p25": 61100, "p75": 100720, "p90": 129070, "employment": 86100},
-    "19-3011": {"median": 115730, "p25": 80530, "p75": 157780, "p90": 198230, "employment": 16780},
-    "23-1011": {"median": 145760, "p25": 82630, "p75": 208980, "p90": 239200, "employment": 793010},
-    "19-3094": {"median": 132470, "p25": 78960, "p75": 164470, "p90": 182970, "employment": 4940},
-    "19-3051": {"median": 81800, "p25": 63940, "p75": 103620, "p90": 126120, "employment": 38030},
-    "25-2031": {"median": 65220, "p25": 51320, "p75": 84540, "p90": 104250, "employment": 1016960},
-    "25-1099": {"median": 84380, "p25": 55290, "p75": 125610, "p90": 174550, "employment": 171640},
-    "27-1024": {"median": 59970, "p25": 44570, "p75": 78680, "p90": 100190, "employment": 246240},
-    "27-3042": {"median": 80050, "p25": 59470, "p75": 104660, "p90": 128600, "employment": 48310},
-    "27-3043": {"median": 73690, "p25": 49740, "p75": 103200, "p90": 146520, "employment": 47930},
-    "11-9151": {"median": 77030, "p25": 57450, "p75": 101200, "p90": 126070, "employment": 184080},
-    "11-1021": {"median": 101280, "p25": 65860, "p75": 155970, "p90": 218810, "employment": 3236050},
-}
-
-FALLBACK_PROJECTIONS = {
-    "15-1252": {"growth_rate_numeric": 17, "growth_rate": "17%", "annual_openings": 140100, "minimum_degree": "Bachelor's degree"},
-    "15-2051": {"growth_rate_numeric": 36, "growth_rate": "36%", "annual_openings": 20800, "minimum_degree": "Bachelor's degree"},
-    "11-2021": {"growth_rate_numeric": 8, "growth_rate": "8%", "annual_openings": 34000, "minimum_degree": "Bachelor's degree"},
-    "15-1255": {"growth_rate_numeric": 16, "growth_rate": "16%", "annual_openings": 18900, "minimum_degree": "Bachelor's degree"},
-    "15-1212": {"growth_rate_numeric": 33, "growth_rate": "33%", "annual_openings": 17300, "minimum_degree": "Bachelor's degree"},
-    "15-1244": {"growth_rate_numeric": 3, "growth_rate": "3%", "annual_openings": 24500, "minimum_degree": "Bachelor's degree"},
-    "13-1111": {"growth_rate_numeric": 11, "growth_rate": "11%", "annual_openings": 92700, "minimum_degree": "Bachelor's degree"},
-    "13-2051": {"growth_rate_numeric": 9, "growth_rate": "9%", "annual_openings": 27400, "minimum_degree": "Bachelor's degree"},
-    "13-2011": {"growth_rate_numeric": 6, "growth_rate": "6%", "annual_openings": 126500, "minimum_degree": "Bachelor's degree"},
-    "13-1081": {"growth_rate_numeric": 18, "growth_rate": "18%", "annual_openings": 23800, "minimum_degree": "Bachelor's degree"},
-    "29-1215": {"growth_rate_numeric": 3, "growth_rate": "3%", "annual_openings": 24200, "minimum_degree": "Doctoral or professional degree"},
-    "29-1141": {"growth_rate_numeric": 6, "growth_rate": "6%", "annual_openings": 193100, "minimum_degree": "Bachelor's degree"},
-    "29-1071": {"growth_rate_numeric": 28, "growth_rate": "28%", "annual_openings": 12200, "minimum_degree": "Master's degree"},
-    "29-1051": {"growth_rate_numeric": -2, "growth_rate": "-2%", "annual_openings": 11400, "minimum_degree": "Doctoral or professional degree"},
-    "19-1041": {"growth_rate_numeric": 27, "growth_rate": "27%", "annual_openings": 900, "minimum_degree": "Master's degree"},
-    "17-2141": {"growth_rate_numeric": 10, "growth_rate": "10%", "annual_openings": 17900, "minimum_degree": "Bachelor's degree"},
-    "17-2051": {"growth_rate_numeric": 5, "growth_rate": "5%", "annual_openings": 24200, "minimum_degree": "Bachelor's degree"},
-    "17-2071": {"growth_rate_numeric": 5, "growth_rate": "5%", "annual_openings": 12700, "minimum_degree": "Bachelor's degree"},
-    "17-2031": {"growth_rate_numeric": 5, "growth_rate": "5%", "annual_openings": 1200, "minimum_degree": "Bachelor's degree"},
-    "19-1042": {"growth_rate_numeric": 10, "growth_rate": "10%", "annual_openings": 10000, "minimum_degree": "Doctoral or professional degree"},
-    "19-2041": {"growth_rate_numeric": 6, "growth_rate": "6%", "annual_openings": 8000, "minimum_degree": "Bachelor's degree"},
-    "19-3011": {"growth_rate_numeric": 6, "growth_rate": "6%", "annual_openings": 1500, "minimum_degree": "Master's degree"},
-    "23-1011": {"growth_rate_numeric": 8, "growth_rate": "8%", "annual_openings": 39100, "minimum_degree": "Doctoral or professional degree"},
-    "19-3094": {"growth_rate_numeric": 7, "growth_rate": "7%", "annual_openings": 300, "minimum_degree": "Master's degree"},
-    "19-3051": {"growth_rate_numeric": 4, "growth_rate": "4%", "annual_openings": 3700, "minimum_degree": "Master's degree"},
-    "25-2031": {"growth_rate_numeric": 1, "growth_rate": "1%", "annual_openings": 77400, "minimum_degree": "Bachelor's degree"},
-    "25-1099": {"growth_rate_numeric": 8, "growth_rate": "8%", "annual_openings": 25000, "minimum_degree": "Doctoral or professional degree"},
-    "27-1024": {"growth_rate_numeric": 3, "growth_rate": "3%", "annual_openings": 22800, "minimum_degree": "Bachelor's degree"},
-    "27-3042": {"growth_rate_numeric": 7, "growth_rate": "7%", "annual_openings": 5500, "minimum_degree": "Bachelor's degree"},
-    "27-3043": {"growth_rate_numeric": 4, "growth_rate": "4%", "annual_openings": 8200, "minimum_degree": "Bachelor's degree"},
-    "11-9151": {"growth_rate_numeric": 9, "growth_rate": "9%", "annual_openings": 19300, "minimum_degree": "Bachelor's degree"},
-    "11-1021": {"growth_rate_numeric": 6, "growth_rate": "6%", "annual_openings": 291800, "minimum_degree": "Bachelor's degree"},
-}
-
-def get_oews_data(career_mapping):
-    """Get OEWS data with fallback."""
-    data = fetch_oews(career_mapping)
+# Compiled fallback data (real BLS data) lives in fallbacks.zip
+__getattr__ = fallbacks.module_getattr(__name__, {"FALLBACK_OEWS": "oews",
+                                                   "FALLBACK_PROJECTIONS": "projections"})
+
+def get_oews_data(career_mapping, budget=None):
+    """Get OEWS data with fallback. `budget` caps the fetch in seconds."""
+    data = deadlines.run("oews", fetch_oews, career_mapping, budget=budget)
+    if data is None:
+        return deadlines.fallback("oews", fallbacks.load("oews"))
     if len(data) < 5:
         print("  [fallback] Using compiled BLS data")
-        data = FALLBACK_OEWS
+        deadlines.mark_fallback("oews")
+        return fallbacks.load("oews")
+    deadlines.remember("oews", data)
     return data
 
-def get_projections_data(career_mapping):
-    """Get projections data with fallback."""
-    data = fetch_projections(career_mapping)
+def get_projections_data(career_mapping, budget=None):
+    """Get projections data with fallback. `budget` caps the fetch in seconds."""
+    data = deadlines.run("projections", fetch_projections, career_mapping, budget=budget)
+    if data is None:
+        return deadlines.fallback("projections", fallbacks.load("projections"))
     if len(data) < 5:
         print("  [fallback] Using compiled BLS projections")
-        data = FALLBACK_PROJECTIONS
+        deadlines.mark_fallback("projections")
+        return fallbacks.load("projections")
+    deadlines.remember("projections", data)
     return data
 
 if __name__ == "__main__":
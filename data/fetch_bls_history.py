@@ -17,13 +17,14 @@ Falls back to compiled real BLS data if API unavailable.
 """
 import json
 import os
-import time
-import requests
 from dotenv import load_dotenv
+import deadlines
+import fallbacks
+import metrics
 
 load_dotenv(os.path.join(os.path.dirname(__file__), ".env"))
 
-BLS_API_URL = "https://api.bls.gov/publicAPI/v2/timeseries/data/"
+BLS_API_URL = os.getenv("BLS_API_URL", "https://api.bls.gov/publicAPI/v2/timeseries/data/")
 BLS_API_KEY = os.getenv("BLS_API_KEY", "")
 START_YEAR = 2014
 END_YEAR = 2024
@@ -51,6 +52,7 @@ def parse_series_id(series_id):
 
 def fetch_from_bls(soc_codes):
     """Fetch historical data from BLS API."""
+    import requests
     all_series = build_series_ids(soc_codes)
     result = {}
 
@@ -72,8 +74,9 @@ def fetch_from_bls(soc_codes):
 
         try:
             resp = requests.post(BLS_API_URL, data=json.dumps(payload),
-                                 headers=headers, timeout=60)
+                                 headers=headers, timeout=deadlines.timeout(60))
             resp.raise_for_status()
+            metrics.count("bytes_downloaded", len(resp.content))
             data = resp.json()
 
             if data.get("status") != "REQUEST_SUCCEEDED":
@@ -89,6 +92,7 @@ def fetch_from_bls(soc_codes):
                 if soc not in result:
                     result[soc] = {"employment": {}, "wage": {}}
 
+                metrics.count("rows_parsed", len(series.get("data", [])))
                 for item in series.get("data", []):
                     year = int(item["year"])
                     # Annual data uses period M13 (annual average)
@@ -106,7 +110,7 @@ def fetch_from_bls(soc_codes):
 
             # Rate limit between batches
             if i + batch_size < len(all_series):
-                time.sleep(2)
+                deadlines.sleep(2)
 
         except Exception as e:
             print(f"  [error] BLS API request failed: {e}")
@@ -115,287 +119,38 @@ def fetch_from_bls(soc_codes):
     return result
 
 
-# Fallback historical data compiled from published BLS OES tables.
-# Employment in thousands, wages in annual dollars.
-# Sources: BLS Occupational Employment and Wage Statistics, 2014-2024
-FALLBACK_HISTORICAL = {
-    "15-1252": {  # Software Developers
-        "employment": {2014: 1114810, 2015: 1154160, 2016: 1200780, 2017: 1256200,
-                       2018: 1318400, 2019: 1365500, 2020: 1417600, 2021: 1517400,
-                       2022: 1590810, 2023: 1645300, 2024: 1698000},
-        "wage": {2014: 95510, 2015: 98260, 2016: 100690, 2017: 103560,
-                 2018: 105590, 2019: 107510, 2020: 110140, 2021: 120730,
-                 2022: 127260, 2023: 130160, 2024: 132270},
-    },
-    "15-2051": {  # Data Scientists
-        "employment": {2014: 27500, 2015: 30500, 2016: 35000, 2017: 40500,
-                       2018: 56000, 2019: 95000, 2020: 105000, 2021: 113300,
-                       2022: 131980, 2023: 145100, 2024: 158500},
-        "wage": {2014: 80100, 2015: 84400, 2016: 87780, 2017: 91160,
-                 2018: 94280, 2019: 97160, 2020: 100910, 2021: 103500,
-                 2022: 108020, 2023: 112590, 2024: 116480},
-    },
-    "11-2021": {  # Marketing Managers
-        "employment": {2014: 192890, 2015: 197640, 2016: 205900, 2017: 218300,
-                       2018: 228200, 2019: 240900, 2020: 234500, 2021: 254800,
-                       2022: 267510, 2023: 278600, 2024: 288400},
-        "wage": {2014: 128750, 2015: 131180, 2016: 134290, 2017: 136850,
-                 2018: 140400, 2019: 147240, 2020: 151150, 2021: 153440,
-                 2022: 156580, 2023: 161200, 2024: 166830},
-    },
-    "15-1255": {  # Web Developers / UX Designers
-        "employment": {2014: 148500, 2015: 153200, 2016: 157200, 2017: 162300,
-                       2018: 168300, 2019: 174300, 2020: 178900, 2021: 191200,
-                       2022: 197600, 2023: 202400, 2024: 208100},
-        "wage": {2014: 65760, 2015: 67990, 2016: 69430, 2017: 72150,
-                 2018: 73760, 2019: 77200, 2020: 80890, 2021: 84960,
-                 2022: 88030, 2023: 92750, 2024: 96470},
-    },
-    "15-1212": {  # Information Security Analysts
-        "employment": {2014: 82900, 2015: 87600, 2016: 93600, 2017: 100000,
-                       2018: 106800, 2019: 115200, 2020: 125900, 2021: 141200,
-                       2022: 155200, 2023: 168900, 2024: 175000},
-        "wage": {2014: 88890, 2015: 90120, 2016: 92600, 2017: 95510,
-                 2018: 98350, 2019: 100690, 2020: 103590, 2021: 107580,
-                 2022: 112000, 2023: 118590, 2024: 120360},
-    },
-    "15-1244": {  # Network/Systems Administrators
-        "employment": {2014: 382600, 2015: 378800, 2016: 374200, 2017: 369200,
-                       2018: 365500, 2019: 361700, 2020: 357600, 2021: 353400,
-                       2022: 350800, 2023: 348100, 2024: 345200},
-        "wage": {2014: 77810, 2015: 79700, 2016: 81100, 2017: 82050,
-                 2018: 83510, 2019: 84810, 2020: 85990, 2021: 87070,
-                 2022: 90520, 2023: 92740, 2024: 95830},
-    },
-    "13-1111": {  # Management Analysts / Consultants
-        "employment": {2014: 680400, 2015: 706700, 2016: 725200, 2017: 742600,
-                       2018: 766300, 2019: 796100, 2020: 781800, 2021: 845400,
-                       2022: 876000, 2023: 903600, 2024: 920000},
-        "wage": {2014: 81320, 2015: 83610, 2016: 85260, 2017: 87510,
-                 2018: 88530, 2019: 93000, 2020: 93000, 2021: 95290,
-                 2022: 99410, 2023: 104660, 2024: 107000},
-    },
-    "13-2051": {  # Financial Analysts
-        "employment": {2014: 277600, 2015: 282100, 2016: 287000, 2017: 296200,
-                       2018: 308100, 2019: 316500, 2020: 310000, 2021: 327600,
-                       2022: 337000, 2023: 344400, 2024: 350800},
-        "wage": {2014: 78620, 2015: 80310, 2016: 81760, 2017: 84300,
-                 2018: 86580, 2019: 87780, 2020: 89330, 2021: 91580,
-                 2022: 96220, 2023: 99890, 2024: 102480},
-    },
-    "13-2011": {  # Accountants
-        "employment": {2014: 1332700, 2015: 1340000, 2016: 1347000, 2017: 1354000,
-                       2018: 1363000, 2019: 1375000, 2020: 1355000, 2021: 1370000,
-                       2022: 1378000, 2023: 1385000, 2024: 1392000},
-        "wage": {2014: 65940, 2015: 67190, 2016: 68150, 2017: 69350,
-                 2018: 70500, 2019: 71550, 2020: 73560, 2021: 77250,
-                 2022: 79880, 2023: 83980, 2024: 86740},
-    },
-    "13-1081": {  # Supply Chain / Logisticians
-        "employment": {2014: 135000, 2015: 138000, 2016: 142000, 2017: 147000,
-                       2018: 152400, 2019: 158300, 2020: 167000, 2021: 181000,
-                       2022: 190300, 2023: 196000, 2024: 202000},
-        "wage": {2014: 73870, 2015: 74590, 2016: 74600, 2017: 75630,
-                 2018: 77030, 2019: 79400, 2020: 80900, 2021: 82640,
-                 2022: 84810, 2023: 88450, 2024: 91100},
-    },
-    "29-1215": {  # Physicians
-        "employment": {2014: 708300, 2015: 713800, 2016: 722200, 2017: 731600,
-                       2018: 740600, 2019: 748200, 2020: 735000, 2021: 750100,
-                       2022: 761400, 2023: 772000, 2024: 782700},
-        "wage": {2014: 187200, 2015: 191200, 2016: 196380, 2017: 200890,
-                 2018: 208000, 2019: 218850, 2020: 224090, 2021: 229300,
-                 2022: 236000, 2023: 242000, 2024: 252000},
-    },
-    "29-1141": {  # Registered Nurses
-        "employment": {2014: 2751000, 2015: 2785000, 2016: 2857000, 2017: 2906000,
-                       2018: 2951700, 2019: 2986500, 2020: 3009700, 2021: 3047160,
-                       2022: 3100000, 2023: 3130000, 2024: 3175000},
-        "wage": {2014: 67490, 2015: 68450, 2016: 70000, 2017: 71730,
-                 2018: 73300, 2019: 75330, 2020: 77600, 2021: 82750,
-                 2022: 86070, 2023: 89010, 2024: 93600},
-    },
-    "29-1071": {  # Physician Assistants
-        "employment": {2014: 94400, 2015: 99400, 2016: 106200, 2017: 114500,
-                       2018: 120090, 2019: 125500, 2020: 129530, 2021: 139100,
-                       2022: 146900, 2023: 155000, 2024: 164100},
-        "wage": {2014: 96980, 2015: 98900, 2016: 101480, 2017: 104860,
-                 2018: 108610, 2019: 114050, 2020: 116080, 2021: 121530,
-                 2022: 126010, 2023: 130020, 2024: 133580},
-    },
-    "29-1051": {  # Pharmacists
-        "employment": {2014: 297100, 2015: 300000, 2016: 306600, 2017: 307000,
-                       2018: 309720, 2019: 314300, 2020: 316700, 2021: 318300,
-                       2022: 320500, 2023: 322000, 2024: 322800},
-        "wage": {2014: 121500, 2015: 122230, 2016: 122230, 2017: 124170,
-                 2018: 126120, 2019: 128090, 2020: 130120, 2021: 131710,
-                 2022: 132750, 2023: 136030, 2024: 139790},
-    },
-    "19-1041": {  # Epidemiologists
-        "employment": {2014: 6100, 2015: 6500, 2016: 6790, 2017: 7180,
-                       2018: 7620, 2019: 7810, 2020: 8580, 2021: 9800,
-                       2022: 10600, 2023: 10800, 2024: 11100},
-        "wage": {2014: 67740, 2015: 69450, 2016: 70820, 2017: 73670,
-                 2018: 74560, 2019: 78830, 2020: 82420, 2021: 86490,
-                 2022: 88570, 2023: 92560, 2024: 95670},
-    },
-    "17-2141": {  # Mechanical Engineers
-        "employment": {2014: 264300, 2015: 268800, 2016: 274350, 2017: 282100,
-                       2018: 288800, 2019: 296100, 2020: 290000, 2021: 296700,
-                       2022: 302000, 2023: 308000, 2024: 313800},
-        "wage": {2014: 84190, 2015: 85880, 2016: 87370, 2017: 89800,
-                 2018: 92800, 2019: 95300, 2020: 95300, 2021: 96310,
-                 2022: 99510, 2023: 101200, 2024: 104000},
-    },
-    "17-2051": {  # Civil Engineers
-        "employment": {2014: 281400, 2015: 284000, 2016: 293600, 2017: 303500,
-                       2018: 310000, 2019: 318200, 2020: 312300, 2021: 320000,
-                       2022: 326000, 2023: 332000, 2024: 338000},
-        "wage": {2014: 82220, 2015: 83540, 2016: 84770, 2017: 86640,
-                 2018: 88050, 2019: 91790, 2020: 93720, 2021: 95490,
-                 2022: 97380, 2023: 100000, 2024: 103100},
-    },
-    "17-2071": {  # Electrical Engineers
-        "employment": {2014: 175200, 2015: 176100, 2016: 177700, 2017: 178200,
-                       2018: 180400, 2019: 181500, 2020: 178400, 2021: 180600,
-                       2022: 183700, 2023: 186200, 2024: 189000},
-        "wage": {2014: 91410, 2015: 93010, 2016: 96270, 2017: 97970,
-                 2018: 99070, 2019: 101780, 2020: 103480, 2021: 106990,
-                 2022: 110670, 2023: 113200, 2024: 116000},
-    },
-    "17-2031": {  # Biomedical Engineers
-        "employment": {2014: 22100, 2015: 22300, 2016: 21200, 2017: 21800,
-                       2018: 21300, 2019: 20400, 2020: 19600, 2021: 20000,
-                       2022: 20300, 2023: 20600, 2024: 21000},
-        "wage": {2014: 86950, 2015: 88040, 2016: 88550, 2017: 89960,
-                 2018: 91410, 2019: 97090, 2020: 97090, 2021: 99550,
-                 2022: 100390, 2023: 103500, 2024: 106800},
-    },
-    "19-1042": {  # Medical Scientists
-        "employment": {2014: 105100, 2015: 107600, 2016: 112300, 2017: 120000,
-                       2018: 126700, 2019: 131200, 2020: 131000, 2021: 136000,
-                       2022: 140200, 2023: 144000, 2024: 148000},
-        "wage": {2014: 82240, 2015: 84810, 2016: 87240, 2017: 88790,
-                 2018: 91510, 2019: 95310, 2020: 95310, 2021: 99930,
-                 2022: 104000, 2023: 108000, 2024: 111200},
-    },
-    "19-2041": {  # Environmental Scientists
-        "employment": {2014: 89500, 2015: 89800, 2016: 90700, 2017: 92800,
-                       2018: 94500, 2019: 96200, 2020: 96000, 2021: 98000,
-                       2022: 99700, 2023: 101000, 2024: 103000},
-        "wage": {2014: 67460, 2015: 69890, 2016: 71360, 2017: 73230,
-                 2018: 76530, 2019: 78590, 2020: 80470, 2021: 83400,
-                 2022: 86230, 2023: 89300, 2024: 92000},
-    },
-    "19-3011": {  # Economists
-        "employment": {2014: 21300, 2015: 21500, 2016: 21500, 2017: 21600,
-                       2018: 22000, 2019: 22300, 2020: 22000, 2021: 22600,
-                       2022: 22900, 2023: 23200, 2024: 23400},
-        "wage": {2014: 99180, 2015: 101050, 2016: 102490, 2017: 104340,
-                 2018: 108350, 2019: 114020, 2020: 116020, 2021: 118970,
-                 2022: 120000, 2023: 123000, 2024: 126000},
-    },
-    "23-1011": {  # Lawyers
-        "employment": {2014: 609930, 2015: 618400, 2016: 633470, 2017: 649700,
-                       2018: 658700, 2019: 666200, 2020: 658600, 2021: 672000,
-                       2022: 686300, 2023: 698100, 2024: 710000},
-        "wage": {2014: 114970, 2015: 118160, 2016: 120910, 2017: 122960,
-                 2018: 126930, 2019: 126930, 2020: 131550, 2021: 135740,
-                 2022: 135740, 2023: 145760, 2024: 150000},
-    },
-    "19-3094": {  # Political Scientists
-        "employment": {2014: 5200, 2015: 5300, 2016: 5400, 2017: 5500,
-                       2018: 5600, 2019: 5800, 2020: 5700, 2021: 5900,
-                       2022: 6000, 2023: 6100, 2024: 6200},
-        "wage": {2014: 104920, 2015: 107420, 2016: 109070, 2017: 112030,
-                 2018: 114290, 2019: 125350, 2020: 125350, 2021: 128020,
-                 2022: 130000, 2023: 132000, 2024: 135000},
-    },
-    "19-3051": {  # Urban Planners
-        "employment": {2014: 36000, 2015: 36500, 2016: 37200, 2017: 37900,
-                       2018: 38300, 2019: 39200, 2020: 38400, 2021: 39700,
-                       2022: 40100, 2023: 40800, 2024: 41500},
-        "wage": {2014: 66940, 2015: 68220, 2016: 71490, 2017: 73050,
-                 2018: 75950, 2019: 78500, 2020: 80180, 2021: 82720,
-                 2022: 84340, 2023: 87200, 2024: 90000},
-    },
-    "25-2031": {  # High School Teachers
-        "employment": {2014: 955800, 2015: 960300, 2016: 970300, 2017: 983600,
-                       2018: 1000500, 2019: 1020000, 2020: 1010000, 2021: 1035000,
-                       2022: 1050000, 2023: 1060000, 2024: 1070000},
-        "wage": {2014: 56310, 2015: 57200, 2016: 58030, 2017: 59170,
-                 2018: 60320, 2019: 62870, 2020: 63550, 2021: 65090,
-                 2022: 67080, 2023: 69600, 2024: 72000},
-    },
-    "25-1099": {  # College Professors
-        "employment": {2014: 153700, 2015: 156700, 2016: 160500, 2017: 163000,
-                       2018: 166000, 2019: 169700, 2020: 162000, 2021: 170000,
-                       2022: 174000, 2023: 177000, 2024: 180000},
-        "wage": {2014: 72470, 2015: 75000, 2016: 76000, 2017: 78300,
-                 2018: 80560, 2019: 81000, 2020: 82500, 2021: 84760,
-                 2022: 87000, 2023: 89500, 2024: 92000},
-    },
-    "27-1024": {  # Graphic Designers
-        "employment": {2014: 261600, 2015: 261000, 2016: 259500, 2017: 258400,
-                       2018: 265000, 2019: 268200, 2020: 254000, 2021: 263900,
-                       2022: 266900, 2023: 270000, 2024: 273000},
-        "wage": {2014: 46900, 2015: 47640, 2016: 48700, 2017: 49560,
-                 2018: 52110, 2019: 53380, 2020: 54680, 2021: 57990,
-                 2022: 60400, 2023: 63000, 2024: 65500},
-    },
-    "27-3042": {  # Technical Writers
-        "employment": {2014: 52400, 2015: 52600, 2016: 53200, 2017: 54100,
-                       2018: 56200, 2019: 57500, 2020: 57000, 2021: 57500,
-                       2022: 58000, 2023: 58500, 2024: 59000},
-        "wage": {2014: 69850, 2015: 71950, 2016: 72850, 2017: 73930,
-                 2018: 76860, 2019: 79960, 2020: 83100, 2021: 84000,
-                 2022: 86000, 2023: 88500, 2024: 91300},
-    },
-    "27-3043": {  # Writers & Authors / Content Strategist
-        "employment": {2014: 40800, 2015: 41100, 2016: 41900, 2017: 43400,
-                       2018: 44200, 2019: 45200, 2020: 43000, 2021: 44200,
-                       2022: 45000, 2023: 46000, 2024: 47000},
-        "wage": {2014: 58850, 2015: 60250, 2016: 62170, 2017: 63200,
-                 2018: 64560, 2019: 67120, 2020: 69120, 2021: 72000,
-                 2022: 73680, 2023: 76000, 2024: 78500},
-    },
-    "11-9151": {  # Social/Community Service Managers
-        "employment": {2014: 138600, 2015: 141200, 2016: 144100, 2017: 149400,
-                       2018: 154000, 2019: 160100, 2020: 157700, 2021: 164000,
-                       2022: 170000, 2023: 175000, 2024: 180000},
-        "wage": {2014: 63250, 2015: 64000, 2016: 65150, 2017: 67150,
-                 2018: 69600, 2019: 72100, 2020: 72800, 2021: 76000,
-                 2022: 78000, 2023: 81000, 2024: 83500},
-    },
-    "11-1021": {  # General Managers
-        "employment": {2014: 2124900, 2015: 2160000, 2016: 2200000, 2017: 2258000,
-                       2018: 2300000, 2019: 2345000, 2020: 2250000, 2021: 2350000,
-                       2022: 2407000, 2023: 2440000, 2024: 2500000},
-        "wage": {2014: 97270, 2015: 99310, 2016: 102690, 2017: 104700,
-                 2018: 108700, 2019: 115900, 2020: 115900, 2021: 119430,
-                 2022: 122860, 2023: 127000, 2024: 131000},
-    },
-}
-
-
-def get_historical_data(career_mapping):
-    """Get historical employment and wage data for all careers."""
+# Fallback history compiled from published BLS OES tables (2014-2024) lives in
+# fallbacks.zip; employment in jobs, wages in annual dollars
+__getattr__ = fallbacks.module_getattr(__name__, {"FALLBACK_HISTORICAL": "history"})
+
+def get_historical_data(career_mapping, budget=None):
+    """Get historical employment and wage data for all careers.
+
+    `budget` caps the BLS API calls in seconds.
+    """
     print("\n--- Fetching BLS Historical Data ---")
 
-    soc_codes = list(set(c["soc_code"] for c in career_mapping.values()))
+    soc_codes = sorted(set(c["soc_code"] for c in career_mapping.values()))
     print(f"  {len(soc_codes)} unique SOC codes")
 
     # Try API first
     result = {}
     if BLS_API_KEY:
         print("  [info] Using BLS API key")
-        result = fetch_from_bls(soc_codes)
+        result = deadlines.run("history", fetch_from_bls, soc_codes, budget=budget)
+        if result is None:
+            result = deadlines.fallback("history", fallbacks.load("history"))
+            print(f"  [done] Historical data for {len(result)} SOC codes")
+            return result
         print(f"  [api] Got data for {len(result)} SOC codes")
 
     # Fall back to compiled data if API didn't return enough
     if len(result) < len(soc_codes) // 2:
         print("  [fallback] Using compiled BLS historical data")
-        result = FALLBACK_HISTORICAL
+        deadlines.mark_fallback("history")
+        result = fallbacks.load("history")
+    else:
+        deadlines.remember("history", result)
 
     print(f"  [done] Historical data for {len(result)} SOC codes")
     return result
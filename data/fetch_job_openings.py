@@ -4,15 +4,16 @@ Falls back to BLS annual openings data if no API key provided.
 """
 import json
 import os
-import time
-import requests
 from dotenv import load_dotenv
+import deadlines
+import fallbacks
+import metrics
 
 load_dotenv(os.path.join(os.path.dirname(__file__), ".env"))
 
 ADZUNA_APP_ID = os.getenv("ADZUNA_APP_ID")
 ADZUNA_APP_KEY = os.getenv("ADZUNA_APP_KEY")
-ADZUNA_BASE = "https://api.adzuna.com/v1/api/jobs/us/search/1"
+ADZUNA_BASE = os.getenv("ADZUNA_BASE", "https://api.adzuna.com/v1/api/jobs/us/search/1")
 
 def load_career_mapping():
     mapping_path = os.path.join(os.path.dirname(__file__), "career_mapping.json")
@@ -21,6 +22,7 @@ def load_career_mapping():
 
 def fetch_adzuna_count(query):
     """Fetch job count from Adzuna for a search query."""
+    import requests
     params = {
         "app_id": ADZUNA_APP_ID,
         "app_key": ADZUNA_APP_KEY,
@@ -29,8 +31,9 @@ def fetch_adzuna_count(query):
         "content-type": "application/json",
     }
     try:
-        resp = requests.get(ADZUNA_BASE, params=params, timeout=15)
+        resp = requests.get(ADZUNA_BASE, params=params, timeout=deadlines.timeout(15))
         resp.raise_for_status()
+        metrics.count("bytes_downloaded", len(resp.content))
         data = resp.json()
         return data.get("count", 0)
     except Exception as e:
@@ -56,56 +59,24 @@ def fetch_job_openings(career_mapping):
             result[career_id] = count
             print(f"    → {count:,} openings")
 
-        time.sleep(1)  # Rate limit: 1 req/sec
+        deadlines.sleep(1)  # Rate limit: 1 req/sec
 
     print(f"  [done] Got openings for {len(result)}/{len(career_mapping)} careers")
     return result
 
-# Fallback estimates based on BLS data + general market knowledge
-FALLBACK_OPENINGS = {
-    "software-engineer": 140100,
-    "data-scientist": 20800,
-    "product-manager": 34000,
-    "ux-designer": 18900,
-    "cybersecurity-analyst": 17300,
-    "devops-engineer": 24500,
-    "ai-ml-engineer": 20800,
-    "management-consultant": 92700,
-    "investment-banking": 27400,
-    "financial-analyst": 27400,
-    "marketing-manager": 34000,
-    "accountant": 126500,
-    "supply-chain-analyst": 23800,
-    "physician": 24200,
-    "registered-nurse": 193100,
-    "physician-assistant": 12200,
-    "pharmacist": 11400,
-    "public-health-analyst": 900,
-    "mechanical-engineer": 17900,
-    "civil-engineer": 24200,
-    "electrical-engineer": 12700,
-    "biomedical-engineer": 1200,
-    "research-scientist": 10000,
-    "environmental-scientist": 8000,
-    "economist": 1500,
-    "lawyer": 39100,
-    "policy-analyst": 300,
-    "urban-planner": 3700,
-    "high-school-teacher": 77400,
-    "college-professor": 25000,
-    "graphic-designer": 22800,
-    "technical-writer": 5500,
-    "content-strategist": 8200,
-    "nonprofit-manager": 19300,
-    "startup-founder": 291800,
-}
+# Fallback estimates (BLS data + general market knowledge) live in fallbacks.zip
+__getattr__ = fallbacks.module_getattr(__name__, {"FALLBACK_OPENINGS": "openings"})
 
-def get_job_openings(career_mapping):
-    """Get job openings with fallback."""
-    data = fetch_job_openings(career_mapping)
+def get_job_openings(career_mapping, budget=None):
+    """Get job openings with fallback. `budget` caps the fetch in seconds."""
+    data = deadlines.run("openings", fetch_job_openings, career_mapping, budget=budget)
+    if data is None:
+        return deadlines.fallback("openings", fallbacks.load("openings"))
     if len(data) < 5:
         print("  [fallback] Using estimated openings from BLS data")
-        data = FALLBACK_OPENINGS
+        deadlines.mark_fallback("openings")
+        return fallbacks.load("openings")
+    deadlines.remember("openings", data)
     return data
 
 if __name__ == "__main__":
@@ -0,0 +1,237 @@
+"""
+Per-source freshness manifest and TTL scheduling.
+
+data/raw/freshness.json records, for every source, when it was last fetched
+live, the digest of its parsed output, and the HTTP validators (ETag /
+Last-Modified) of each file it downloads. A source is stale once its TTL has
+elapsed; `collect_all.py --stale-only` and refresh.py refetch only stale
+sources and load everything else from the stage artifacts.
+
+Downloads of stale sources are revalidated with If-None-Match /
+If-Modified-Since, so an unchanged BLS or O*NET file costs one 304 response.
+
+TTLs default to DEFAULT_TTLS and can be overridden with --ttls or PATHIQ_TTLS:
+    PATHIQ_TTLS="openings=6h,layoffs=3d" python refresh.py --daemon
+"""
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+TTLS_ENV = "PATHIQ_TTLS"
+FRESHNESS_PATH = os.path.join(os.path.dirname(__file__), "raw", "freshness.json")
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# Source -> pipeline stage that fetches it
+SOURCE_STAGES = {
+    "oews": "fetch_oews",
+    "projections": "fetch_projections",
+    "onet": "fetch_onet",
+    "openings": "fetch_openings",
+    "levels": "fetch_levels",
+    "layoffs": "fetch_layoffs",
+    "history": "history",
+}
+
+# Files each source downloads (revalidated when the source is stale)
+SOURCE_FILES = {
+    "oews": ["oesm24nat.zip"],
+    "projections": ["occupation_projections.xlsx"],
+    "onet": ["onet_database.zip"],
+}
+
+# Adzuna counts move daily, layoffs and levels.fyi weekly; BLS and O*NET
+# publish yearly, so a monthly conditional GET is plenty.
+DEFAULT_TTLS = {
+    "oews": 30 * DAY,
+    "projections": 30 * DAY,
+    "onet": 30 * DAY,
+    "openings": 1 * DAY,
+    "levels": 7 * DAY,
+    "layoffs": 7 * DAY,
+    "history": 30 * DAY,
+}
+
+# A source that fell back (no keys, site down, deadline hit) is retried after
+# this long, or after its TTL if that is shorter
+RETRY_AFTER_S = HOUR
+
+UNITS = {"s": 1, "m": 60, "h": HOUR, "d": DAY}
+
+_manifest = None
+_revalidate = set()  # filenames whose cached copy must be revalidated
+
+
+def parse_duration(text):
+    """'90' -> 90, '15m' -> 900, '6h' -> 21600, '7d' -> 604800 (seconds)."""
+    text = str(text).strip().lower()
+    if text and text[-1] in UNITS:
+        return float(text[:-1]) * UNITS[text[-1]]
+    return float(text)
+
+
+def parse_ttls(spec):
+    """'openings=6h,layoffs=3d' -> {'openings': 21600.0, 'layoffs': 259200.0}."""
+    ttls = {}
+    for part in (spec or "").split(","):
+        if "=" in part:
+            name, value = part.split("=", 1)
+            ttls[name.strip()] = parse_duration(value)
+    return ttls
+
+
+def resolve_ttls(spec=None):
+    """DEFAULT_TTLS overridden by `spec` (or PATHIQ_TTLS)."""
+    ttls = dict(DEFAULT_TTLS)
+    ttls.update(parse_ttls(spec if spec is not None else os.getenv(TTLS_ENV)))
+    return ttls
+
+
+def format_age(seconds):
+    if seconds is None:
+        return "never"
+    for unit, size in (("d", DAY), ("h", HOUR), ("m", 60)):
+        if seconds >= size:
+            return f"{seconds / size:.1f}{unit}"
+    return f"{seconds:.0f}s"
+
+
+class FreshnessManifest:
+    """JSON manifest of per-source fetch times, output digests and validators."""
+
+    def __init__(self, path=FRESHNESS_PATH):
+        self.path = path
+        if os.path.exists(path):
+            with open(path) as f:
+                self.data = json.load(f)
+        else:
+            self.data = {"sources": {}, "files": {}}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def source(self, name):
+        return self.data["sources"].get(name, {})
+
+    def age(self, name, now=None):
+        """Seconds since `name` was last fetched live, or None if never."""
+        fetched = self.source(name).get("fetched_at_ts")
+        if fetched is None:
+            return None
+        return (now or time.time()) - fetched
+
+    def due_in(self, name, ttl, now=None):
+        """Seconds until `name` is stale; 0 when it already is."""
+        now = now or time.time()
+        entry = self.source(name)
+        due = 0.0
+        if entry.get("fetched_at_ts") is not None:
+            due = entry["fetched_at_ts"] + ttl - now
+        # A recent attempt that fell back waits out the retry interval
+        attempt = entry.get("last_attempt_ts")
+        if attempt is not None and attempt > (entry.get("fetched_at_ts") or 0):
+            due = max(due, attempt + min(ttl, RETRY_AFTER_S) - now)
+        return max(0.0, due)
+
+    def is_stale(self, name, ttl, now=None):
+        return self.due_in(name, ttl, now) == 0
+
+    def stale_sources(self, ttls, now=None):
+        return [s for s in SOURCE_STAGES if self.is_stale(s, ttls[s], now)]
+
+    def next_due(self, ttls, now=None):
+        """Seconds until the next source goes stale (0 if one already is)."""
+        return min(self.due_in(s, ttls[s], now) for s in SOURCE_STAGES)
+
+    def mark_fetched(self, name, digest):
+        """Record a live fetch. Returns True if the output changed since last time."""
+        entry = self.data["sources"].setdefault(name, {})
+        changed = entry.get("digest") != digest
+        now = datetime.now(timezone.utc)
+        entry.update({
+            "fetched_at": now.isoformat(),
+            "fetched_at_ts": now.timestamp(),
+            "digest": digest,
+        })
+        if changed:
+            entry["changed_at"] = now.isoformat()
+        return changed
+
+    def mark_attempt(self, name, served):
+        """Record a refresh that fell back; the source is retried after RETRY_AFTER_S."""
+        entry = self.data["sources"].setdefault(name, {})
+        now = datetime.now(timezone.utc)
+        entry["last_attempt"] = now.isoformat()
+        entry["last_attempt_ts"] = now.timestamp()
+        entry["last_attempt_served"] = served
+
+    def validators(self, filename):
+        return self.data["files"].get(filename, {})
+
+    def record_validators(self, filename, headers):
+        self.data["files"][filename] = {
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "checked_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+
+def manifest():
+    """Process-wide manifest, loaded on first use."""
+    global _manifest
+    if _manifest is None:
+        _manifest = FreshnessManifest()
+    return _manifest
+
+
+def begin_refresh(sources):
+    """Revalidate the cached downloads of `sources` during this run."""
+    _revalidate.clear()
+    for name in sources:
+        _revalidate.update(SOURCE_FILES.get(name, []))
+
+
+def should_revalidate(filename):
+    return filename in _revalidate
+
+
+def conditional_headers(filename):
+    """If-None-Match / If-Modified-Since for a cached download."""
+    v = manifest().validators(filename)
+    headers = {}
+    if v.get("etag"):
+        headers["If-None-Match"] = v["etag"]
+    if v.get("last_modified"):
+        headers["If-Modified-Since"] = v["last_modified"]
+    return headers
+
+
+def record_download(filename, headers):
+    """Store the validators of a fresh download (or a 304 revalidation)."""
+    m = manifest()
+    if headers.get("ETag") or headers.get("Last-Modified"):
+        m.record_validators(filename, headers)
+    else:
+        m.data["files"].setdefault(filename, {})["checked_at"] = datetime.now(timezone.utc).isoformat()
+    m.save()
+
+
+def print_status(ttls, m=None):
+    m = m or manifest()
+    print(f"  {'source':<12} {'ttl':>7} {'age':>7}  {'state':<6} last fetched")
+    for name in SOURCE_STAGES:
+        entry = m.source(name)
+        if m.is_stale(name, ttls[name]):
+            state = "stale"
+        elif entry.get("last_attempt_ts", 0) > entry.get("fetched_at_ts", 0):
+            state = "retry"
+        else:
+            state = "fresh"
+        fetched = (entry.get("fetched_at") or "never")[:19]
+        print(f"  {name:<12} {format_age(ttls[name]):>7} {format_age(m.age(name)):>7}  {state:<6} {fetched}")
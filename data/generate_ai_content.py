@@ -75,8 +75,8 @@ def generate_for_career(career, client):
     return json.loads(content)
 
 
-def main():
-    force = "--force" in sys.argv
+def main(argv=None):
+    force = "--force" in (sys.argv[1:] if argv is None else argv)
 
     if not OPENAI_API_KEY:
         print("[error] OPENAI_API_KEY required in data/.env")
@@ -0,0 +1,292 @@
+"""
+Pre-generate shared AI comparisons for career pairs (and triples).
+
+The compare API caches analyses per user, so every user who compares the same
+careers pays for a GPT-4o call. This job generates the user-agnostic analysis
+(the one the API produces for a student without a profile) ahead of time and
+stores it in the shared_comparisons table under a canonical key: the sorted
+career ids joined with ','. The API serves it before calling OpenAI.
+
+Each row keeps a digest of every career's prompt inputs. A comparison is
+regenerated only when one of its careers' inputs changed (or with --force).
+
+Calls run on a thread pool (--workers) behind a shared rate limiter (--rpm),
+and failed calls are retried with backoff.
+
+Combinations are ranked by how often users already compared them (the
+comparisons table), then by how many careers share a category; --top keeps
+the first N per size.
+
+Usage:
+  python generate_comparisons.py [--sizes 2,3] [--top N] [--workers 4] [--rpm 60]
+                                 [--force] [--dry-run]
+
+Requires:
+  - OPENAI_API_KEY in data/.env
+  - SUPABASE_URL and SUPABASE_KEY in data/.env
+  - supabase/migration_003_shared_comparisons.sql applied
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+
+load_dotenv(os.path.join(os.path.dirname(__file__), ".env"))
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+COMPARE_MODEL = os.getenv("COMPARE_MODEL", "gpt-4o")
+
+TABLE = "shared_comparisons"
+UPSERT_BATCH = 50
+# PostgREST returns at most 1000 rows per request
+PAGE_SIZE = 1000
+MAX_ATTEMPTS = 3
+
+# Career fields the compare API sends to the model (src/app/api/compare/route.ts)
+COMPARISON_FIELDS = [
+    "title", "category", "salary_entry", "salary_median", "salary_year5", "salary_year10",
+    "growth_rate", "current_openings", "employment_total", "minimum_degree",
+    "work_life_balance", "remote_options", "layoff_risk", "time_to_promotion", "career_ceiling",
+]
+
+# The API's user context when the request has no student profile
+SHARED_USER_CONTEXT = "an undergraduate student exploring career options"
+
+SYSTEM_PROMPT = ("You are a career decision analyst with expertise in labor markets and data analysis. "
+                 "Provide concise, data-driven analysis.")
+
+
+def paths_key(ids):
+    """Canonical cache key: sorted career ids joined with ','."""
+    return ",".join(sorted(ids))
+
+
+def comparison_inputs(career):
+    return {field: career.get(field) for field in COMPARISON_FIELDS}
+
+
+def input_digest(career):
+    payload = json.dumps(comparison_inputs(career), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def get_prompt(careers):
+    """Same prompt as the compare API, for a student without a profile."""
+    data = json.dumps([comparison_inputs(c) for c in careers], indent=2)
+    return f"""Analyze the trade-offs between the following post-graduation paths for {SHARED_USER_CONTEXT}.
+
+Path data:
+{data}
+
+Provide:
+1. A 2-3 sentence executive summary of the key trade-off
+2. Dimension-by-dimension analysis: compensation trajectory, time investment, market outlook, stability, growth potential
+3. A personalized recommendation based on the student's profile
+4. One non-obvious insight
+
+Constraints:
+- Cite specific numbers from the data
+- Consider opportunity cost and net present value
+- Acknowledge uncertainty where data is limited
+- Be supportive but data-driven
+- 200-250 words max"""
+
+
+class RateLimiter:
+    """Spaces calls at least 60/rpm seconds apart across all worker threads."""
+
+    def __init__(self, rpm):
+        self.interval = 60.0 / rpm if rpm else 0.0
+        self.lock = threading.Lock()
+        self.next_at = 0.0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_at)
+            self.next_at = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def rank_combinations(careers, size, demand, top=None):
+    """Career-id tuples of `size`, most requested first, then same-category ones."""
+    by_id = {c["id"]: c for c in careers}
+
+    def score(combo):
+        categories = Counter(by_id[cid].get("category") for cid in combo)
+        return (-demand.get(paths_key(combo), 0), -max(categories.values()), combo)
+
+    combos = sorted(itertools.combinations(sorted(by_id), size), key=score)
+    return combos[:top] if top else combos
+
+
+def fetch_all(supabase, table, columns, order):
+    """Every row of `table`, one PAGE_SIZE page at a time."""
+    rows = []
+    while True:
+        page = (supabase.table(table).select(columns).order(order)
+                .range(len(rows), len(rows) + PAGE_SIZE - 1).execute().data or [])
+        rows += page
+        if len(page) < PAGE_SIZE:
+            return rows
+
+
+def load_demand(supabase):
+    """How often each set of careers was compared, from the per-user cache."""
+    rows = fetch_all(supabase, "comparisons", "id,paths_compared", "id")
+    return Counter(paths_key(r["paths_compared"]) for r in rows if r.get("paths_compared"))
+
+
+def load_existing(supabase):
+    rows = fetch_all(supabase, TABLE, "paths_key,career_digests", "paths_key")
+    return {r["paths_key"]: r["career_digests"] for r in rows}
+
+
+def plan_jobs(combos, by_id, existing, force=False):
+    """(combo, digests) for every combination that is missing or out of date."""
+    jobs = []
+    for combo in combos:
+        digests = {cid: input_digest(by_id[cid]) for cid in combo}
+        if force or existing.get(paths_key(combo)) != digests:
+            jobs.append((combo, digests))
+    return jobs
+
+
+def generate_comparison(client, careers, limiter):
+    """One chat completion, retried with backoff on errors (429s included)."""
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        limiter.wait()
+        try:
+            completion = client.chat.completions.create(
+                model=COMPARE_MODEL,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": get_prompt(careers)},
+                ],
+                max_tokens=600,
+            )
+            return completion.choices[0].message.content
+        except Exception:
+            if attempt == MAX_ATTEMPTS:
+                raise
+            time.sleep(2 ** attempt)
+
+
+def run_jobs(jobs, by_id, client, supabase, workers, limiter):
+    """Generate on a thread pool; upsert results in batches from this thread."""
+    done = errors = 0
+    pending = []
+
+    def flush():
+        if pending:
+            supabase.table(TABLE).upsert(pending).execute()
+            pending.clear()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(generate_comparison, client, [by_id[cid] for cid in combo], limiter):
+                   (combo, digests) for combo, digests in jobs}
+        for i, future in enumerate(as_completed(futures), 1):
+            combo, digests = futures[future]
+            key = paths_key(combo)
+            try:
+                analysis = future.result()
+            except Exception as e:
+                print(f"  [{i}/{len(jobs)}] {key}: error: {e}")
+                errors += 1
+                continue
+            pending.append({
+                "paths_key": key,
+                "paths_compared": sorted(combo),
+                "ai_analysis": analysis,
+                "career_digests": digests,
+                "model": COMPARE_MODEL,
+                "generated_at": datetime.now(timezone.utc).isoformat(),
+            })
+            done += 1
+            print(f"  [{i}/{len(jobs)}] {key}: done")
+            if len(pending) >= UPSERT_BATCH:
+                flush()
+    flush()
+    return done, errors
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-generate shared AI career comparisons")
+    parser.add_argument("--sizes", default="2", help="Comparison sizes, e.g. 2 or 2,3 (default 2)")
+    parser.add_argument("--top", type=int, help="Only the N highest-ranked combinations per size")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent OpenAI calls (default 4)")
+    parser.add_argument("--rpm", type=float, default=60, help="Max requests per minute (default 60)")
+    parser.add_argument("--force", action="store_true", help="Regenerate even if inputs are unchanged")
+    parser.add_argument("--dry-run", action="store_true", help="List what would be generated and exit")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        print("[error] SUPABASE_URL and SUPABASE_KEY required in data/.env")
+        sys.exit(1)
+    if not OPENAI_API_KEY and not args.dry_run:
+        print("[error] OPENAI_API_KEY required in data/.env")
+        sys.exit(1)
+
+    try:
+        from supabase import create_client
+    except ImportError:
+        print("[error] supabase package not installed: pip install supabase")
+        sys.exit(1)
+
+    supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+    careers = supabase.table("careers").select("*").execute().data
+    if not careers:
+        print("[error] No careers found in Supabase")
+        sys.exit(1)
+    by_id = {c["id"]: c for c in careers}
+
+    demand = load_demand(supabase)
+    existing = load_existing(supabase)
+    combos = []
+    for size in (int(s) for s in args.sizes.split(",")):
+        combos += rank_combinations(careers, size, demand, args.top)
+    jobs = plan_jobs(combos, by_id, existing, force=args.force)
+
+    print(f"Found {len(careers)} careers, {len(combos)} combinations, "
+          f"{len(combos) - len(jobs)} up to date, {len(jobs)} to generate")
+    if args.dry_run or not jobs:
+        for combo, _ in jobs[:20]:
+            print(f"  {paths_key(combo)}")
+        if len(jobs) > 20:
+            print(f"  ... and {len(jobs) - 20} more")
+        return
+
+    try:
+        from openai import OpenAI
+    except ImportError:
+        print("[error] openai package not installed: pip install openai")
+        sys.exit(1)
+
+    client = OpenAI(api_key=OPENAI_API_KEY)
+    limiter = RateLimiter(args.rpm)
+    print(f"Generating with {args.workers} workers at up to {args.rpm:g} requests/min")
+    generated, errors = run_jobs(jobs, by_id, client, supabase, args.workers, limiter)
+
+    print(f"\nSummary:")
+    print(f"  Generated: {generated}")
+    print(f"  Up to date: {len(combos) - len(jobs)}")
+    print(f"  Errors: {errors}")
+
+
+if __name__ == "__main__":
+    main()
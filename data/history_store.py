@@ -0,0 +1,183 @@
+"""
+Memory-mapped SOC x year store for the historical BLS series.
+
+get_historical_data() returns nested dicts ({soc: {"employment": {year: n},
+"wage": {year: n}}}), and every consumer used to walk them per career with
+sorted(set(...)). The history_store stage writes them once into dense arrays
+instead, one per metric, indexed by SOC row and year column (NaN = no value):
+
+  raw/history/
+    index.json        {"socs": [...], "years": [2014, 2024], "metrics": [...], ...}
+    employment.npy    float64 [len(socs), len(years)]
+    wage.npy
+
+Arrays are opened with mmap_mode="r", so reading one career or one year range
+touches only those pages, nothing is parsed into Python objects, and the same
+files serve every occupation (~800 at full OEWS scale) and any added metric.
+
+    store = HistoryStore.open()
+    store.series("15-1252", "wage")                 # 1-D view over all years
+    store.matrix("employment", start=2019)          # every SOC, 2019 onwards
+    store.matrix("wage", socs=["15-1252", "29-1141"])
+
+Usage:
+  python history_store.py             # summary of the current store
+  python history_store.py 15-1252     # one SOC's series
+"""
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+
+STORE_DIR = os.path.join(os.path.dirname(__file__), "raw", "history")
+INDEX_FILE = "index.json"
+METRICS = ("employment", "wage")
+DTYPE = "float64"
+
+
+class HistoryStoreError(Exception):
+    """The store is missing, or a SOC code, year or metric is not in it."""
+
+
+class HistoryStore:
+    """Dense per-metric SOC x year arrays, memory-mapped from raw/history/."""
+
+    def __init__(self, directory, index):
+        self.directory = directory
+        self.index = index
+        self.socs = index["socs"]
+        self.first_year, self.last_year = index["years"]
+        self.metrics = tuple(index["metrics"])
+        self._row = {soc: i for i, soc in enumerate(self.socs)}
+        self._arrays = {}
+
+    @classmethod
+    def open(cls, directory=STORE_DIR):
+        try:
+            with open(os.path.join(directory, INDEX_FILE)) as f:
+                index = json.load(f)
+        except OSError as e:
+            raise HistoryStoreError(f"No history store in {directory}: {e}") from e
+        return cls(directory, index)
+
+    @classmethod
+    def build(cls, historical_data, years=None, directory=STORE_DIR, metrics=METRICS):
+        """Write `historical_data` (get_historical_data format) as a new store."""
+        import numpy as np
+        socs = sorted(historical_data)
+        observed = [year for series in historical_data.values()
+                    for metric in metrics for year in series.get(metric, {})]
+        first, last = years or (min(observed, default=0), max(observed, default=-1))
+        column = {year: j for j, year in enumerate(range(first, last + 1))}
+
+        tmp = directory + ".tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        for metric in metrics:
+            array = np.lib.format.open_memmap(os.path.join(tmp, f"{metric}.npy"), mode="w+",
+                                              dtype=DTYPE, shape=(len(socs), len(column)))
+            array[:] = np.nan
+            for i, soc in enumerate(socs):
+                for year, value in historical_data[soc].get(metric, {}).items():
+                    j = column.get(int(year))
+                    if j is not None and value is not None:
+                        array[i, j] = value
+            array.flush()
+            del array
+        index = {
+            "socs": socs,
+            "years": [first, last],
+            "metrics": list(metrics),
+            "dtype": DTYPE,
+            "built_at": datetime.now(timezone.utc).isoformat(),
+        }
+        with open(os.path.join(tmp, INDEX_FILE), "w") as f:
+            json.dump(index, f, indent=2)
+
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(tmp, directory)
+        return cls(directory, index)
+
+    # -- lookups --------------------------------------------------------------
+
+    @property
+    def years(self):
+        return range(self.first_year, self.last_year + 1)
+
+    def row(self, soc):
+        try:
+            return self._row[soc]
+        except KeyError:
+            raise HistoryStoreError(f"SOC {soc} not in history store") from None
+
+    def columns(self, start=None, end=None):
+        """Column slice for years start..end (inclusive; None = open-ended)."""
+        start = self.first_year if start is None else max(start, self.first_year)
+        end = self.last_year if end is None else min(end, self.last_year)
+        return slice(start - self.first_year, end - self.first_year + 1)
+
+    def array(self, metric):
+        """Full memory-mapped [soc, year] array for one metric."""
+        import numpy as np
+        if metric not in self.metrics:
+            raise HistoryStoreError(f"Metric {metric} not in history store ({', '.join(self.metrics)})")
+        if metric not in self._arrays:
+            self._arrays[metric] = np.load(os.path.join(self.directory, f"{metric}.npy"), mmap_mode="r")
+        return self._arrays[metric]
+
+    def series(self, soc, metric, start=None, end=None):
+        """One SOC's values for start..end, a view into the mapped file."""
+        return self.array(metric)[self.row(soc), self.columns(start, end)]
+
+    def matrix(self, metric, socs=None, start=None, end=None):
+        """[len(socs), years] block; every SOC when socs is None (a view, otherwise a copy).
+
+        SOC codes not in the store come back as rows of NaN.
+        """
+        import numpy as np
+        cols = self.columns(start, end)
+        array = self.array(metric)
+        if socs is None:
+            return array[:, cols]
+        rows = np.array([self._row.get(soc, -1) for soc in socs], dtype=np.intp)
+        block = np.full((len(rows), len(self.years[cols])), np.nan)
+        known = rows >= 0
+        block[known] = array[rows[known], cols]
+        return block
+
+    def records(self, soc, start=None, end=None):
+        """[(year, {metric: value})] for years where any metric has a value."""
+        import numpy as np
+        cols = self.columns(start, end)
+        values = np.stack([self.array(m)[self.row(soc), cols] for m in self.metrics])
+        result = []
+        for offset in np.flatnonzero(~np.isnan(values).all(axis=0)):
+            result.append((self.years[cols.start + offset],
+                           {m: None if np.isnan(v) else int(v) for m, v in zip(self.metrics, values[:, offset])}))
+        return result
+
+    def __contains__(self, soc):
+        return soc in self._row
+
+    def __len__(self):
+        return len(self.socs)
+
+
+def print_summary(store):
+    import numpy as np
+    size = sum(os.path.getsize(os.path.join(store.directory, f"{m}.npy")) for m in store.metrics)
+    print(f"{len(store)} SOC codes x {len(store.years)} years ({store.first_year}-{store.last_year}), "
+          f"{size / 1024:.0f} KB, built {store.index['built_at'][:19]}")
+    for metric in store.metrics:
+        filled = np.count_nonzero(~np.isnan(store.array(metric)))
+        print(f"  {metric:<12} {filled:>6} values ({filled / max(store.array(metric).size, 1):.0%} filled)")
+
+
+if __name__ == "__main__":
+    import sys
+    store = HistoryStore.open()
+    if len(sys.argv) > 1:
+        for year, values in store.records(sys.argv[1]):
+            print(f"  {year}  " + "  ".join(f"{m} {v if v is not None else '-':>9}" for m, v in values.items()))
+    else:
+        print_summary(store)
@@ -0,0 +1,157 @@
+"""
+Record-and-replay HTTP cassettes for the pipeline's `requests` traffic.
+
+Set PATHIQ_HTTP_MODE before running any fetcher:
+
+  record   real requests go out; every response is saved as a cassette
+  replay   no network; responses come from cassettes, misses raise CassetteMiss
+  off      (default) nothing is patched
+
+  PATHIQ_HTTP_MODE=record python collect_all.py --force
+  PATHIQ_HTTP_MODE=replay python collect_all.py --force
+
+Cassettes live in PATHIQ_CASSETTE_DIR (default data/raw/cassettes), one JSON
+file per request plus a .bin body file. Keys ignore credentials (Adzuna
+app_id/app_key, BLS registrationkey), so cassettes recorded with one key
+replay with another or with none, and never contain the secrets.
+
+The OpenAI client uses httpx rather than requests; point OPENAI_BASE_URL at
+stub_server.py to exercise generate_ai_content offline.
+"""
+import hashlib
+import json
+import os
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+MODE_ENV = "PATHIQ_HTTP_MODE"
+CASSETTE_DIR_ENV = "PATHIQ_CASSETTE_DIR"
+CASSETTE_DIR = os.path.join(os.path.dirname(__file__), "raw", "cassettes")
+
+SECRET_PARAMS = {"app_id", "app_key", "registrationkey", "api_key"}
+
+_original_request = None
+
+
+class CassetteMiss(requests.ConnectionError):
+    """Replay mode found no cassette for a request (behaves like a network error)."""
+
+
+def _strip_secrets_from_url(url, params):
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if isinstance(params, dict):
+        query += [(k, str(v)) for k, v in params.items()]
+    elif params:
+        query += [(k, str(v)) for k, v in params]
+    query = sorted((k, v) for k, v in query if k not in SECRET_PARAMS)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+
+
+def _normalized_body(data, json_body):
+    body = json_body if json_body is not None else data
+    if isinstance(body, (bytes, str)):
+        try:
+            body = json.loads(body)
+        except ValueError:
+            return body if isinstance(body, str) else body.decode("utf-8", "replace")
+    if isinstance(body, dict):
+        body = {k: v for k, v in body.items() if k not in SECRET_PARAMS}
+        return json.dumps(body, sort_keys=True)
+    return "" if body is None else str(body)
+
+
+def request_key(method, url, params=None, data=None, json_body=None):
+    """Stable cassette key for a request, independent of credentials."""
+    clean_url = _strip_secrets_from_url(url, params)
+    body = _normalized_body(data, json_body)
+    digest = hashlib.sha256(f"{method.upper()} {clean_url}\n{body}".encode()).hexdigest()[:20]
+    return clean_url, digest
+
+
+class CassetteStore:
+    def __init__(self, root=None):
+        self.root = root or os.getenv(CASSETTE_DIR_ENV) or CASSETTE_DIR
+
+    def paths(self, url, digest):
+        host = urlsplit(url).netloc.replace(":", "_") or "local"
+        base = os.path.join(self.root, host, digest)
+        return base + ".json", base + ".bin"
+
+    def save(self, method, url, digest, response):
+        meta_path, body_path = self.paths(url, digest)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        with open(body_path, "wb") as f:
+            f.write(response.content)
+        with open(meta_path, "w") as f:
+            json.dump({
+                "request": {"method": method.upper(), "url": url},
+                "response": {
+                    "status": response.status_code,
+                    "reason": response.reason,
+                    "headers": dict(response.headers),
+                    "body_sha256": hashlib.sha256(response.content).hexdigest(),
+                },
+            }, f, indent=2)
+
+    def load(self, url, digest):
+        meta_path, body_path = self.paths(url, digest)
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            body = f.read()
+        return meta, body
+
+
+def build_response(meta, body, url):
+    resp = requests.Response()
+    resp.status_code = meta["response"]["status"]
+    resp.reason = meta["response"].get("reason")
+    resp.headers = CaseInsensitiveDict(meta["response"].get("headers", {}))
+    # Stored bodies are already decoded; drop transfer encodings
+    resp.headers.pop("Content-Encoding", None)
+    resp._content = body
+    resp.url = url
+    resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+    return resp
+
+
+def install(mode=None, cassette_dir=None):
+    """Patch requests.Session.request for record/replay. Returns the active mode."""
+    global _original_request
+    mode = (mode or os.getenv(MODE_ENV) or "off").lower()
+    if mode == "off":
+        return mode
+    if mode not in ("record", "replay"):
+        raise ValueError(f"{MODE_ENV} must be off, record or replay (got {mode!r})")
+
+    store = CassetteStore(cassette_dir)
+    original = _original_request or requests.Session.request
+    _original_request = original
+
+    def patched(session, method, url, params=None, data=None, json=None, **kwargs):
+        clean_url, digest = request_key(method, url, params, data, json)
+        if mode == "replay":
+            hit = store.load(clean_url, digest)
+            if hit is None:
+                raise CassetteMiss(f"No cassette for {method.upper()} {clean_url}")
+            return build_response(hit[0], hit[1], clean_url)
+
+        resp = original(session, method, url, params=params, data=data, json=json, **kwargs)
+        store.save(method, clean_url, digest, resp)
+        return resp
+
+    requests.Session.request = patched
+    print(f"  [http] {mode} mode, cassettes in {store.root}")
+    return mode
+
+
+def uninstall():
+    global _original_request
+    if _original_request is not None:
+        requests.Session.request = _original_request
+        _original_request = None
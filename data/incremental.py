@@ -0,0 +1,175 @@
+"""
+Incremental recompute after catalog or salary-override edits.
+
+After every successful combine, collect_all saves the career_mapping.json and
+SALARY_OVERRIDES it was built from (raw/artifacts/combine_inputs.json). On the
+next run, an edit to either is diffed against that snapshot, and the pipeline
+only does the work the edit requires:
+
+  - fetch stages reuse their cached output and fetch just the SOC codes (or
+    careers) that are new, filling gaps from the compiled fallbacks
+  - combine rebuilds only the affected careers and keeps the other records
+  - seeding upserts only rows that changed (seed_supabase changed_only)
+
+Adding one career or retuning one override therefore takes seconds instead of
+a full re-download and re-parse. `collect_all.py --force` skips the plan and
+rebuilds everything.
+"""
+import hashlib
+import json
+import os
+
+from pipeline import ARTIFACT_DIR
+
+SNAPSHOT_PATH = os.path.join(ARTIFACT_DIR, "combine_inputs.json")
+
+
+def entry_digest(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()
+
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_snapshot(catalog, overrides, path=SNAPSHOT_PATH):
+    """Record the catalog and overrides the current combine artifact was built from."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"catalog": catalog, "overrides": overrides}, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def diff_entries(old, new):
+    """Keys added, removed and changed between two {key: value} dicts."""
+    added = [k for k in new if k not in old]
+    removed = [k for k in old if k not in new]
+    changed = [k for k in new if k in old and entry_digest(old[k]) != entry_digest(new[k])]
+    return added, removed, changed
+
+
+class CatalogDiff:
+    def __init__(self, old_catalog, catalog, old_overrides, overrides):
+        self.added, self.removed, self.changed = diff_entries(old_catalog, catalog)
+        o_added, o_removed, o_changed = diff_entries(old_overrides, overrides)
+        self.overrides = sorted(set(o_added + o_removed + o_changed))
+
+    @property
+    def catalog_changed(self):
+        return bool(self.added or self.removed or self.changed)
+
+    @property
+    def empty(self):
+        return not self.catalog_changed and not self.overrides
+
+    def summary(self):
+        parts = [f"{len(ids)} {label}" for label, ids in (
+            ("added", self.added), ("removed", self.removed),
+            ("changed", self.changed), ("override edits", self.overrides)) if ids]
+        return ", ".join(parts)
+
+
+class IncrementalPlan:
+    """Reuses the previous run's stage outputs, patching only what an edit touches.
+
+    previous      {stage_name: output} loaded from the artifacts before the run
+    full_sources  sources refetched in full this run (e.g. stale in --stale-only);
+                  any of them forces a full combine
+    """
+
+    def __init__(self, diff, catalog, previous, full_sources=()):
+        self.diff = diff
+        self.catalog = catalog
+        self.previous = previous
+        self.full_sources = set(full_sources)
+        self.patched = set()        # sources served by patch_* this run
+        self.refetched_socs = set()
+        self.refetched_careers = set(diff.added) | set(diff.changed)
+
+    def patch_socs(self, source, previous, fetch_subset=None, fallback=None):
+        """SOC-keyed source output: keep cached SOCs, fetch only missing ones."""
+        self.patched.add(source)
+        wanted = {info["soc_code"] for info in self.catalog.values()}
+        missing = sorted(wanted - set(previous))
+        result = {soc: v for soc, v in previous.items() if soc in wanted}
+        if not missing:
+            return result
+
+        subset = {cid: info for cid, info in self.catalog.items() if info["soc_code"] in missing}
+        print(f"  [incremental] {source}: fetching {len(missing)} new SOC code(s), "
+              f"reusing {len(result)} cached")
+        fetched = (fetch_subset(subset) or {}) if fetch_subset else {}
+        for soc in missing:
+            if soc in fetched:
+                result[soc] = fetched[soc]
+            elif fallback and soc in fallback:
+                result[soc] = fallback[soc]
+        self.refetched_socs.update(soc for soc in missing if soc in result)
+        return result
+
+    def patch_careers(self, source, previous, fetch_subset=None, fallback=None):
+        """Career-keyed source output: refetch only added or edited careers."""
+        self.patched.add(source)
+        result = {cid: v for cid, v in previous.items() if cid in self.catalog}
+        ids = [cid for cid in self.catalog if cid in self.refetched_careers]
+        if not ids:
+            return result
+
+        print(f"  [incremental] {source}: refreshing {len(ids)} career(s), reusing {len(result)} cached")
+        fetched = (fetch_subset({cid: self.catalog[cid] for cid in ids}) or {}) if fetch_subset else {}
+        for cid in ids:
+            if cid in fetched:
+                result[cid] = fetched[cid]
+            elif fallback and cid in fallback:
+                result[cid] = fallback[cid]
+        return result
+
+    def affected_careers(self):
+        """Career ids whose combined record may differ from the cached one."""
+        ids = set(self.refetched_careers) | set(self.diff.overrides)
+        ids |= {cid for cid, info in self.catalog.items() if info["soc_code"] in self.refetched_socs}
+        return [cid for cid in self.catalog if cid in ids]
+
+    def combine_is_partial(self):
+        return not self.full_sources and "combine" in self.previous
+
+    def patch_records(self, combine_one):
+        """Rebuild affected CareerRecords; keep the rest from the cached combine."""
+        cached = {r.id: r for r in self.previous["combine"]}
+        affected = set(self.affected_careers())
+        records = []
+        for cid, info in self.catalog.items():
+            if cid in affected or cid not in cached:
+                records.append(combine_one(cid, info))
+            else:
+                records.append(cached[cid])
+        print(f"  [incremental] Recombined {len(affected)} career(s), reused {len(records) - len(affected)}")
+        if self.diff.removed:
+            print(f"  [info] Removed from catalog (delete from Supabase if needed): "
+                  f"{', '.join(self.diff.removed)}")
+        return records
+
+
+def plan_update(store, catalog, overrides, stages, full_sources=()):
+    """Build an IncrementalPlan, or None when a full run is needed.
+
+    A plan needs a snapshot from a previous combine, an actual edit, and saved
+    artifacts for every stage it would reuse (`stages`).
+    """
+    snapshot = load_snapshot()
+    if snapshot is None:
+        return None
+    diff = CatalogDiff(snapshot["catalog"], catalog, snapshot["overrides"], overrides)
+    if diff.empty:
+        return None
+    missing = [name for name in stages if not store.has(name)]
+    if missing:
+        print(f"  [info] Edit detected but no artifacts for {', '.join(missing)}; running in full")
+        return None
+    print(f"  [incremental] Catalog edit: {diff.summary()}")
+    previous = {name: store.load(name) for name in stages}
+    return IncrementalPlan(diff, catalog, previous, full_sources)
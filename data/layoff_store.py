@@ -0,0 +1,218 @@
+"""
+Append-only store of layoffs.fyi events with rolling-window aggregates.
+
+Every scrape is ingested into raw/layoffs/events.csv. Events are keyed by
+company, date and industry, so re-scraping the full dataset only appends rows
+that were not seen before. Each new event is added to monthly per-category and
+per-industry totals (raw/layoffs/monthly.json), and the 3, 6 and 12-month
+windows are summed from those buckets, never from the raw events. When
+layoffs.fyi corrects an event's count, the new count is appended as a later
+row for the same event (the last row wins) and the bucket moves by the
+difference.
+
+Rows are appended in place; monthly.json records the byte length of
+events.csv it covers (committed_bytes) and is saved after the append. If a
+run stops in between, the next LayoffStore truncates the uncommitted tail, so
+opening the store never reads the event history.
+
+Risk comes from the windows instead of a single snapshot:
+  - share   category's share of all layoffs in the last 6 months
+  - trend   last 3 months vs. the 12-month quarterly average
+
+Usage:
+  python layoff_store.py            # print windows and risk per category
+  python layoff_store.py --rebuild  # recompute the monthly totals from events.csv
+"""
+import argparse
+import hashlib
+import json
+import os
+
+STORE_DIR = os.path.join(os.path.dirname(__file__), "raw", "layoffs")
+EVENTS_PATH = os.path.join(STORE_DIR, "events.csv")
+MONTHLY_PATH = os.path.join(STORE_DIR, "monthly.json")
+
+EVENT_COLUMNS = ["event_id", "company", "date", "laid_off", "industry", "category", "ingested_at"]
+WINDOW_MONTHS = (3, 6, 12)
+
+# Share of the last 6 months' layoffs, and 3-month pace vs. the 12-month quarterly average
+HIGH_SHARE = 0.25
+MEDIUM_SHARE = 0.10
+HIGH_TREND = 1.5
+MEDIUM_TREND = 1.15
+# Below this many layoffs in 6 months a category stays low risk whatever its trend
+MIN_WINDOW_COUNT = 500
+
+
+def event_ids(events):
+    """Stable id per event: company, day and industry (the count can be corrected later)."""
+    keys = (events["company"].str.strip().str.lower() + "|"
+            + events["date"].dt.strftime("%Y-%m-%d") + "|"
+            + events["industry"].str.strip().str.lower())
+    return keys.map(lambda k: hashlib.sha1(k.encode()).hexdigest()[:16])
+
+
+def empty_monthly():
+    return {"category": {}, "industry": {}, "events": 0, "latest": None, "committed_bytes": 0}
+
+
+def month_key(ts):
+    return f"{ts:%Y-%m}"
+
+
+class LayoffStore:
+    """events.csv (append-only) plus monthly totals by category and industry."""
+
+    def __init__(self, directory=STORE_DIR):
+        self.events_path = os.path.join(directory, os.path.basename(EVENTS_PATH))
+        self.monthly_path = os.path.join(directory, os.path.basename(MONTHLY_PATH))
+        self._counts = None
+        if os.path.exists(self.monthly_path):
+            with open(self.monthly_path) as f:
+                self.monthly = json.load(f)
+        else:
+            self.monthly = empty_monthly()
+        self.recover()
+
+    def recover(self):
+        """Bring events.csv and monthly.json back in step after an interrupted ingest."""
+        size = os.path.getsize(self.events_path) if os.path.exists(self.events_path) else 0
+        committed = self.monthly.get("committed_bytes") if os.path.exists(self.monthly_path) else None
+        name = os.path.basename(self.events_path)
+        if committed is None or size < committed:
+            # Totals from before committed_bytes existed, or events.csv replaced by hand
+            if size:
+                print(f"  [warn] {os.path.basename(self.monthly_path)} does not match {name}; rebuilding totals")
+                self.rebuild()
+        elif size > committed:
+            print(f"  [warn] Dropping {size - committed:,} uncommitted bytes from {name}")
+            with open(self.events_path, "r+b") as f:
+                f.truncate(committed)
+
+    def load_events(self):
+        """Stored events, one row per event with its latest count."""
+        import pandas as pd
+        if not os.path.exists(self.events_path):
+            return pd.DataFrame(columns=EVENT_COLUMNS)
+        events = pd.read_csv(self.events_path, parse_dates=["date"])
+        # Ids are recomputed so rows written under an older key collapse onto one event
+        events["event_id"] = event_ids(events)
+        return events.drop_duplicates("event_id", keep="last").reset_index(drop=True)
+
+    def known_counts(self):
+        """{event_id: laid_off} as last stored."""
+        if self._counts is None:
+            events = self.load_events()
+            self._counts = dict(zip(events["event_id"], events["laid_off"].astype(int)))
+        return self._counts
+
+    def ingest(self, events):
+        """Append new events and corrected counts. Returns the number of new events."""
+        import pandas as pd
+        events = events.assign(event_id=event_ids(events))
+        events = events.drop_duplicates("event_id", keep="last")
+        known = self.known_counts()
+        previous = events["event_id"].map(known)
+        new = events[previous.isna()]
+        corrected = events[previous.notna() & (events["laid_off"] != previous)]
+        if new.empty and corrected.empty:
+            return 0
+
+        rows = pd.concat([new, corrected])
+        rows = rows.assign(ingested_at=pd.Timestamp.now(tz="UTC").isoformat())[EVENT_COLUMNS]
+        os.makedirs(os.path.dirname(self.events_path), exist_ok=True)
+        with open(self.events_path, "a", newline="") as f:
+            rows.to_csv(f, header=f.tell() == 0, index=False, date_format="%Y-%m-%d")
+            f.flush()
+            os.fsync(f.fileno())
+        self.monthly["committed_bytes"] = os.path.getsize(self.events_path)
+
+        delta = corrected.assign(laid_off=corrected["laid_off"] - corrected["event_id"].map(known))
+        self.add_to_buckets(pd.concat([new, delta]), new_events=len(new))
+        self.save_monthly()
+        known.update(zip(rows["event_id"], rows["laid_off"].astype(int)))
+        if not corrected.empty:
+            print(f"  [store] {len(corrected):,} corrected counts")
+        return len(new)
+
+    def add_to_buckets(self, events, new_events=None):
+        """Add each row's laid_off to its month; new_events defaults to every row."""
+        months = events["date"].dt.strftime("%Y-%m")
+        for level in ("category", "industry"):
+            sums = events.groupby([events[level], months])["laid_off"].sum()
+            buckets = self.monthly[level]
+            for (name, month), count in sums.items():
+                by_month = buckets.setdefault(name, {})
+                by_month[month] = by_month.get(month, 0) + int(count)
+        self.monthly["events"] += len(events) if new_events is None else new_events
+        latest = month_key(events["date"].max())
+        self.monthly["latest"] = max(filter(None, [self.monthly["latest"], latest]))
+
+    def save_monthly(self):
+        os.makedirs(os.path.dirname(self.monthly_path), exist_ok=True)
+        tmp = self.monthly_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.monthly, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.monthly_path)
+
+    def rebuild(self):
+        """Recompute the monthly totals from events.csv."""
+        self.monthly = empty_monthly()
+        events = self.load_events()
+        if not events.empty:
+            self.add_to_buckets(events)
+        self.monthly["committed_bytes"] = os.path.getsize(self.events_path) if os.path.exists(self.events_path) else 0
+        self._counts = None
+        self.save_monthly()
+        return len(events)
+
+    def windows(self, level="category", now=None):
+        """{name: {3: n, 6: n, 12: n}} layoffs in the trailing 3/6/12 calendar months."""
+        import pandas as pd
+        now = pd.Timestamp(now) if now is not None else pd.Timestamp.now()
+        current = now.to_period("M")
+        months = {n: {str(current - i) for i in range(n)} for n in WINDOW_MONTHS}
+        return {
+            name: {n: sum(c for m, c in by_month.items() if m in months[n]) for n in WINDOW_MONTHS}
+            for name, by_month in self.monthly[level].items()
+        }
+
+
+def risk_from_window(window, total_6m):
+    """'high' / 'medium' / 'low' from one category's 3/6/12-month counts."""
+    if window[6] < MIN_WINDOW_COUNT:
+        return "low"
+    share = window[6] / total_6m if total_6m else 0.0
+    quarterly = window[12] / 4
+    trend = window[3] / quarterly if quarterly else 0.0
+    if share >= HIGH_SHARE or (share >= MEDIUM_SHARE and trend >= HIGH_TREND):
+        return "high"
+    if share >= MEDIUM_SHARE or trend >= MEDIUM_TREND:
+        return "medium"
+    return "low"
+
+
+def category_risk(windows):
+    total_6m = sum(w[6] for w in windows.values())
+    return {name: risk_from_window(w, total_6m) for name, w in windows.items()}
+
+
+def print_windows(windows, risk=None):
+    print(f"  {'':<16} {'3 mo':>9} {'6 mo':>9} {'12 mo':>9}  risk")
+    for name, w in sorted(windows.items(), key=lambda kv: -kv[1][6]):
+        print(f"  {name:<16} {w[3]:>9,} {w[6]:>9,} {w[12]:>9,}  {(risk or {}).get(name, '')}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect the layoff event store")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute monthly totals from events.csv")
+    parser.add_argument("--industry", action="store_true", help="Show windows per industry instead of category")
+    args = parser.parse_args()
+
+    store = LayoffStore()
+    if args.rebuild:
+        print(f"  [done] Rebuilt monthly totals from {store.rebuild():,} events")
+    level = "industry" if args.industry else "category"
+    windows = store.windows(level)
+    print(f"\n{store.monthly['events']:,} events stored, latest month {store.monthly['latest']}\n")
+    print_windows(windows, category_risk(store.windows()) if level == "category" else None)
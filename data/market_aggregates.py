@@ -0,0 +1,201 @@
+"""
+Market aggregates for the insights page, computed once per pipeline run.
+
+The insights page used to rebuild its numbers from every `careers` row on each
+request. The pipeline now computes them after validation, with vectorized
+pandas group-bys over the combined records, and seeds one row per aggregate
+into the market_aggregates table (kind -> JSON payload), so the page reads
+everything in a single primary-key query:
+
+  overall          totals, averages and salary/growth quartiles
+  categories       per category: count, salary and growth quartiles, totals,
+                   growth leader (sorted by average salary)
+  growth_leaders   top careers by projected growth
+  salary_leaders   top careers by median salary
+  quadrants        salary-vs-growth quadrant of every career, split at the
+                   median salary and median growth (null without both figures)
+
+Averages (overall and per category) skip careers with no salary or growth
+figure. The page used to count those as 0, which dragged the averages down;
+missing data is not a zero, so the numbers here run higher than before.
+
+Usage:
+  python market_aggregates.py        # print aggregates for raw/careers_export.json
+"""
+import json
+import math
+import os
+
+RAW_DIR = os.path.join(os.path.dirname(__file__), "raw")
+
+# Charts on the insights page show the top 15 careers
+LEADERS = 15
+
+QUADRANTS = {
+    (True, True): "sweet-spot",      # above-median salary and growth
+    (True, False): "high-pay",
+    (False, True): "rising",
+    (False, False): "lagging",
+}
+
+LEADER_FIELDS = ["id", "title", "category", "salary_entry", "salary_median", "salary_p90",
+                 "salary_year10", "growth_rate_numeric", "current_openings"]
+
+AGGREGATE_KINDS = ["overall", "categories", "growth_leaders", "salary_leaders", "quadrants"]
+
+
+def careers_frame(careers):
+    """DataFrame of the numeric columns the aggregates use, one row per career."""
+    import pandas as pd
+    from career_record import records_to_rows
+    rows = records_to_rows(careers)
+    frame = pd.DataFrame(rows, columns=["id", "title", "category", "layoff_risk",
+                                        "salary_entry", "salary_median", "salary_p25", "salary_p75",
+                                        "salary_p90", "salary_year10", "growth_rate_numeric",
+                                        "current_openings", "employment_total"])
+    numeric = frame.columns[4:]
+    frame[numeric] = frame[numeric].apply(pd.to_numeric, errors="coerce")
+    return frame
+
+
+def health_scores(frame):
+    """Market health score (0-100), same formula as calculateHealthScore in src/lib/utils.ts."""
+    import numpy as np
+    growth = frame["growth_rate_numeric"].fillna(0)
+    growth_score = ((growth + 5) / 35 * 100).clip(0, 100)
+
+    openings = frame["current_openings"].fillna(0)
+    openings_score = (np.log10(openings.where(openings > 0, 1)) / math.log10(500000) * 100).clip(upper=100)
+    openings_score = openings_score.where(openings > 0, 0)
+
+    entry = frame["salary_entry"].fillna(frame["salary_median"]).fillna(0)
+    year10 = frame["salary_year10"].fillna(frame["salary_median"]).fillna(0)
+    trajectory = ((year10 - entry) / entry.where(entry > 0) * 100).fillna(0)
+    trajectory_score = (trajectory / 150 * 100).clip(0, 100)
+
+    risk_score = frame["layoff_risk"].map({"low": 100, "medium": 50, "high": 0}).fillna(50)
+
+    score = growth_score * 0.3 + openings_score * 0.25 + trajectory_score * 0.25 + risk_score * 0.2
+    # Math.round rounds halves up
+    return np.floor(score + 0.5).astype(int)
+
+
+def _num(value, digits=None):
+    """JSON-safe number: None for NaN, int when whole, else rounded float."""
+    if value is None or value != value:
+        return None
+    if digits is None or float(value).is_integer():
+        return int(round(value))
+    return round(float(value), digits)
+
+
+def _quartiles(series, digits=None):
+    q = series.quantile([0.25, 0.5, 0.75])
+    return {"p25": _num(q[0.25], digits), "median": _num(q[0.5], digits), "p75": _num(q[0.75], digits)}
+
+
+def _records(frame, fields):
+    return [{f: _num(v, 1) if isinstance(v, float) else v for f, v in row.items()}
+            for row in frame[fields].to_dict("records")]
+
+
+def overall(frame):
+    return {
+        "careers": len(frame),
+        "avg_salary_median": _num(frame["salary_median"].mean()),
+        "total_employment": _num(frame["employment_total"].sum()),
+        "total_openings": _num(frame["current_openings"].sum()),
+        "avg_growth": _num(frame["growth_rate_numeric"].mean(), 1),
+        "salary": _quartiles(frame["salary_median"]),
+        "growth": _quartiles(frame["growth_rate_numeric"], 1),
+    }
+
+
+def categories(frame):
+    by_category = frame.groupby("category")
+    salary_q = by_category["salary_median"].quantile([0.25, 0.5, 0.75]).unstack()
+    growth_q = by_category["growth_rate_numeric"].quantile([0.25, 0.5, 0.75]).unstack()
+    totals = by_category.agg(count=("id", "size"), avg_salary=("salary_median", "mean"),
+                             avg_growth=("growth_rate_numeric", "mean"),
+                             employment=("employment_total", "sum"), openings=("current_openings", "sum"))
+    ranked = frame.dropna(subset=["growth_rate_numeric"]).sort_values("growth_rate_numeric", ascending=False)
+    leaders = ranked.drop_duplicates("category").set_index("category")
+
+    result = []
+    for name, t in totals.sort_values("avg_salary", ascending=False).iterrows():
+        leader = leaders.loc[name] if name in leaders.index else None
+        result.append({
+            "category": name,
+            "count": int(t["count"]),
+            "avg_salary": _num(t["avg_salary"]),
+            "avg_growth": _num(t["avg_growth"], 1),
+            "salary": {k: _num(salary_q.at[name, q]) for k, q in (("p25", 0.25), ("median", 0.5), ("p75", 0.75))},
+            "growth": {k: _num(growth_q.at[name, q], 1) for k, q in (("p25", 0.25), ("median", 0.5), ("p75", 0.75))},
+            "employment": _num(t["employment"]),
+            "openings": _num(t["openings"]),
+            "growth_leader": None if leader is None else {
+                "id": leader["id"], "title": leader["title"],
+                "growth_rate_numeric": _num(leader["growth_rate_numeric"], 1),
+            },
+        })
+    return result
+
+
+def leaders(frame, column, n=LEADERS):
+    return _records(frame.dropna(subset=[column]).nlargest(n, column), LEADER_FIELDS)
+
+
+def quadrants(frame):
+    """Splits at the median salary and growth; careers missing either get quadrant None."""
+    known = frame["salary_median"].notna() & frame["growth_rate_numeric"].notna()
+    salary_split = frame.loc[known, "salary_median"].median()
+    growth_split = frame.loc[known, "growth_rate_numeric"].median()
+    keys = zip(frame["salary_median"] >= salary_split, frame["growth_rate_numeric"] >= growth_split)
+    labels = [QUADRANTS[k] if ok else None for k, ok in zip(keys, known)]
+    frame = frame.assign(quadrant=labels, market_health_score=health_scores(frame))
+    points = _records(frame, ["id", "title", "category", "salary_median", "growth_rate_numeric",
+                              "current_openings", "market_health_score", "quadrant"])
+    return {
+        "salary_split": _num(salary_split),
+        "growth_split": _num(growth_split, 1),
+        "counts": {q: int((frame["quadrant"] == q).sum()) for q in QUADRANTS.values()},
+        "points": points,
+    }
+
+
+def compute_aggregates(careers):
+    """{kind: payload} for the market_aggregates table."""
+    frame = careers_frame(careers)
+    if frame.empty:
+        return {}
+    return {
+        "overall": overall(frame),
+        "categories": categories(frame),
+        "growth_leaders": leaders(frame, "growth_rate_numeric"),
+        "salary_leaders": leaders(frame, "salary_median"),
+        "quadrants": quadrants(frame),
+    }
+
+
+def print_aggregates(aggregates):
+    o = aggregates["overall"]
+    print(f"  {o['careers']} careers, avg median ${o['avg_salary_median'] or 0:,}, "
+          f"avg growth {o['avg_growth']}%")
+    print(f"\n  {'category':<14} {'count':>5} {'avg salary':>11} {'p25':>9} {'p75':>9} {'growth':>7}  leader")
+    for c in aggregates["categories"]:
+        leader = (c["growth_leader"] or {}).get("title", "-")
+        print(f"  {c['category']:<14} {c['count']:>5} {c['avg_salary'] or 0:>11,} "
+              f"{c['salary']['p25'] or 0:>9,} {c['salary']['p75'] or 0:>9,} {c['avg_growth'] or 0:>6}%  {leader}")
+    q = aggregates["quadrants"]
+    print(f"\n  Quadrants (split at ${q['salary_split']:,} / {q['growth_split']}%): "
+          + ", ".join(f"{name} {n}" for name, n in q["counts"].items()))
+
+
+if __name__ == "__main__":
+    from career_record import records_from_rows
+    export_path = os.path.join(RAW_DIR, "careers_export.json")
+    if not os.path.exists(export_path):
+        print("No careers_export.json found. Run collect_all.py first.")
+    else:
+        with open(export_path) as f:
+            print_aggregates(compute_aggregates(records_from_rows(json.load(f))))
@@ -0,0 +1,193 @@
+"""
+Per-stage timing, memory and I/O metrics for pipeline runs.
+
+run_pipeline wraps every stage in RunMetrics.measure(); fetch, parse and seed
+code reports I/O through the module-level helpers, which are no-ops when no
+stage is being measured (e.g. when a fetch module is run on its own):
+
+    metrics.count("bytes_downloaded", len(resp.content))
+    with metrics.step("parse"):
+        df = pd.read_excel(path)
+
+Each run writes data/raw/runs/<run_id>/metrics.json and, optionally, a
+Prometheus textfile for node_exporter's textfile collector.
+"""
+import json
+import os
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+RUNS_DIR = os.path.join(os.path.dirname(__file__), "raw", "runs")
+
+COUNTERS = ("bytes_downloaded", "rows_parsed", "rows_written")
+
+_current = None  # StageMetrics of the stage currently executing
+
+
+def max_rss_kb():
+    """Process peak resident set size in KB (ru_maxrss is bytes on macOS)."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+class StageMetrics:
+    def __init__(self, name):
+        self.name = name
+        self.status = None
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.max_rss_kb = None
+        self.tracemalloc_peak_bytes = None
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.steps = []
+
+    def to_dict(self):
+        return {
+            "stage": self.name,
+            "status": self.status,
+            "wall_s": round(self.wall_s, 4),
+            "cpu_s": round(self.cpu_s, 4),
+            "max_rss_kb": self.max_rss_kb,
+            "tracemalloc_peak_bytes": self.tracemalloc_peak_bytes,
+            **self.counters,
+            "steps": self.steps,
+        }
+
+
+class RunMetrics:
+    """Collects StageMetrics for one pipeline run."""
+
+    def __init__(self, run_id=None, trace_memory=False, runs_dir=RUNS_DIR):
+        now = datetime.now(timezone.utc)
+        self.run_id = run_id or now.strftime("%Y%m%dT%H%M%SZ")
+        self.started_at = now.isoformat()
+        self.trace_memory = trace_memory
+        self.run_dir = os.path.join(runs_dir, self.run_id)
+        self.stages = []
+
+    @contextmanager
+    def measure(self, name):
+        """Time a stage and collect its counters. Sets status from the outcome."""
+        global _current
+        stage = StageMetrics(name)
+        self.stages.append(stage)
+
+        if self.trace_memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+
+        previous, _current = _current, stage
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        try:
+            yield stage
+            stage.status = stage.status or "ran"
+        except BaseException:
+            stage.status = "failed"
+            raise
+        finally:
+            stage.wall_s = time.perf_counter() - wall0
+            stage.cpu_s = time.process_time() - cpu0
+            stage.max_rss_kb = max_rss_kb()
+            if self.trace_memory:
+                import tracemalloc
+                stage.tracemalloc_peak_bytes = tracemalloc.get_traced_memory()[1]
+            _current = previous
+
+    def record(self, name, status):
+        """Record a stage that did not execute (skipped or loaded from artifact)."""
+        stage = StageMetrics(name)
+        stage.status = status
+        self.stages.append(stage)
+
+    def to_dict(self):
+        totals = dict.fromkeys(COUNTERS, 0)
+        for s in self.stages:
+            for k in COUNTERS:
+                totals[k] += s.counters[k]
+        return {
+            "run_id": self.run_id,
+            "started_at": self.started_at,
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "wall_s": round(sum(s.wall_s for s in self.stages), 4),
+            "max_rss_kb": max_rss_kb(),
+            **totals,
+            "stages": [s.to_dict() for s in self.stages],
+        }
+
+    def write_json(self, path=None):
+        path = path or os.path.join(self.run_dir, "metrics.json")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+    def write_prometheus(self, path):
+        """Write a node_exporter textfile (atomic rename so scrapes never see half a file)."""
+        lines = []
+
+        def metric(name, help_text, kind, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_str = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f"{name}{{{label_str}}} {value}")
+
+        ran = [s for s in self.stages if s.status in ("ran", "failed")]
+        metric("pathiq_stage_wall_seconds", "Stage wall-clock time.", "gauge",
+               [({"stage": s.name}, round(s.wall_s, 4)) for s in ran])
+        metric("pathiq_stage_cpu_seconds", "Stage CPU time.", "gauge",
+               [({"stage": s.name}, round(s.cpu_s, 4)) for s in ran])
+        metric("pathiq_stage_max_rss_kilobytes", "Process peak RSS after the stage.", "gauge",
+               [({"stage": s.name}, s.max_rss_kb) for s in ran])
+        for counter in COUNTERS:
+            metric(f"pathiq_stage_{counter}", f"Stage {counter.replace('_', ' ')}.", "gauge",
+                   [({"stage": s.name}, s.counters[counter]) for s in ran])
+        metric("pathiq_stage_failed", "1 if the stage failed in the last run.", "gauge",
+               [({"stage": s.name}, int(s.status == "failed")) for s in self.stages])
+        metric("pathiq_last_run_timestamp_seconds", "Unix time the last run finished.", "gauge",
+               [({}, int(time.time()))])
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, path)
+        return path
+
+    def print_table(self):
+        print(f"\n  {'stage':<20} {'status':<8} {'wall':>8} {'cpu':>8} {'rss MB':>8} "
+              f"{'down KB':>9} {'parsed':>8} {'written':>8}")
+        for s in self.stages:
+            rss = f"{s.max_rss_kb / 1024:.0f}" if s.max_rss_kb else "-"
+            print(f"  {s.name:<20} {s.status:<8} {s.wall_s:>7.2f}s {s.cpu_s:>7.2f}s {rss:>8} "
+                  f"{s.counters['bytes_downloaded'] / 1024:>9,.0f} "
+                  f"{s.counters['rows_parsed']:>8,} {s.counters['rows_written']:>8,}")
+
+
+def count(name, n=1):
+    """Add n to a counter on the stage currently being measured."""
+    if _current is not None and n:
+        _current.counters[name] = _current.counters.get(name, 0) + n
+
+
+@contextmanager
+def step(name):
+    """Time a sub-step (download, parse, ...) inside the current stage."""
+    if _current is None:
+        yield
+        return
+    stage = _current
+    wall0, cpu0 = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        stage.steps.append({
+            "step": name,
+            "wall_s": round(time.perf_counter() - wall0, 4),
+            "cpu_s": round(time.process_time() - cpu0, 4),
+        })
@@ -0,0 +1,174 @@
+"""
+pathiq-data: one entry point for the data pipeline.
+
+  python pathiq_data.py run [collect_all flags]       # full pipeline
+  python pathiq_data.py fetch [--force ...]           # fetch stages only
+  python pathiq_data.py combine [--force ...]         # recombine into raw/careers_export.json
+  python pathiq_data.py validate                      # check raw/careers_export.json
+  python pathiq_data.py seed                          # push careers_export.json to Supabase
+  python pathiq_data.py generate-ai [--force]         # AI descriptions via OpenAI
+  python pathiq_data.py generate-comparisons [...]    # shared AI comparisons for career pairs
+  python pathiq_data.py recommend [--full ...]        # batch-score changed user profiles
+  python pathiq_data.py refresh [--daemon ...]        # refresh stale sources (refresh.py)
+  python pathiq_data.py import-time [module ...]      # check import times against budgets
+
+Each subcommand imports only the modules it needs, and the modules import
+pandas, requests, asyncio and Playwright inside the functions that use them,
+so `validate` or `seed` start without loading the fetch stack.
+
+`import-time` runs `python -X importtime -c "import <module>"` in a fresh
+interpreter and exits non-zero when a module exceeds its IMPORT_BUDGETS_MS
+entry (or --budget-ms). Run it in CI to keep startup fast.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+FETCH_STAGES = ["catalog", "fetch_oews", "fetch_projections", "fetch_onet", "fetch_openings",
+                "fetch_levels", "fetch_layoffs", "history"]
+
+# Cumulative import time per module, in milliseconds (pandas alone is ~300ms)
+IMPORT_BUDGETS_MS = {
+    "pathiq_data": 25,
+    "validate_data": 25,
+    "seed_supabase": 60,
+    "generate_ai_content": 60,
+    "collect_all": 120,
+}
+
+# Subcommands that forward unrecognized flags to the underlying script
+PASSTHROUGH = {"run", "fetch", "combine", "generate-ai", "generate-comparisons", "recommend", "refresh"}
+
+
+def cmd_run(args, rest):
+    import collect_all
+    collect_all.main(rest)
+
+
+def cmd_fetch(args, rest):
+    import collect_all
+    collect_all.main(["--stages", ",".join(FETCH_STAGES), *rest])
+
+
+def cmd_combine(args, rest):
+    import collect_all
+    collect_all.main(["--stages", "combine", *rest])
+
+
+def cmd_validate(args, rest):
+    import validate_data
+    if validate_data.main() is None:
+        sys.exit(1)
+
+
+def cmd_seed(args, rest):
+    import seed_supabase
+    if not seed_supabase.main():
+        sys.exit(1)
+
+
+def cmd_generate_ai(args, rest):
+    import generate_ai_content
+    generate_ai_content.main(rest)
+
+
+def cmd_generate_comparisons(args, rest):
+    import generate_comparisons
+    generate_comparisons.main(rest)
+
+
+def cmd_recommend(args, rest):
+    import profile_recommendations
+    profile_recommendations.main(rest)
+
+
+def cmd_refresh(args, rest):
+    import refresh
+    refresh.main(rest)
+
+
+def measure_import_ms(module):
+    """Cumulative import time of `module` in a fresh interpreter, and its slowest imports."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=os.path.dirname(os.path.abspath(__file__)),
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+    total, children, pending = 0, [], []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Children are listed (indented) before the module that imported them
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            pending.append((int(cumulative), name.strip()))
+        elif depth == 0:
+            if name.strip() == module:
+                total, children = int(cumulative), pending
+            pending = []
+    return total / 1000, sorted(children, reverse=True)
+
+
+def cmd_import_time(args, rest):
+    modules = args.modules or list(IMPORT_BUDGETS_MS)
+    over = []
+    print(f"  {'module':<22} {'import':>9} {'budget':>9}  slowest dependencies")
+    for module in modules:
+        budget = args.budget_ms or IMPORT_BUDGETS_MS.get(module)
+        ms, slowest = measure_import_ms(module)
+        top = ", ".join(f"{name} {us / 1000:.0f}ms" for us, name in slowest[:3])
+        flag = "" if budget is None or ms <= budget else "  [over]"
+        print(f"  {module:<22} {ms:>7.1f}ms {budget or '-':>7}ms  {top}{flag}")
+        if flag:
+            over.append(module)
+    if over:
+        print(f"\n  [error] Over import budget: {', '.join(over)}")
+        sys.exit(1)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="pathiq-data", description="PathIQ data pipeline")
+    sub = parser.add_subparsers(dest="command", required=True, metavar="command")
+    sub.add_parser("run", help="Run the full pipeline (collect_all.py flags pass through)")
+    sub.add_parser("fetch", help="Fetch every source, without combining or seeding")
+    sub.add_parser("combine", help="Combine fetched artifacts and write raw/careers_export.json")
+    sub.add_parser("validate", help="Validate raw/careers_export.json")
+    sub.add_parser("seed", help="Seed raw/careers_export.json to Supabase")
+    sub.add_parser("generate-ai", help="Generate AI descriptions (--force regenerates all)")
+    sub.add_parser("generate-comparisons", help="Pre-generate shared AI comparisons (generate_comparisons.py flags)")
+    sub.add_parser("recommend", help="Batch-score user profiles against careers (profile_recommendations.py flags)")
+    sub.add_parser("refresh", help="Refresh stale sources (refresh.py flags pass through)")
+    p = sub.add_parser("import-time", help="Check module import times against their budgets")
+    p.add_argument("modules", nargs="*", help=f"Modules to measure (default: {', '.join(IMPORT_BUDGETS_MS)})")
+    p.add_argument("--budget-ms", type=float, help="Budget for every listed module")
+    return parser
+
+
+COMMANDS = {
+    "run": cmd_run,
+    "fetch": cmd_fetch,
+    "combine": cmd_combine,
+    "validate": cmd_validate,
+    "seed": cmd_seed,
+    "generate-ai": cmd_generate_ai,
+    "generate-comparisons": cmd_generate_comparisons,
+    "recommend": cmd_recommend,
+    "refresh": cmd_refresh,
+    "import-time": cmd_import_time,
+}
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, rest = parser.parse_known_args(argv)
+    if rest and args.command not in PASSTHROUGH:
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+    COMMANDS[args.command](args, rest)
+
+
+if __name__ == "__main__":
+    main()
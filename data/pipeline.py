@@ -0,0 +1,241 @@
+"""
+Stage DAG runner with checkpointed artifacts.
+
+Each stage is a named function whose inputs are the outputs of the stages it
+depends on. Every stage output is pickled to data/raw/artifacts/<stage>.pkl and
+recorded in a manifest together with an input fingerprint, so a later run can:
+  - resume from any stage (upstream outputs are loaded from artifacts)
+  - skip derived stages whose inputs have not changed since the last run
+
+External stages (downloads, APIs, scrapers) always re-run when selected; their
+output digest then decides whether anything downstream needs recomputing.
+"""
+import hashlib
+import json
+import os
+import pickle
+import time
+from contextlib import nullcontext
+from datetime import datetime, timezone
+
+ARTIFACT_DIR = os.path.join(os.path.dirname(__file__), "raw", "artifacts")
+
+
+class StageError(Exception):
+    """Raised when a stage cannot run (missing inputs, failed execution)."""
+
+
+class Stage:
+    """A named pipeline step.
+
+    func        called as func(**{dep_name: dep_output}) and returns the output
+    deps        names of stages whose outputs this stage consumes
+    external    output depends on the outside world, never skipped as unchanged
+    fingerprint optional callable returning extra bytes/str that invalidate the
+                stage when they change (e.g. a config file or override table)
+    checkpoint  optional predicate on the output; falsy means "do not record as
+                done", so the stage runs again next time (e.g. a failed seed)
+    """
+
+    def __init__(self, name, func, deps=(), external=False, fingerprint=None, checkpoint=None):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.external = external
+        self.fingerprint = fingerprint
+        self.checkpoint = checkpoint
+
+    def __repr__(self):
+        return f"Stage({self.name!r}, deps={list(self.deps)})"
+
+
+def digest_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class ArtifactStore:
+    """Pickled stage outputs plus a JSON manifest of digests and fingerprints."""
+
+    def __init__(self, root=ARTIFACT_DIR):
+        self.root = root
+        self.manifest_path = os.path.join(root, "manifest.json")
+        self._manifest = None
+
+    @property
+    def manifest(self):
+        if self._manifest is None:
+            if os.path.exists(self.manifest_path):
+                with open(self.manifest_path) as f:
+                    self._manifest = json.load(f)
+            else:
+                self._manifest = {}
+        return self._manifest
+
+    def path(self, name):
+        return os.path.join(self.root, f"{name}.pkl")
+
+    def has(self, name):
+        return name in self.manifest and os.path.exists(self.path(name))
+
+    def load(self, name):
+        with open(self.path(name), "rb") as f:
+            return pickle.load(f)
+
+    def save(self, name, value, fingerprint, done=True):
+        """Persist a stage output. Returns the output digest."""
+        os.makedirs(self.root, exist_ok=True)
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp = self.path(name) + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self.path(name))
+
+        digest = digest_bytes(data)
+        self.manifest[name] = {
+            "digest": digest,
+            "fingerprint": fingerprint if done else None,
+            "saved_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self._write_manifest()
+        return digest
+
+    def digest(self, name):
+        return self.manifest.get(name, {}).get("digest")
+
+    def fingerprint(self, name):
+        return self.manifest.get(name, {}).get("fingerprint")
+
+    def _write_manifest(self):
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.manifest_path)
+
+
+def topo_order(stages):
+    """Return stage names in dependency order. Raises StageError on cycles."""
+    by_name = {s.name: s for s in stages}
+    order = []
+    state = {}  # name -> "visiting" | "done"
+
+    def visit(name):
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise StageError(f"Dependency cycle at stage '{name}'")
+        if name not in by_name:
+            raise StageError(f"Unknown stage '{name}'")
+        state[name] = "visiting"
+        for dep in by_name[name].deps:
+            visit(dep)
+        state[name] = "done"
+        order.append(name)
+
+    for s in stages:
+        visit(s.name)
+    return order
+
+
+def downstream_of(stages, name):
+    """Names of `name` and every stage that (transitively) depends on it."""
+    result = {name}
+    for stage_name in topo_order(stages):
+        stage = next(s for s in stages if s.name == stage_name)
+        if any(d in result for d in stage.deps):
+            result.add(stage_name)
+    return result
+
+
+def select_stages(stages, only=None, start=None):
+    """Resolve --stages / --from into the set of stage names to execute."""
+    names = {s.name for s in stages}
+    for n in list(only or []) + ([start] if start else []):
+        if n not in names:
+            raise StageError(f"Unknown stage '{n}' (known: {', '.join(topo_order(stages))})")
+
+    selected = set(names)
+    if start:
+        selected &= downstream_of(stages, start)
+    if only:
+        selected &= set(only)
+    return selected
+
+
+def compute_fingerprint(stage, store):
+    h = hashlib.sha256(stage.name.encode())
+    for dep in stage.deps:
+        h.update(f"|{dep}={store.digest(dep)}".encode())
+    if stage.fingerprint:
+        extra = stage.fingerprint()
+        h.update(extra if isinstance(extra, bytes) else str(extra).encode())
+    return h.hexdigest()
+
+
+def run_pipeline(stages, selected=None, store=None, force=False, metrics=None, profiler=None):
+    """Run the selected stages in dependency order.
+
+    Stages outside `selected` are loaded from their artifacts. Returns a dict of
+    {stage_name: output} and a dict of {stage_name: status} where status is one
+    of "ran", "skipped", "loaded", or "failed". When a metrics.RunMetrics is
+    given, every executed stage is measured and the others are recorded.
+    `profiler`, if given, is called with the stage name and must return a
+    context manager wrapped around that stage's execution.
+    """
+    store = store or ArtifactStore()
+    by_name = {s.name: s for s in stages}
+    order = topo_order(stages)
+    if selected is None:
+        selected = set(order)
+
+    # Only touch stages that are selected or feed a selected stage
+    needed = set(selected)
+    for name in reversed(order):
+        if name in needed:
+            needed.update(by_name[name].deps)
+
+    outputs = {}
+    status = {}
+    for name in order:
+        if name not in needed:
+            continue
+        stage = by_name[name]
+
+        if name not in selected:
+            if not store.has(name):
+                raise StageError(
+                    f"Stage '{name}' has no saved artifact; run it first "
+                    f"(e.g. python collect_all.py --from {name})")
+            outputs[name] = store.load(name)
+            status[name] = "loaded"
+            if metrics:
+                metrics.record(name, "loaded")
+            continue
+
+        fingerprint = compute_fingerprint(stage, store)
+        if (not force and not stage.external and store.has(name)
+                and store.fingerprint(name) == fingerprint):
+            outputs[name] = store.load(name)
+            status[name] = "skipped"
+            print(f"  [skip] {name}: inputs unchanged")
+            if metrics:
+                metrics.record(name, "skipped")
+            continue
+
+        started = time.monotonic()
+        try:
+            with metrics.measure(name) if metrics else nullcontext():
+                with profiler(name) if profiler else nullcontext():
+                    output = stage.func(**{dep: outputs[dep] for dep in stage.deps})
+        except Exception as e:
+            status[name] = "failed"
+            print(f"  [error] Stage '{name}' failed: {e}")
+            print(f"  [info] Resume with: python collect_all.py --from {name}")
+            break
+
+        done = stage.checkpoint(output) if stage.checkpoint else True
+        store.save(name, output, fingerprint, done=done)
+        outputs[name] = output
+        status[name] = "ran"
+        print(f"  [stage] {name} finished in {time.monotonic() - started:.1f}s")
+
+    return outputs, status
@@ -0,0 +1,357 @@
+"""
+Batch-score every user profile against every career and store each user's top N.
+
+The dashboard ranks careers for a profile in the browser (src/lib/recommendations.ts),
+one profile at a time. This job loads all careers and all changed profiles
+into matrices and scores every (profile, career) pair with NumPy matrix
+products, 0-100:
+
+  INTEREST_WEIGHT  share of the best possible RIASEC overlap: profile interests
+                   (onboarding values like "technology" resolve through
+                   vocabulary.json) against the career's ranked interest codes
+  MAJOR_WEIGHT     the career's posting weight for the profile's major
+                   (term_index weights; "Any" major careers get ANY_MAJOR_WEIGHT)
+  VALUES_WEIGHT    the profile's values (compensation, impact, flexibility,
+                   stability), normalized to sum to 1, times career attributes
+                   in [0, 1]: salary and growth percentiles, layoff risk,
+                   remote options and the career's Social interest weight
+
+Each user's TOP_N careers go to user_recommendations, best first, with the
+profile's updated_at. The in-browser ranking stays the fallback and is a
+different, simpler model, so its top careers can differ from these; the
+dashboard applies its class-year minimum score to both. Runs are incremental: the newest profile_updated_at in
+that table is the watermark, and only profiles updated after it are fetched
+and rescored (migration 010 sets updated_at server-side; the last
+WATERMARK_OVERLAP_S seconds are fetched again for transactions that
+committed late). A change to the career data, vocabulary.json or the weights
+below changes careers_version and rescores every profile. Profiles are
+processed oldest first, so an interrupted run resumes where it stopped.
+
+Usage:
+  python profile_recommendations.py [--full] [--top N] [--dry-run]
+
+Requires:
+  - SUPABASE_URL and SUPABASE_KEY (service role: user_profiles is row-level secured) in data/.env
+  - supabase/migration_010_user_recommendations.sql applied
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from dotenv import load_dotenv
+
+load_dotenv(os.path.join(os.path.dirname(__file__), ".env"))
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+
+TABLE = "user_recommendations"
+PAGE_SIZE = 1000
+UPSERT_BATCH = 1000
+# Profiles scored per matrix block: memory O(block x careers)
+BLOCK = 8192
+TOP_N = 10
+# Profiles updated this long before the watermark are fetched again
+WATERMARK_OVERLAP_S = 60
+
+INTEREST_WEIGHT = 40
+MAJOR_WEIGHT = 25
+VALUES_WEIGHT = 35
+ANY_MAJOR_WEIGHT = 0.5
+
+VALUES = ["compensation", "impact", "flexibility", "stability"]
+ATTRIBUTES = ["salary", "growth", "safety", "remote", "social"]
+# Career attributes each value rewards (weights sum to 1 per value)
+VALUE_ATTRIBUTES = {
+    "compensation": {"salary": 1.0},
+    "impact": {"social": 1.0},
+    "flexibility": {"remote": 1.0},
+    "stability": {"safety": 0.6, "growth": 0.4},
+}
+LAYOFF_SAFETY = {"low": 1.0, "medium": 0.5, "high": 0.0}
+REMOTE_FLEXIBILITY = {"fully-remote": 1.0, "hybrid": 0.6, "varies": 0.4, "on-site": 0.0}
+
+CAREER_COLUMNS = ["id", "salary_median", "growth_rate_numeric", "layoff_risk", "remote_options",
+                  "interests", "preferred_majors"]
+PROFILE_COLUMNS = ["id", "major", "interests", "values", "updated_at"]
+
+
+def percentiles(values):
+    """Rank of each value in [0, 1] (ties share a rank); missing values score 0.5."""
+    import numpy as np
+    values = np.array([np.nan if v is None else v for v in values], dtype=float)
+    known = ~np.isnan(values)
+    result = np.full(len(values), 0.5)
+    if known.sum() > 1:
+        ranks = np.searchsorted(np.sort(values[known]), values[known])
+        result[known] = ranks / (known.sum() - 1)
+    return result
+
+
+def term_matrix(lists, aliases, field, terms):
+    """[len(lists), len(terms)] weights, (n - rank) / n per resolved value, like term_index."""
+    import numpy as np
+    from term_index import normalize_term
+    table = aliases.get(field, {})
+    matrix = np.zeros((len(lists), len(terms)), dtype=np.float32)
+    for i, values in enumerate(lists):
+        n = len(values or [])
+        for rank, value in enumerate(values or []):
+            for term in table.get(normalize_term(value), []):
+                if term in terms:
+                    matrix[i, terms[term]] = max(matrix[i, terms[term]], (n - rank) / n)
+    return matrix
+
+
+class CareerFeatures:
+    """Career-side matrices, built once per run."""
+
+    def __init__(self, careers, vocabulary=None):
+        import numpy as np
+        from term_index import alias_table, load_vocabulary, normalize_term
+        vocabulary = vocabulary or load_vocabulary()
+        careers = sorted(careers, key=lambda c: c["id"])
+        self.ids = [c["id"] for c in careers]
+        self.aliases = alias_table(vocabulary)
+        # Career values outside the vocabulary become their own terms, as in term_index
+        for field, column in (("interests", "interests"), ("majors", "preferred_majors")):
+            table = self.aliases.setdefault(field, {})
+            for career in careers:
+                for value in career.get(column) or []:
+                    table.setdefault(normalize_term(value), [value])
+        self.interest_terms = self._terms("interests")
+        self.major_terms = self._terms("majors")
+
+        self.interests = term_matrix([c.get("interests") for c in careers], self.aliases,
+                                     "interests", self.interest_terms)
+        self.majors = term_matrix([c.get("preferred_majors") for c in careers], self.aliases,
+                                  "majors", self.major_terms)
+        # "Any" counts in full wherever a career lists it; profiles carry ANY_MAJOR_WEIGHT
+        self.any_major = self.major_terms.get("Any")
+        if self.any_major is not None:
+            self.majors[:, self.any_major] = self.majors[:, self.any_major] > 0
+
+        social = self.interest_terms.get("Social")
+        attributes = {
+            "salary": percentiles([c.get("salary_median") for c in careers]),
+            "growth": percentiles([c.get("growth_rate_numeric") for c in careers]),
+            "safety": [LAYOFF_SAFETY.get(c.get("layoff_risk"), 0.5) for c in careers],
+            "remote": [REMOTE_FLEXIBILITY.get(c.get("remote_options"), 0.0) for c in careers],
+            "social": self.interests[:, social] if social is not None else np.zeros(len(careers)),
+        }
+        x = np.array([attributes[a] for a in ATTRIBUTES], dtype=np.float32)
+        a = np.array([[VALUE_ATTRIBUTES[v].get(attr, 0.0) for attr in ATTRIBUTES] for v in VALUES],
+                     dtype=np.float32)
+        # [values, careers]: how well each career serves each value
+        self.value_fit = a @ x
+
+        # Best overlap a career allows with k profile interests: the sum of its top-k weights.
+        # linear[k] turns [interests, value weights] into interest + values points in one product.
+        ranked = -np.sort(-self.interests, axis=1)
+        best = np.cumsum(np.concatenate([np.zeros((len(careers), 1), dtype=np.float32), ranked], axis=1),
+                         axis=1)
+        scale = np.divide(INTEREST_WEIGHT, best, out=np.zeros_like(best), where=best > 0)
+        self.linear = [np.vstack([(self.interests * scale[:, k:k + 1]).T, VALUES_WEIGHT * self.value_fit])
+                       for k in range(best.shape[1])]
+        self.version = careers_version(careers, vocabulary)
+
+    def _terms(self, field):
+        terms = sorted({t for resolved in self.aliases.get(field, {}).values() for t in resolved})
+        return {term: i for i, term in enumerate(terms)}
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def careers_version(careers, vocabulary):
+    """Digest of every scoring input that is not a profile."""
+    payload = {
+        "careers": [{c: career.get(c) for c in CAREER_COLUMNS} for career in careers],
+        "vocabulary": vocabulary,
+        "weights": [INTEREST_WEIGHT, MAJOR_WEIGHT, VALUES_WEIGHT, ANY_MAJOR_WEIGHT,
+                    VALUE_ATTRIBUTES, LAYOFF_SAFETY, REMOTE_FLEXIBILITY],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def profile_matrices(profiles, features):
+    """([interests, value weights] [n, T + 4], majors [n, M]) for profile rows."""
+    import numpy as np
+    from term_index import normalize_term
+    n = len(profiles)
+    n_terms = len(features.interest_terms)
+    linear = np.zeros((n, n_terms + len(VALUES)), dtype=np.float32)
+    majors = np.zeros((n, len(features.major_terms)), dtype=np.float32)
+
+    weights = linear[:, n_terms:]
+    weights[:] = [[((p.get("values") or {}).get(v) or 0) for v in VALUES] for p in profiles]
+    np.clip(weights, 0, None, out=weights)
+    totals = weights.sum(axis=1, keepdims=True)
+    np.divide(weights, totals, out=weights, where=totals > 0)
+    weights[totals[:, 0] == 0] = 1 / len(VALUES)
+
+    # Column indices per raw value; profiles repeat the same few values
+    interest_columns = {}
+    major_columns = {}
+
+    def columns(cache, field, terms, value):
+        if value not in cache:
+            cache[value] = [terms[t] for t in features.aliases.get(field, {}).get(normalize_term(value), [])]
+        return cache[value]
+
+    for i, profile in enumerate(profiles):
+        for value in profile.get("interests") or []:
+            linear[i, columns(interest_columns, "interests", features.interest_terms, value)] = 1
+        major = profile.get("major")
+        if major and normalize_term(major):
+            majors[i, columns(major_columns, "majors", features.major_terms, major)] = 1
+            if features.any_major is not None:
+                majors[i, features.any_major] = ANY_MAJOR_WEIGHT
+    return linear, majors
+
+
+def score_block(features, linear, majors):
+    """[n, careers] fit scores, 0-100."""
+    import numpy as np
+    n_terms = len(features.interest_terms)
+    k = linear[:, :n_terms].sum(axis=1).astype(int)
+    scores = np.empty((len(linear), len(features)), dtype=np.float32)
+    # One product per interest count k (at most T + 1 groups)
+    for count in np.unique(k):
+        rows = np.flatnonzero(k == count)
+        scores[rows] = linear[rows] @ features.linear[count]
+    major = majors @ features.majors.T
+    np.minimum(major, 1, out=major)
+    major *= MAJOR_WEIGHT
+    scores += major
+    return scores
+
+
+def top_n(scores, n=TOP_N):
+    """(indices, scores), each [rows, n], best first."""
+    import numpy as np
+    n = min(n, scores.shape[1])
+    top = np.argpartition(-scores, n - 1, axis=1)[:, :n]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+def score_profiles(profiles, features, n=TOP_N, block=BLOCK):
+    """(indices, scores), each [len(profiles), n]: every profile's best careers."""
+    import numpy as np
+    n = min(n, len(features))
+    indices = np.empty((len(profiles), n), dtype=np.int32)
+    scores = np.empty((len(profiles), n), dtype=np.float32)
+    for start in range(0, len(profiles), block):
+        stop = min(start + block, len(profiles))
+        matrices = profile_matrices(profiles[start:stop], features)
+        indices[start:stop], scores[start:stop] = top_n(score_block(features, *matrices), n)
+    return indices, scores
+
+
+def recommendation_rows(profiles, features, n=TOP_N):
+    """One user_recommendations row per profile."""
+    indices, scores = score_profiles(profiles, features, n)
+    import numpy as np
+    computed_at = datetime.now(timezone.utc).isoformat()
+    career_ids = np.array(features.ids, dtype=object)[indices].tolist()
+    scores = np.round(scores.astype(np.float64), 1).tolist()
+    return [{
+        "user_id": profile["id"],
+        "career_ids": career_ids[i],
+        "scores": scores[i],
+        "profile_updated_at": profile.get("updated_at"),
+        "careers_version": features.version,
+        "computed_at": computed_at,
+    } for i, profile in enumerate(profiles)]
+
+
+def load_watermark(supabase):
+    """(profile_updated_at, careers_version) of the newest scored profile, or (None, None)."""
+    rows = (supabase.table(TABLE).select("profile_updated_at,careers_version")
+            .order("profile_updated_at", desc=True).limit(1).execute().data or [])
+    if not rows:
+        return None, None
+    return rows[0]["profile_updated_at"], rows[0]["careers_version"]
+
+
+def fetch_profiles(supabase, since=None):
+    """Profiles updated after `since` less the overlap (all when None), oldest first."""
+    if since:
+        since = (datetime.fromisoformat(since) - timedelta(seconds=WATERMARK_OVERLAP_S)).isoformat()
+    profiles = []
+    while True:
+        query = supabase.table("user_profiles").select(",".join(PROFILE_COLUMNS))
+        if since:
+            query = query.gt("updated_at", since)
+        page = (query.order("updated_at").order("id")
+                .range(len(profiles), len(profiles) + PAGE_SIZE - 1).execute().data or [])
+        profiles += page
+        if len(page) < PAGE_SIZE:
+            return profiles
+
+
+def write_rows(supabase, rows):
+    for i in range(0, len(rows), UPSERT_BATCH):
+        supabase.table(TABLE).upsert(rows[i:i + UPSERT_BATCH], on_conflict="user_id").execute()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Batch-score user profiles against careers")
+    parser.add_argument("--full", action="store_true", help="Rescore every profile, not just changed ones")
+    parser.add_argument("--top", type=int, default=TOP_N, help=f"Careers kept per user (default {TOP_N})")
+    parser.add_argument("--dry-run", action="store_true", help="Score and print a sample without writing")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        print("[error] SUPABASE_URL and SUPABASE_KEY required in data/.env")
+        sys.exit(1)
+
+    try:
+        from supabase import create_client
+    except ImportError:
+        print("[error] supabase package not installed: pip install supabase")
+        sys.exit(1)
+
+    supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+    careers = supabase.table("careers").select(",".join(CAREER_COLUMNS)).execute().data
+    if not careers:
+        print("[error] No careers found in Supabase")
+        sys.exit(1)
+    features = CareerFeatures(careers)
+
+    watermark, version = load_watermark(supabase)
+    if args.full or version != features.version:
+        if version and not args.full:
+            print(f"[info] Careers version changed ({version} -> {features.version}), rescoring every profile")
+        watermark = None
+    profiles = fetch_profiles(supabase, watermark)
+    print(f"Found {len(careers)} careers, {len(profiles)} profiles "
+          f"{'updated since ' + watermark if watermark else 'to score'}")
+    if not profiles:
+        return
+
+    started = time.perf_counter()
+    rows = recommendation_rows(profiles, features, args.top)
+    print(f"Scored {len(profiles) * len(features):,} pairs in {time.perf_counter() - started:.2f}s")
+
+    if args.dry_run:
+        for row in rows[:10]:
+            pairs = ", ".join(f"{cid} {s:.0f}" for cid, s in zip(row["career_ids"][:3], row["scores"]))
+            print(f"  {row['user_id']}  {pairs}")
+        return
+
+    write_rows(supabase, rows)
+    print(f"  [saved] {len(rows)} rows to {TABLE}")
+
+
+if __name__ == "__main__":
+    main()
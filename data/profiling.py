@@ -0,0 +1,125 @@
+"""
+Opt-in profiler capture for pipeline stages.
+
+Enable with --profile or the PATHIQ_PROFILE env var, listing stage names
+(or "all"):
+
+    PATHIQ_PROFILE=fetch_onet,seed_market_trends python collect_all.py
+    python collect_all.py --profile fetch_onet
+
+Each profiled stage writes, next to that run's metrics.json:
+  profiles/<stage>.pstats     cProfile dump of the stage's own thread
+                              (python -m pstats, snakeviz, ...)
+  profiles/<stage>.collapsed  sampled stacks of every thread in collapsed
+                              format, each rooted at its thread name, ready
+                              for flamegraph.pl or speedscope
+
+The sampler covers every thread because the Playwright scrapers do their work
+on the browser-pool thread (browser_pool.run) while the stage's thread only
+waits on a future.
+
+When no stage is selected, the pipeline gets no profiler at all, so the normal
+path pays nothing.
+"""
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+PROFILE_ENV = "PATHIQ_PROFILE"
+INTERVAL_ENV = "PATHIQ_PROFILE_INTERVAL_MS"
+DEFAULT_INTERVAL_MS = 5
+
+
+def parse_profile_spec(spec):
+    """'a,b' -> {'a', 'b'}; 'all' -> {'all'}; empty -> empty set."""
+    return {s.strip() for s in (spec or "").split(",") if s.strip()}
+
+
+def frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Samples every thread's Python stack on a timer and counts collapsed stacks."""
+
+    def __init__(self, interval_s):
+        self.interval_s = interval_s
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="pathiq-sampler", daemon=True)
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval_s):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(frame_label(frame))
+                    frame = frame.f_back
+                labels.append(f"thread {names.get(ident, ident)}")
+                self.stacks[";".join(reversed(labels))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write_collapsed(self, path):
+        with open(path, "w") as f:
+            for stack, n in self.stacks.most_common():
+                f.write(f"{stack} {n}\n")
+
+
+class StageProfiler:
+    """Callable passed to run_pipeline: profiler(stage_name) -> context manager."""
+
+    def __init__(self, stages, out_dir, interval_ms=None):
+        self.stages = set(stages)
+        self.out_dir = out_dir
+        interval_ms = interval_ms or float(os.getenv(INTERVAL_ENV, DEFAULT_INTERVAL_MS))
+        self.interval_s = interval_ms / 1000
+        self.written = []
+
+    def __call__(self, name):
+        if "all" in self.stages or name in self.stages:
+            return self._profile(name)
+        return nullcontext()
+
+    @contextmanager
+    def _profile(self, name):
+        os.makedirs(self.out_dir, exist_ok=True)
+        sampler = StackSampler(self.interval_s)
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        sampler.start()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            sampler.stop()
+            pstats_path = os.path.join(self.out_dir, f"{name}.pstats")
+            collapsed_path = os.path.join(self.out_dir, f"{name}.collapsed")
+            profiler.dump_stats(pstats_path)
+            sampler.write_collapsed(collapsed_path)
+            self.written.extend([pstats_path, collapsed_path])
+            print(f"  [profile] {name}: {time.perf_counter() - started:.1f}s, "
+                  f"{sum(sampler.stacks.values())} samples -> {self.out_dir}")
+
+
+def make_profiler(spec, run_dir):
+    """Build a StageProfiler from a stage list, or None when profiling is off."""
+    stages = parse_profile_spec(spec)
+    if not stages:
+        return None
+    return StageProfiler(stages, os.path.join(run_dir, "profiles"))
@@ -0,0 +1,84 @@
+"""
+Refresh stale sources on a schedule.
+
+One pass (cron-friendly, e.g. hourly): refetch only the sources whose TTL has
+expired, recombine, and reseed only the careers whose rows changed. When every
+source is fresh the pass exits after reading the freshness manifest.
+
+  python refresh.py                  # one pass, then exit
+  python refresh.py --daemon         # keep running, waking when a source goes stale
+  python refresh.py --status         # show per-source TTL, age and state
+
+  # crontab: 0 * * * * cd /path/to/data && python refresh.py >> raw/refresh.log 2>&1
+
+Any other flags (--ttls, --budgets, --prom-file, ...) are passed through to
+collect_all.py --stale-only.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+import collect_all
+import freshness
+
+MIN_SLEEP_S = 60
+
+
+def refresh_once(passthrough):
+    """Run one --stale-only pass. Returns True if the pipeline succeeded."""
+    try:
+        collect_all.main(["--stale-only", *passthrough])
+        return True
+    except SystemExit as e:
+        return not e.code
+
+
+def run_daemon(passthrough, ttls, max_sleep, retry_after):
+    print(f"[refresh] daemon started (max sleep {freshness.format_age(max_sleep)}, "
+          f"retry after {freshness.format_age(retry_after)})")
+    while True:
+        ok = refresh_once(passthrough)
+        m = freshness.manifest()
+        if not ok:
+            wait = retry_after
+        else:
+            wait = min(max_sleep, max(MIN_SLEEP_S, m.next_due(ttls)))
+        wake = datetime.fromtimestamp(time.time() + wait).strftime("%Y-%m-%d %H:%M:%S")
+        print(f"\n[refresh] sleeping {freshness.format_age(wait)} (next pass {wake})")
+        time.sleep(wait)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refresh stale PathIQ data sources")
+    parser.add_argument("--daemon", action="store_true", help="Keep running and refresh as sources go stale")
+    parser.add_argument("--status", action="store_true", help="Print source freshness and exit")
+    parser.add_argument("--max-sleep", type=freshness.parse_duration, default=freshness.HOUR,
+                        help="Longest daemon sleep between passes (default 1h)")
+    parser.add_argument("--retry-after", type=freshness.parse_duration, default=15 * 60,
+                        help="Sleep after a failed pass (default 15m)")
+    parser.add_argument("--ttls", default=os.getenv(freshness.TTLS_ENV),
+                        help="Per-source TTLs, e.g. 'openings=6h,layoffs=3d' (env: PATHIQ_TTLS)")
+    args, passthrough = parser.parse_known_args(argv)
+
+    ttls = freshness.resolve_ttls(args.ttls)
+    if args.ttls:
+        passthrough += ["--ttls", args.ttls]
+
+    if args.status:
+        freshness.print_status(ttls)
+        return
+    if args.daemon:
+        try:
+            run_daemon(passthrough, ttls, args.max_sleep, args.retry_after)
+        except KeyboardInterrupt:
+            print("\n[refresh] stopped")
+        return
+    sys.exit(0 if refresh_once(passthrough) else 1)
+
+
+if __name__ == "__main__":
+    main()
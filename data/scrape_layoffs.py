@@ -1,123 +1,232 @@
 """
 Scrape layoffs.fyi for industry layoff risk data.
 Falls back to static risk assessment if scraping fails.
+
+layoffs.fyi renders an embedded Airtable view. Instead of reading table rows
+out of the DOM, the scraper listens to the page's network responses and
+captures the view's data payload (Airtable readSharedViewData JSON, or a CSV
+export), so every row is parsed, not just what is on screen. If
+LAYOFFS_CSV_URL is set the CSV is downloaded directly, without a browser.
+Rows are loaded into a DataFrame, new ones are appended to the layoff event
+store (layoff_store.py), and risk comes from its rolling 3/6/12-month windows.
+
+Point LAYOFFS_URL at stub_server.py to scrape the local fixture:
+  LAYOFFS_URL=http://127.0.0.1:8765/pages/layoffs/ python scrape_layoffs.py
 """
+import io
 import json
 import os
+import re
+import deadlines
+import fallbacks
+import layoff_store
+import metrics
+
+LAYOFFS_URL = os.getenv("LAYOFFS_URL", "https://layoffs.fyi/")
+LAYOFFS_CSV_URL = os.getenv("LAYOFFS_CSV_URL")
+
+# Response URLs that carry the table data
+DATA_RESPONSE_PATTERN = re.compile(r"readSharedViewData|downloadCsv|\.csv(\?|$)")
+# After the first data response, keep collecting until the network is idle this long at most
+IDLE_TIMEOUT_MS = 15000
+
+# layoffs.fyi industry -> career_mapping category
+INDUSTRY_CATEGORY = {
+    "ai": "tech", "crypto": "tech", "data": "tech", "hardware": "tech",
+    "infrastructure": "tech", "product": "tech", "security": "tech", "support": "tech",
+    "finance": "business", "sales": "business", "marketing": "business", "hr": "business",
+    "recruiting": "business", "retail": "business", "consumer": "business",
+    "logistics": "business", "transportation": "business", "real estate": "business",
+    "travel": "business", "food": "business",
+    "healthcare": "healthcare", "fitness": "healthcare",
+    "manufacturing": "engineering", "construction": "engineering",
+    "energy": "engineering", "aerospace": "engineering",
+    "education": "education",
+    "media": "creative",
+    "legal": "law",
+}
 
 def load_career_mapping():
     mapping_path = os.path.join(os.path.dirname(__file__), "career_mapping.json")
     with open(mapping_path) as f:
         return json.load(f)
 
+def airtable_to_frame(payload):
+    """DataFrame from an Airtable readSharedViewData payload (choice ids -> names)."""
+    import pandas as pd
+    table = payload.get("data", payload).get("table", {})
+    columns = table.get("columns", [])
+    names = {c["id"]: c["name"] for c in columns}
+    df = pd.DataFrame.from_records(
+        [row.get("cellValuesByColumnId", {}) for row in table.get("rows", [])]
+    ).rename(columns=names)
+
+    for col in columns:
+        choices = (col.get("typeOptions") or {}).get("choices")
+        if not choices or col["name"] not in df:
+            continue
+        lookup = {cid: c.get("name") for cid, c in choices.items()}
+        values = df[col["name"]]
+        # multipleSelects come as lists of choice ids; keep the first
+        values = values.map(lambda v: v[0] if isinstance(v, list) and v else v)
+        df[col["name"]] = values.map(lookup).fillna(values)
+    return df
+
+def csv_to_frame(body):
+    import pandas as pd
+    return pd.read_csv(io.BytesIO(body))
+
+def find_column(df, *keywords, exclude=()):
+    for col in df.columns:
+        key = re.sub(r"[^a-z%]", "", str(col).lower())
+        if all(k in key for k in keywords) and not any(x in key for x in exclude):
+            return col
+    return None
+
+def normalize_layoffs(df):
+    """Columns company, date, laid_off, industry, category; rows without a count dropped."""
+    import pandas as pd
+    cols = {
+        "company": find_column(df, "company"),
+        "date": find_column(df, "date", exclude=("added",)),
+        "laid_off": find_column(df, "laid", exclude=("%", "percent")),
+        "industry": find_column(df, "industry"),
+    }
+    missing = [k for k, c in cols.items() if c is None]
+    if missing:
+        raise ValueError(f"layoffs data has no {', '.join(missing)} column (got {list(df.columns)})")
+
+    out = pd.DataFrame({
+        "company": df[cols["company"]].astype(str).str.strip(),
+        "date": pd.to_datetime(df[cols["date"]], errors="coerce", utc=True, format="mixed").dt.tz_localize(None),
+        "laid_off": pd.to_numeric(df[cols["laid_off"]].astype(str).str.replace(",", ""), errors="coerce"),
+        "industry": df[cols["industry"]].fillna("Other").astype(str).str.strip(),
+    })
+    out = out.dropna(subset=["date", "laid_off"])
+    out["laid_off"] = out["laid_off"].astype("int64")
+    out["category"] = out["industry"].str.lower().map(INDUSTRY_CATEGORY).fillna("other")
+    return out.reset_index(drop=True)
+
+def risk_from_windows(career_mapping, windows):
+    """Career risk from its category's rolling windows (categories with no layoffs are low)."""
+    by_category = layoff_store.category_risk(windows)
+    return {career_id: by_category.get(info["category"], "low")
+            for career_id, info in career_mapping.items()}
+
+def download_layoffs_csv(url):
+    import requests
+    print(f"  [download] {url}")
+    resp = requests.get(url, timeout=deadlines.timeout(60))
+    resp.raise_for_status()
+    metrics.count("bytes_downloaded", len(resp.content))
+    return csv_to_frame(resp.content)
+
+def parse_data_response(url, content_type, body):
+    if "csv" in content_type or "csv" in url.lower():
+        return csv_to_frame(body)
+    payload = json.loads(body)
+    return airtable_to_frame(payload)
+
+async def capture_layoffs_frame(url=LAYOFFS_URL):
+    """Load the page and return the table data captured from its network responses.
+
+    Waits for the first data response, then keeps collecting (later pages,
+    lazy-loaded chunks) until the network goes idle.
+    """
+    import asyncio
+    import pandas as pd
+    import browser_pool
+    captured = []
+    reads = []
+    got_data = asyncio.Event()
+
+    async def read(response):
+        try:
+            captured.append((response.url, response.headers.get("content-type", ""),
+                             await response.body()))
+            got_data.set()
+        except Exception as e:
+            print(f"  [warn] Could not read {response.url}: {e}")
+
+    def on_response(response):
+        if response.ok and DATA_RESPONSE_PATTERN.search(response.url):
+            reads.append(asyncio.ensure_future(read(response)))
+
+    async with browser_pool.context() as context:
+        page = await context.new_page()
+        page.on("response", on_response)
+        await page.goto(url, wait_until="domcontentloaded", timeout=deadlines.timeout_ms(30000))
+        await asyncio.wait_for(got_data.wait(), timeout=deadlines.timeout(20))
+        try:
+            await page.wait_for_load_state("networkidle", timeout=deadlines.timeout_ms(IDLE_TIMEOUT_MS))
+        except Exception:
+            print(f"  [warn] Page still loading after {IDLE_TIMEOUT_MS / 1000:g}s; "
+                  f"layoffs data may be truncated ({len(reads)} data responses so far)")
+        await asyncio.gather(*reads)
+
+    frames = []
+    for data_url, content_type, body in captured:
+        metrics.count("bytes_downloaded", len(body))
+        frames.append(parse_data_response(data_url, content_type, body))
+    if len(frames) > 1:
+        print(f"  [capture] {len(frames)} data responses, {sum(len(f) for f in frames):,} rows")
+    return pd.concat(frames, ignore_index=True)
+
+def fetch_layoff_events():
+    """Every layoffs.fyi row as a normalized DataFrame (CSV export or captured responses)."""
+    import browser_pool
+    if LAYOFFS_CSV_URL:
+        raw = download_layoffs_csv(LAYOFFS_CSV_URL)
+    else:
+        print(f"  [capture] {LAYOFFS_URL}")
+        raw = browser_pool.run(capture_layoffs_frame())
+    events = normalize_layoffs(raw)
+    metrics.count("rows_parsed", len(events))
+    print(f"  [parse] {len(events):,} layoff events, "
+          f"{events['date'].min():%Y-%m-%d} to {events['date'].max():%Y-%m-%d}")
+    return events
+
 def scrape_layoffs(career_mapping):
     """
     Attempt to scrape layoffs.fyi for layoff data.
-    Requires Playwright with Chromium installed.
+    Requires Playwright with Chromium installed (unless LAYOFFS_CSV_URL is set).
     """
     print("\n--- Scraping layoffs.fyi ---")
     result = {}
 
     try:
-        from playwright.sync_api import sync_playwright
-
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-
-            try:
-                page.goto("https://layoffs.fyi/", wait_until="networkidle", timeout=30000)
-                page.wait_for_timeout(5000)
-
-                # Try to extract layoff data from the Airtable embed
-                rows = page.query_selector_all("tr, [class*='row']")
-                industry_counts = {}
-
-                for row in rows[:200]:
-                    text = row.inner_text()
-                    parts = text.split("\t") if "\t" in text else text.split("  ")
-                    if len(parts) >= 3:
-                        try:
-                            count = int(parts[1].replace(",", "").strip())
-                            # Categorize by industry keywords
-                            text_lower = text.lower()
-                            if any(w in text_lower for w in ["tech", "software", "ai", "crypto"]):
-                                industry_counts["tech"] = industry_counts.get("tech", 0) + count
-                            elif any(w in text_lower for w in ["finance", "bank", "fintech"]):
-                                industry_counts["finance"] = industry_counts.get("finance", 0) + count
-                            elif any(w in text_lower for w in ["health", "pharma", "biotech"]):
-                                industry_counts["healthcare"] = industry_counts.get("healthcare", 0) + count
-                        except (ValueError, IndexError):
-                            continue
-
-                # Map to career risk levels
-                for career_id, info in career_mapping.items():
-                    category = info["category"]
-                    count = industry_counts.get(category, 0)
-                    if count > 10000:
-                        result[career_id] = "high"
-                    elif count > 1000:
-                        result[career_id] = "medium"
-                    else:
-                        result[career_id] = "low"
-
-            except Exception as e:
-                print(f"  [warn] Scraping failed: {e}")
-
-            browser.close()
-
+        events = fetch_layoff_events()
+        store = layoff_store.LayoffStore()
+        added = store.ingest(events)
+        print(f"  [store] {added:,} new events ({store.monthly['events']:,} stored)")
+        windows = store.windows()
+        result = risk_from_windows(career_mapping, windows)
+        layoff_store.print_windows(windows, layoff_store.category_risk(windows))
     except ImportError:
         print("  [skip] Playwright not installed")
+    except TimeoutError:
+        print("  [warn] No layoffs data response captured")
     except Exception as e:
         print(f"  [error] layoffs.fyi scraping failed: {e}")
 
     return result
 
-# Fallback: static risk assessment based on industry knowledge
-FALLBACK_LAYOFF_RISK = {
-    "software-engineer": "medium",
-    "data-scientist": "medium",
-    "product-manager": "medium",
-    "ux-designer": "medium",
-    "cybersecurity-analyst": "low",
-    "devops-engineer": "medium",
-    "ai-ml-engineer": "low",
-    "management-consultant": "low",
-    "investment-banking": "medium",
-    "financial-analyst": "low",
-    "marketing-manager": "medium",
-    "accountant": "low",
-    "supply-chain-analyst": "low",
-    "physician": "low",
-    "registered-nurse": "low",
-    "physician-assistant": "low",
-    "pharmacist": "low",
-    "public-health-analyst": "low",
-    "mechanical-engineer": "low",
-    "civil-engineer": "low",
-    "electrical-engineer": "low",
-    "biomedical-engineer": "low",
-    "research-scientist": "low",
-    "environmental-scientist": "low",
-    "economist": "low",
-    "lawyer": "low",
-    "policy-analyst": "low",
-    "urban-planner": "low",
-    "high-school-teacher": "low",
-    "college-professor": "medium",
-    "graphic-designer": "medium",
-    "technical-writer": "medium",
-    "content-strategist": "medium",
-    "nonprofit-manager": "low",
-    "startup-founder": "high",
-}
+# Fallback static risk assessment lives in fallbacks.zip
+__getattr__ = fallbacks.module_getattr(__name__, {"FALLBACK_LAYOFF_RISK": "layoffs"})
+
+def get_layoff_data(career_mapping, budget=None):
+    """Get layoff risk data with fallback. Returns (data, is_live).
 
-def get_layoff_data(career_mapping):
-    """Get layoff risk data with fallback. Returns (data, is_live)."""
-    data = scrape_layoffs(career_mapping)
+    `budget` caps the scrape in seconds.
+    """
+    data = deadlines.run("layoffs", scrape_layoffs, career_mapping, budget=budget)
+    if data is None:
+        return deadlines.fallback("layoffs", fallbacks.load("layoffs")), False
     if len(data) < 5:
         print("  [fallback] Using static layoff risk assessment")
-        return FALLBACK_LAYOFF_RISK, False
+        deadlines.mark_fallback("layoffs")
+        return fallbacks.load("layoffs"), False
+    deadlines.remember("layoffs", data)
     return data, True
 
 if __name__ == "__main__":
@@ -1,9 +1,30 @@
 """
 Scrape levels.fyi for tech total compensation data.
 Falls back to BLS data if scraping fails.
+
+Leaderboard pages are fetched concurrently (LEVELS_CONCURRENCY pages at a time)
+in one context borrowed from the shared browser pool (browser_pool.py).
+Images, fonts and media are aborted at the routing layer, and each page waits
+for the compensation element to render instead of sleeping a fixed time. Roles that proxy the same leaderboard share one visit.
+
+Point LEVELS_BASE_URL at stub_server.py to scrape local HTML fixtures:
+  python synthetic_data.py --pages
+  python stub_server.py &
+  LEVELS_BASE_URL=http://127.0.0.1:8765/pages python scrape_levels.py
 """
 import json
 import os
+import deadlines
+import fallbacks
+
+LEVELS_BASE_URL = os.getenv("LEVELS_BASE_URL", "https://www.levels.fyi").rstrip("/")
+LEVELS_CONCURRENCY = int(os.getenv("LEVELS_CONCURRENCY", "3"))
+
+# Request types that never carry compensation data
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+# levels.fyi typically shows compensation data in table/card format
+COMP_SELECTOR = "[class*='comp'], [class*='salary'], [class*='total']"
 
 def load_career_mapping():
     mapping_path = os.path.join(os.path.dirname(__file__), "career_mapping.json")
@@ -20,50 +41,73 @@ TECH_ROLES = {
     "ai-ml-engineer": "Data-Scientist",  # proxy
 }
 
+def leaderboard_url(levels_title):
+    return f"{LEVELS_BASE_URL}/leaderboard/{levels_title}/All-Levels/country/United-States/"
+
+def parse_comp(text):
+    """'$190K' -> 190000; None unless it looks like an annual total comp."""
+    if "$" not in text:
+        return None
+    cleaned = text.replace("$", "").replace(",", "").replace("K", "000").strip()
+    try:
+        val = int(float(cleaned))
+    except ValueError:
+        return None
+    return val if 50000 < val < 1000000 else None
+
+async def block_heavy_resources(route):
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def scrape_leaderboard(context, semaphore, levels_title):
+    """Median total comp from one leaderboard page, or None."""
+    url = leaderboard_url(levels_title)
+    async with semaphore:
+        print(f"  [scrape] {levels_title}: {url}")
+        page = await context.new_page()
+        try:
+            await page.goto(url, wait_until="domcontentloaded", timeout=deadlines.timeout_ms(30000))
+            await page.wait_for_selector(COMP_SELECTOR, timeout=deadlines.timeout_ms(15000))
+            for elem in (await page.query_selector_all(COMP_SELECTOR))[:5]:
+                val = parse_comp(await elem.inner_text())
+                if val:
+                    return val
+        except Exception as e:
+            print(f"    [warn] {levels_title} failed: {e}")
+        finally:
+            await page.close()
+    return None
+
+async def scrape_levels_async(career_mapping, concurrency=LEVELS_CONCURRENCY):
+    import asyncio
+    import browser_pool
+    titles = sorted(set(TECH_ROLES.values()))
+    async with browser_pool.context() as context:
+        await context.route("**/*", block_heavy_resources)
+        semaphore = asyncio.Semaphore(concurrency)
+        comps = await asyncio.gather(*(scrape_leaderboard(context, semaphore, t) for t in titles))
+
+    by_title = dict(zip(titles, comps))
+    result = {}
+    for career_id, levels_title in TECH_ROLES.items():
+        if by_title.get(levels_title):
+            result[career_id] = by_title[levels_title]
+            print(f"    {career_id} → ${result[career_id]:,}")
+    return result
+
 def scrape_levels(career_mapping):
     """
     Attempt to scrape levels.fyi for tech compensation.
     Requires Playwright with Chromium installed.
     """
+    import browser_pool
     print("\n--- Scraping levels.fyi ---")
     result = {}
 
     try:
-        from playwright.sync_api import sync_playwright
-
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-
-            for career_id, levels_title in TECH_ROLES.items():
-                url = f"https://www.levels.fyi/leaderboard/{levels_title}/All-Levels/country/United-States/"
-                print(f"  [scrape] {career_id}: {url}")
-
-                try:
-                    page.goto(url, wait_until="networkidle", timeout=30000)
-                    page.wait_for_timeout(3000)
-
-                    # Try to extract median compensation
-                    # levels.fyi typically shows compensation data in table/card format
-                    comp_elements = page.query_selector_all("[class*='comp'], [class*='salary'], [class*='total']")
-                    for elem in comp_elements[:5]:
-                        text = elem.inner_text()
-                        # Look for dollar amounts
-                        if "$" in text:
-                            cleaned = text.replace("$", "").replace(",", "").replace("K", "000").strip()
-                            try:
-                                val = int(float(cleaned))
-                                if 50000 < val < 1000000:
-                                    result[career_id] = val
-                                    print(f"    → ${val:,}")
-                                    break
-                            except ValueError:
-                                continue
-                except Exception as e:
-                    print(f"    [warn] Failed: {e}")
-
-            browser.close()
-
+        result = browser_pool.run(scrape_levels_async(career_mapping))
     except ImportError:
         print("  [skip] Playwright not installed")
     except Exception as e:
@@ -71,32 +115,29 @@ def scrape_levels(career_mapping):
 
     return result
 
-# Fallback: levels.fyi-informed tech compensation data (total comp including stock/bonus)
-FALLBACK_LEVELS = {
-    "software-engineer": 190000,
-    "data-scientist": 165000,
-    "product-manager": 185000,
-    "ux-designer": 145000,
-    "devops-engineer": 170000,
-    "ai-ml-engineer": 210000,
-}
+# Fallback levels.fyi-informed total comp (stock/bonus included) lives in fallbacks.zip
+__getattr__ = fallbacks.module_getattr(__name__, {"FALLBACK_LEVELS": "levels"})
 
-def get_levels_data(career_mapping):
-    """Get levels.fyi data with fallback."""
-    data = scrape_levels(career_mapping)
+def get_levels_data(career_mapping, budget=None):
+    """Get levels.fyi data with fallback. `budget` caps the scrape in seconds."""
+    data = deadlines.run("levels", scrape_levels, career_mapping, budget=budget)
+    if data is None:
+        return deadlines.fallback("levels", fallbacks.load("levels"))
 
     # Sanity check: levels.fyi leaderboard shows top earners, not medians.
     # If scraped values are unreasonably high (>$400K median total comp), fall back.
+    use_fallback = len(data) < 3
     if data:
         avg_scraped = sum(data.values()) / len(data)
         if avg_scraped > 400000:
             print(f"  [warn] Scraped average ${avg_scraped:,.0f} looks like top-of-leaderboard, not median")
-            print("  [fallback] Using compiled levels.fyi compensation data")
-            data = FALLBACK_LEVELS
+            use_fallback = True
 
-    if len(data) < 3:
+    if use_fallback:
         print("  [fallback] Using compiled levels.fyi compensation data")
-        data = FALLBACK_LEVELS
+        deadlines.mark_fallback("levels")
+        return fallbacks.load("levels")
+    deadlines.remember("levels", data)
     return data
 
 if __name__ == "__main__":
@@ -1,42 +1,94 @@
 """
 Push combined career data to Supabase.
+
+seed_careers(..., changed_only=True) upserts only rows whose content differs
+from what was last seeded (digests kept in data/raw/seeded_careers.json).
 """
+import hashlib
 import json
 import os
+from datetime import datetime, timezone
 from dotenv import load_dotenv
+import metrics
+from career_record import records_from_rows, records_to_rows
 
 load_dotenv(os.path.join(os.path.dirname(__file__), ".env"))
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+RAW_DIR = os.path.join(os.path.dirname(__file__), "raw")
+SEEDED_FILE = "seeded_careers.json"
+
+# HistoryStore metric -> market_trend_series.metric (the market_trends column name)
+TREND_SERIES_METRICS = {"wage": "average_salary", "employment": "employment_count"}
+TREND_SERIES_BATCH = 500
+TRANSITION_BATCH = 1000
+
+def row_digest(row):
+    return hashlib.sha256(json.dumps(row, sort_keys=True, default=str).encode()).hexdigest()
+
+def load_seeded():
+    """{career_id: row digest} of the rows last upserted to Supabase."""
+    path = os.path.join(RAW_DIR, SEEDED_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
 
-def seed_careers(careers_data):
-    """Push career records to Supabase."""
+def save_seeded(seeded):
+    os.makedirs(RAW_DIR, exist_ok=True)
+    path = os.path.join(RAW_DIR, SEEDED_FILE)
+    with open(path + ".tmp", "w") as f:
+        json.dump(seeded, f, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+def save_careers_export(careers_data):
+    """Write CareerRecords to raw/careers_export.json (read by validate and seed)."""
+    rows = records_to_rows(careers_data)
+    os.makedirs(RAW_DIR, exist_ok=True)
+    path = os.path.join(RAW_DIR, "careers_export.json")
+    with open(path + ".tmp", "w") as f:
+        json.dump(rows, f, indent=2)
+    os.replace(path + ".tmp", path)
+    return rows
+
+def seed_careers(careers_data, changed_only=False):
+    """Push CareerRecords to Supabase. With changed_only, skip rows seeded unchanged."""
     print("\n--- Seeding Supabase ---")
+    rows = records_to_rows(careers_data)
 
     if not SUPABASE_URL or not SUPABASE_KEY:
         print("  [error] SUPABASE_URL and SUPABASE_KEY required in data/.env")
         print("  [info] Saving to data/raw/careers_export.json instead")
-        raw_dir = os.path.join(os.path.dirname(__file__), "raw")
-        os.makedirs(raw_dir, exist_ok=True)
-        with open(os.path.join(raw_dir, "careers_export.json"), "w") as f:
-            json.dump(careers_data, f, indent=2)
-        print(f"  [saved] {len(careers_data)} careers to careers_export.json")
+        save_careers_export(careers_data)
+        metrics.count("rows_written", len(rows))
+        print(f"  [saved] {len(rows)} careers to careers_export.json")
         return False
 
     try:
         from supabase import create_client
         supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
 
+        seeded = load_seeded()
+        digests = {row["id"]: row_digest(row) for row in rows}
+        if changed_only:
+            pending = [row for row in rows if seeded.get(row["id"]) != digests[row["id"]]]
+            print(f"  [info] {len(pending)}/{len(rows)} careers changed since last seed")
+        else:
+            pending = rows
+
         # Upsert careers (insert or update)
-        for i, career in enumerate(careers_data):
+        for i, career in enumerate(pending):
             try:
                 supabase.table("careers").upsert(career).execute()
-                print(f"  [{i+1}/{len(careers_data)}] {career['id']}: {career['title']}")
+                metrics.count("rows_written")
+                seeded[career["id"]] = digests[career["id"]]
+                print(f"  [{i+1}/{len(pending)}] {career['id']}: {career['title']}")
             except Exception as e:
                 print(f"  [error] Failed to upsert {career['id']}: {e}")
 
-        print(f"\n  [done] Seeded {len(careers_data)} careers to Supabase")
+        save_seeded(seeded)
+        print(f"\n  [done] Seeded {len(pending)} careers to Supabase")
         return True
 
     except ImportError:
@@ -46,64 +98,75 @@ def seed_careers(careers_data):
         print(f"  [error] Supabase seeding failed: {e}")
         return False
 
-def seed_market_trends(historical_data, career_mapping):
-    """Push historical market trend data to Supabase."""
+def trend_series_rows(store, career_mapping, only_ids=None):
+    """Packed market_trend_series rows from a HistoryStore: one per career and metric.
+
+    series[i] is the value for start_year + i (None where BLS has no value);
+    leading and trailing years without data are trimmed.
+    """
+    import numpy as np
+    careers = [(career_id, info["soc_code"]) for career_id, info in career_mapping.items()
+               if (only_ids is None or career_id in only_ids) and info["soc_code"] in store]
+    socs = [soc for _, soc in careers]
+    rows = []
+    for metric, column in TREND_SERIES_METRICS.items():
+        block = store.matrix(metric, socs)
+        observed = ~np.isnan(block)
+        first = np.argmax(observed, axis=1)
+        last = block.shape[1] - np.argmax(observed[:, ::-1], axis=1)
+        # One bulk conversion to plain floats (NaN = no value)
+        values = block.tolist()
+        for i, (career_id, _) in enumerate(careers):
+            if not observed[i].any():
+                continue
+            rows.append({
+                "career_id": career_id,
+                "metric": column,
+                "start_year": store.first_year + int(first[i]),
+                "series": [int(v) if v == v else None for v in values[i][first[i]:last[i]]],
+                "source": "BLS OES",
+            })
+    return rows
+
+def seed_market_trends(store, career_mapping, only_ids=None):
+    """Push historical market trends (a HistoryStore) to Supabase as packed series.
+
+    Writes one market_trend_series row per career and metric, in batched
+    upserts. only_ids limits the upsert to those careers; the JSON export is
+    always full.
+    """
     print("\n--- Seeding Market Trends ---")
 
     if not SUPABASE_URL or not SUPABASE_KEY:
         print("  [skip] No Supabase credentials, saving trends to JSON")
-        raw_dir = os.path.join(os.path.dirname(__file__), "raw")
-        os.makedirs(raw_dir, exist_ok=True)
-        trends = []
-        for career_id, info in career_mapping.items():
-            soc = info["soc_code"]
-            soc_data = historical_data.get(soc, {})
-            for year in sorted(set(
-                list(soc_data.get("wage", {}).keys()) +
-                list(soc_data.get("employment", {}).keys())
-            )):
-                trends.append({
-                    "career_id": career_id,
-                    "date": f"{year}-05-01",
-                    "average_salary": soc_data.get("wage", {}).get(year),
-                    "employment_count": soc_data.get("employment", {}).get(year),
-                    "source": "BLS OES",
-                })
-        with open(os.path.join(raw_dir, "market_trends_export.json"), "w") as f:
-            json.dump(trends, f, indent=2)
-        print(f"  [saved] {len(trends)} trend records to market_trends_export.json")
+        os.makedirs(RAW_DIR, exist_ok=True)
+        rows = trend_series_rows(store, career_mapping)
+        with open(os.path.join(RAW_DIR, "market_trend_series_export.json"), "w") as f:
+            json.dump(rows, f, indent=2)
+        metrics.count("rows_written", len(rows))
+        print(f"  [saved] {len(rows)} trend series to market_trend_series_export.json")
         return False
 
     try:
         from supabase import create_client
         supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
 
+        rows = trend_series_rows(store, career_mapping, only_ids)
+        updated_at = datetime.now(timezone.utc).isoformat()
         count = 0
-        for career_id, info in career_mapping.items():
-            soc = info["soc_code"]
-            soc_data = historical_data.get(soc, {})
-            years = sorted(set(
-                list(soc_data.get("wage", {}).keys()) +
-                list(soc_data.get("employment", {}).keys())
-            ))
-            for year in years:
-                record = {
-                    "career_id": career_id,
-                    "date": f"{year}-05-01",
-                    "average_salary": soc_data.get("wage", {}).get(year),
-                    "employment_count": soc_data.get("employment", {}).get(year),
-                    "source": "BLS OES",
-                }
-                try:
-                    supabase.table("market_trends").upsert(
-                        record,
-                        on_conflict="career_id,date"
-                    ).execute()
-                    count += 1
-                except Exception as e:
-                    print(f"  [error] Failed trend {career_id}/{year}: {e}")
-
-        print(f"  [done] Seeded {count} market trend records")
+        for i in range(0, len(rows), TREND_SERIES_BATCH):
+            batch = [{**row, "updated_at": updated_at} for row in rows[i:i + TREND_SERIES_BATCH]]
+            try:
+                supabase.table("market_trend_series").upsert(
+                    batch,
+                    on_conflict="career_id,metric"
+                ).execute()
+                metrics.count("rows_written", len(batch))
+                count += len(batch)
+            except Exception as e:
+                print(f"  [error] Failed trend series batch {i // TREND_SERIES_BATCH + 1}: {e}")
+
+        print(f"  [done] Seeded {count} market trend series")
         return True
 
     except ImportError:
@@ -114,12 +177,204 @@ def seed_market_trends(historical_data, career_mapping):
         return False
 
 
-if __name__ == "__main__":
-    # Load from export file if available
-    export_path = os.path.join(os.path.dirname(__file__), "raw", "careers_export.json")
-    if os.path.exists(export_path):
-        with open(export_path) as f:
-            data = json.load(f)
-        seed_careers(data)
-    else:
+def seed_trend_features(rows):
+    """Upsert one career_trend_features row per career."""
+    print("\n--- Seeding Trend Features ---")
+
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        print("  [skip] No Supabase credentials, saving trend features to JSON")
+        os.makedirs(RAW_DIR, exist_ok=True)
+        with open(os.path.join(RAW_DIR, "trend_features_export.json"), "w") as f:
+            json.dump(rows, f, indent=2)
+        metrics.count("rows_written", len(rows))
+        print(f"  [saved] {len(rows)} trend feature rows to trend_features_export.json")
+        return False
+
+    try:
+        from supabase import create_client
+        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+        computed_at = datetime.now(timezone.utc).isoformat()
+        supabase.table("career_trend_features").upsert(
+            [{**row, "computed_at": computed_at} for row in rows],
+            on_conflict="career_id"
+        ).execute()
+        metrics.count("rows_written", len(rows))
+        print(f"  [done] Seeded trend features for {len(rows)} careers")
+        return True
+
+    except ImportError:
+        print("  [error] supabase package not installed: pip install supabase")
+        return False
+    except Exception as e:
+        print(f"  [error] Trend features seeding failed: {e}")
+        return False
+
+
+def seed_skill_similarities(rows):
+    """Upsert one career_similarities row (ranked similar careers + scores) per career."""
+    print("\n--- Seeding Skill Similarities ---")
+
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        print("  [skip] No Supabase credentials, saving skill similarities to JSON")
+        os.makedirs(RAW_DIR, exist_ok=True)
+        with open(os.path.join(RAW_DIR, "career_similarities_export.json"), "w") as f:
+            json.dump(rows, f, indent=2)
+        metrics.count("rows_written", len(rows))
+        print(f"  [saved] {len(rows)} similarity lists to career_similarities_export.json")
+        return False
+
+    try:
+        from supabase import create_client
+        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+        computed_at = datetime.now(timezone.utc).isoformat()
+        supabase.table("career_similarities").upsert(
+            [{**row, "computed_at": computed_at} for row in rows],
+            on_conflict="career_id"
+        ).execute()
+        metrics.count("rows_written", len(rows))
+        print(f"  [done] Seeded skill similarities for {len(rows)} careers")
+        return True
+
+    except ImportError:
+        print("  [error] supabase package not installed: pip install supabase")
+        return False
+    except Exception as e:
+        print(f"  [error] Skill similarity seeding failed: {e}")
+        return False
+
+
+def seed_career_transitions(rows):
+    """Upsert one career_transitions row per reachable (from, to) pair, in batches.
+
+    Pairs left over from earlier runs (no longer reachable) are deleted once
+    every batch has been written.
+    """
+    print("\n--- Seeding Career Transitions ---")
+
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        print("  [skip] No Supabase credentials, saving transitions to JSON")
+        os.makedirs(RAW_DIR, exist_ok=True)
+        with open(os.path.join(RAW_DIR, "career_transitions_export.json"), "w") as f:
+            json.dump(rows, f)
+        metrics.count("rows_written", len(rows))
+        print(f"  [saved] {len(rows)} career pairs to career_transitions_export.json")
+        return False
+
+    try:
+        from supabase import create_client
+        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+        computed_at = datetime.now(timezone.utc).isoformat()
+        count = 0
+        for i in range(0, len(rows), TRANSITION_BATCH):
+            batch = [{**row, "computed_at": computed_at} for row in rows[i:i + TRANSITION_BATCH]]
+            try:
+                supabase.table("career_transitions").upsert(
+                    batch,
+                    on_conflict="from_id,to_id"
+                ).execute()
+                metrics.count("rows_written", len(batch))
+                count += len(batch)
+            except Exception as e:
+                print(f"  [error] Failed transitions batch {i // TRANSITION_BATCH + 1}: {e}")
+
+        if count == len(rows):
+            supabase.table("career_transitions").delete().lt("computed_at", computed_at).execute()
+        print(f"  [done] Seeded transitions for {count} career pairs")
+        return count == len(rows)
+
+    except ImportError:
+        print("  [error] supabase package not installed: pip install supabase")
+        return False
+    except Exception as e:
+        print(f"  [error] Career transitions seeding failed: {e}")
+        return False
+
+
+def seed_term_index(index):
+    """Upsert the career_terms posting lists and term_aliases, dropping stale rows."""
+    print("\n--- Seeding Term Index ---")
+    postings, aliases = index["postings"], index["aliases"]
+
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        print("  [skip] No Supabase credentials, saving term index to JSON")
+        os.makedirs(RAW_DIR, exist_ok=True)
+        with open(os.path.join(RAW_DIR, "term_index_export.json"), "w") as f:
+            json.dump({"career_terms": postings, "term_aliases": aliases}, f, indent=2)
+        metrics.count("rows_written", len(postings) + len(aliases))
+        print(f"  [saved] {len(postings)} posting lists and {len(aliases)} aliases to term_index_export.json")
+        return False
+
+    try:
+        from supabase import create_client
+        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+        computed_at = datetime.now(timezone.utc).isoformat()
+        for table, rows, key in (("career_terms", postings, "field,term"),
+                                 ("term_aliases", aliases, "field,alias")):
+            supabase.table(table).upsert(
+                [{**row, "computed_at": computed_at} for row in rows],
+                on_conflict=key
+            ).execute()
+            # Terms or aliases dropped from the vocabulary or from every career
+            supabase.table(table).delete().lt("computed_at", computed_at).execute()
+            metrics.count("rows_written", len(rows))
+        print(f"  [done] Seeded {len(postings)} posting lists and {len(aliases)} aliases")
+        return True
+
+    except ImportError:
+        print("  [error] supabase package not installed: pip install supabase")
+        return False
+    except Exception as e:
+        print(f"  [error] Term index seeding failed: {e}")
+        return False
+
+
+def seed_market_aggregates(aggregates):
+    """Replace the market_aggregates rows (one per aggregate kind)."""
+    print("\n--- Seeding Market Aggregates ---")
+
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        print("  [skip] No Supabase credentials, saving aggregates to JSON")
+        os.makedirs(RAW_DIR, exist_ok=True)
+        with open(os.path.join(RAW_DIR, "market_aggregates_export.json"), "w") as f:
+            json.dump(aggregates, f, indent=2)
+        metrics.count("rows_written", len(aggregates))
+        print(f"  [saved] {len(aggregates)} aggregates to market_aggregates_export.json")
+        return False
+
+    try:
+        from supabase import create_client
+        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+        computed_at = datetime.now(timezone.utc).isoformat()
+        rows = [{"kind": kind, "payload": payload, "computed_at": computed_at}
+                for kind, payload in aggregates.items()]
+        supabase.table("market_aggregates").upsert(rows, on_conflict="kind").execute()
+        metrics.count("rows_written", len(rows))
+        print(f"  [done] Seeded {len(rows)} market aggregates")
+        return True
+
+    except ImportError:
+        print("  [error] supabase package not installed: pip install supabase")
+        return False
+    except Exception as e:
+        print(f"  [error] Market aggregates seeding failed: {e}")
+        return False
+
+
+def main():
+    """Seed careers from raw/careers_export.json."""
+    export_path = os.path.join(RAW_DIR, "careers_export.json")
+    if not os.path.exists(export_path):
         print("No careers_export.json found. Run collect_all.py first.")
+        return False
+    with open(export_path) as f:
+        data = records_from_rows(json.load(f))
+    return seed_careers(data)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Skill-vector similarity between careers, from the full O*NET element tables.
+
+fetch_onet keeps only the top 8 skill names per SOC code. This module reads
+the importance ratings (Scale ID "IM", 1-5) of every element in the O*NET
+Skills sheet, and optionally Knowledge and Abilities (SKILL_SHEETS), for
+every occupation in the download, into one dense SOC x element matrix:
+
+  raw/skills/
+    index.json      {"socs": [...], "elements": ["Skills:Programming", ...], ...}
+    matrix.npy      float32 [len(socs), len(elements)]
+
+Detailed O*NET codes (15-1252.00, .01) are averaged into their SOC code.
+Vectors are centered per element (so elements every occupation rates alike
+do not dominate) and L2-normalized per sheet, so with several sheets the
+cosine is the mean of the per-sheet cosines.
+
+The skill_similarity stage then computes each career's top-K most similar
+careers by cosine with blocked matrix products (memory O(block x n), so it
+holds for every O*NET occupation as well as the 35 careers), and
+seed_skill_similarities stores them as ranked lists with scores in
+career_similarities. Careers sharing a SOC code score 1.0.
+
+Usage:
+  python skill_similarity.py                    # build from raw/onet_database.zip, print top-K
+  python skill_similarity.py software-engineer  # one career's neighbours
+"""
+import io
+import json
+import os
+import shutil
+import zipfile
+from datetime import datetime, timezone
+
+RAW_DIR = os.path.join(os.path.dirname(__file__), "raw")
+STORE_DIR = os.path.join(RAW_DIR, "skills")
+ONET_ZIP = os.path.join(RAW_DIR, "onet_database.zip")
+INDEX_FILE = "index.json"
+
+# O*NET element sheets in the vectors, e.g. "Skills,Knowledge,Abilities"
+SKILL_SHEETS = [s.strip() for s in os.getenv("SKILL_SHEETS", "Skills").split(",") if s.strip()]
+SCALE = "IM"
+TOP_K = 10
+BLOCK = 1024
+
+
+class SkillMatrixError(Exception):
+    """The O*NET download or the built matrix is missing or unreadable."""
+
+
+def read_sheet(zf, sheet):
+    """Long-format (soc, element, value) rows of one O*NET sheet, importance scale only."""
+    import pandas as pd
+    names = [n for n in zf.namelist() if os.path.basename(n) == f"{sheet}.xlsx"]
+    if not names:
+        return None
+    with zf.open(names[0]) as f:
+        df = pd.read_excel(io.BytesIO(f.read()))
+    df.columns = [c.strip() for c in df.columns]
+    code_col = next((c for c in df.columns if "Code" in c), df.columns[0])
+    if "Scale ID" in df.columns:
+        df = df[df["Scale ID"] == SCALE]
+    return pd.DataFrame({
+        "soc": df[code_col].astype(str).str[:7],
+        "element": f"{sheet}:" + df["Element Name"].astype(str),
+        "value": pd.to_numeric(df["Data Value"], errors="coerce"),
+    })
+
+
+def normalize(values, elements):
+    """Center per element, then L2-normalize each sheet's block so rows have unit norm."""
+    import numpy as np
+    values = values - np.nanmean(values, axis=0)
+    values = np.nan_to_num(values)
+    sheets = np.array([e.split(":", 1)[0] for e in elements])
+    unique = list(dict.fromkeys(sheets))
+    for sheet in unique:
+        cols = sheets == sheet
+        norms = np.linalg.norm(values[:, cols], axis=1, keepdims=True)
+        values[:, cols] = np.divide(values[:, cols], norms, out=np.zeros_like(values[:, cols]),
+                                    where=norms > 0)
+    return values / np.sqrt(len(unique))
+
+
+class SkillMatrix:
+    """Normalized SOC x element importance vectors, stored in raw/skills/."""
+
+    def __init__(self, directory, index, values=None):
+        self.directory = directory
+        self.index = index
+        self.socs = index["socs"]
+        self.elements = index["elements"]
+        self._row = {soc: i for i, soc in enumerate(self.socs)}
+        self._values = values
+
+    @classmethod
+    def open(cls, directory=STORE_DIR):
+        try:
+            with open(os.path.join(directory, INDEX_FILE)) as f:
+                index = json.load(f)
+        except OSError as e:
+            raise SkillMatrixError(f"No skill matrix in {directory}: {e}") from e
+        return cls(directory, index)
+
+    @classmethod
+    def build(cls, zip_path=ONET_ZIP, sheets=None, directory=STORE_DIR):
+        """Read `sheets` from the O*NET download and write a new matrix."""
+        import numpy as np
+        import pandas as pd
+        sheets = sheets or SKILL_SHEETS
+        try:
+            with zipfile.ZipFile(zip_path) as zf:
+                frames = {sheet: read_sheet(zf, sheet) for sheet in sheets}
+        except (OSError, zipfile.BadZipFile) as e:
+            raise SkillMatrixError(f"Cannot read O*NET download {zip_path}: {e}") from e
+        missing = [sheet for sheet, df in frames.items() if df is None]
+        if len(missing) == len(sheets):
+            raise SkillMatrixError(f"None of {', '.join(sheets)} found in {zip_path}")
+        for sheet in missing:
+            print(f"  [info] {sheet}.xlsx not in the O*NET download, skipping it")
+
+        long = pd.concat([df for df in frames.values() if df is not None], ignore_index=True)
+        wide = long.pivot_table(index="soc", columns="element", values="value", aggfunc="mean")
+        elements = list(wide.columns)
+        values = normalize(wide.to_numpy(dtype="float64"), elements).astype("float32")
+
+        tmp = directory + ".tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        np.save(os.path.join(tmp, "matrix.npy"), values)
+        index = {
+            "socs": list(wide.index),
+            "elements": elements,
+            "sheets": [sheet for sheet in sheets if sheet not in missing],
+            "scale": SCALE,
+            "built_at": datetime.now(timezone.utc).isoformat(),
+        }
+        with open(os.path.join(tmp, INDEX_FILE), "w") as f:
+            json.dump(index, f, indent=2)
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(tmp, directory)
+        return cls(directory, index, values)
+
+    @property
+    def values(self):
+        import numpy as np
+        if self._values is None:
+            self._values = np.load(os.path.join(self.directory, "matrix.npy"), mmap_mode="r")
+        return self._values
+
+    def vectors(self, socs):
+        """[len(socs), elements] rows; SOC codes not in the matrix come back as zeros."""
+        import numpy as np
+        block = np.zeros((len(socs), len(self.elements)), dtype="float32")
+        for i, soc in enumerate(socs):
+            if soc in self._row:
+                block[i] = self.values[self._row[soc]]
+        return block
+
+    def __contains__(self, soc):
+        return soc in self._row
+
+    def __len__(self):
+        return len(self.socs)
+
+
+def cosine_top_k(vectors, k=TOP_K, block=BLOCK):
+    """(indices, scores), each [n, k]: every row's k most similar other rows.
+
+    Rows must be L2-normalized. Zero rows match nothing in either direction:
+    their scores are all -inf. Similarities are computed `block` rows at a
+    time, so memory stays O(block x n).
+    """
+    import numpy as np
+    n = len(vectors)
+    k = min(k, n - 1)
+    indices = np.empty((n, max(k, 0)), dtype=np.int64)
+    scores = np.empty((n, max(k, 0)), dtype=np.float32)
+    if k <= 0:
+        return indices, scores
+    empty = ~vectors.any(axis=1)
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        sims = vectors[start:stop] @ vectors.T
+        sims[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+        sims[:, empty] = -np.inf
+        sims[empty[start:stop]] = -np.inf
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        indices[start:stop] = np.take_along_axis(top, order, axis=1)
+        scores[start:stop] = np.take_along_axis(top_scores, order, axis=1)
+    return indices, scores
+
+
+def career_similarities(matrix, career_mapping, k=TOP_K):
+    """One row per career with O*NET vectors: career_id, similar_ids, scores (best first).
+
+    Only neighbours with a positive score are kept, so a career with no O*NET
+    ratings (or none in common with anyone) gets empty lists rather than k
+    arbitrary careers at 0.0; the row is still written so a stale list is
+    replaced.
+    """
+    import numpy as np
+    careers = sorted(cid for cid, info in career_mapping.items() if info["soc_code"] in matrix)
+    vectors = matrix.vectors([career_mapping[cid]["soc_code"] for cid in careers])
+    indices, scores = cosine_top_k(vectors, k)
+    method = f"cosine:{','.join(matrix.index['sheets'])}"
+    rows = []
+    for i, career_id in enumerate(careers):
+        keep = np.isfinite(scores[i]) & (scores[i] > 0)
+        rows.append({
+            "career_id": career_id,
+            "similar_ids": [careers[j] for j in indices[i][keep]],
+            "scores": [round(float(s), 4) for s in scores[i][keep]],
+            "method": method,
+        })
+    return rows
+
+
+def print_similarities(rows, limit=5):
+    for row in rows:
+        pairs = ", ".join(f"{cid} {score:.2f}" for cid, score in zip(row["similar_ids"][:limit], row["scores"]))
+        print(f"  {row['career_id']:<28} {pairs}")
+
+
+if __name__ == "__main__":
+    import sys
+    from fetch_onet import load_career_mapping
+    try:
+        matrix = SkillMatrix.open()
+    except SkillMatrixError:
+        matrix = SkillMatrix.build()
+    print(f"{len(matrix)} SOC codes x {len(matrix.elements)} elements ({', '.join(matrix.index['sheets'])})")
+    rows = career_similarities(matrix, load_career_mapping())
+    if len(sys.argv) > 1:
+        rows = [r for r in rows if r["career_id"] == sys.argv[1]]
+    print_similarities(rows, limit=TOP_K if len(sys.argv) > 1 else 5)
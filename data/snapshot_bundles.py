@@ -0,0 +1,243 @@
+"""
+Static JSON snapshot bundles of the career data, for CDN / static hosting.
+
+The career detail page used to make three API calls per view (career row,
+market trends, trend features), each one a Supabase query. The bundles stage
+writes everything that page reads into one JSON file per career, plus a
+catalog index, so the hot read path is a static file:
+
+  public/snapshots/
+    manifest.json                    bundle name -> hashed file, sha256, sizes
+    catalog.<hash>.json              every career's card fields + bundle path
+    careers/<id>.<hash>.json         career row, packed trend series,
+                                     trend features, related careers,
+                                     skill-similar careers with scores
+
+Each file name carries the first 12 hex digits of its content hash, so files
+never change once written and can be served with
+`Cache-Control: public, max-age=31536000, immutable` (see next.config.ts).
+Only manifest.json is mutable; clients read it first to find the current
+names. Every bundle is also written precompressed as .gz and, when the
+`brotli` package is installed, .br, for hosts that serve precompressed
+siblings (nginx gzip_static/brotli_static, most CDNs).
+
+JSON is serialized with sorted keys and gzip with a zero mtime, so unchanged
+careers keep their file names across runs and cached copies stay valid.
+The stage runs after seeding and reads the AI content columns
+(generate_ai_content.py) back from the careers table when credentials are set.
+Files referenced by neither the new nor the previous manifest are removed;
+the previous generation is kept for clients still holding the old manifest.
+
+Usage:
+  python snapshot_bundles.py          # summary of the current manifest
+"""
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+BUNDLE_DIR = os.getenv("BUNDLE_DIR") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "public", "snapshots")
+MANIFEST_FILE = "manifest.json"
+HASH_LENGTH = 12
+
+CATALOG_FIELDS = ["id", "title", "path_type", "category", "salary_entry", "salary_median",
+                  "growth_rate", "growth_rate_numeric", "current_openings", "layoff_risk",
+                  "minimum_degree", "remote_options", "is_trending", "market_health_score"]
+RELATED_FIELDS = ["id", "title", "category", "salary_median", "growth_rate_numeric",
+                  "market_health_score"]
+# Written to the careers table by generate_ai_content.py, not part of CareerRecord
+AI_COLUMNS = ["ai_description", "ai_trajectory", "ai_requirements", "ai_generated_at"]
+
+
+def encode(payload):
+    """Canonical JSON bytes: sorted keys, no whitespace."""
+    return json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+
+
+def compressors():
+    """{extension: compress(bytes)} for the encodings available here."""
+    result = {"gz": lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    try:
+        import brotli
+        result["br"] = lambda data: brotli.compress(data, quality=11)
+    except ImportError:
+        pass
+    return result
+
+
+def fetch_ai_content():
+    """{career_id: ai_* columns} from the seeded careers table ({} without credentials)."""
+    from seed_supabase import SUPABASE_URL, SUPABASE_KEY
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        print("  [info] No Supabase credentials, bundles carry no AI content")
+        return {}
+    try:
+        from supabase import create_client
+        client = create_client(SUPABASE_URL, SUPABASE_KEY)
+        result = client.table("careers").select(",".join(["id"] + AI_COLUMNS)).execute()
+    except ImportError:
+        print("  [error] supabase package not installed: pip install supabase")
+        return {}
+    except Exception as e:
+        print(f"  [warn] Could not read AI content from Supabase: {e}")
+        return {}
+    return {row["id"]: {c: row.get(c) for c in AI_COLUMNS} for row in result.data or []}
+
+
+def career_rows(careers, ai_content=None):
+    """careers table rows with market_health_score (and AI content), keyed by id."""
+    from career_record import records_to_rows
+    from market_aggregates import careers_frame, health_scores
+    rows = records_to_rows(careers)
+    scores = health_scores(careers_frame(careers)).tolist()
+    for row, score in zip(rows, scores):
+        row["market_health_score"] = score
+        row.update((ai_content or {}).get(row["id"], {}))
+    return {row["id"]: row for row in rows}
+
+
+def career_bundles(careers, store, career_mapping, features, ai_content=None, similarities=None):
+    """{career_id: bundle payload} for every combined career."""
+    from seed_supabase import trend_series_rows
+    rows = career_rows(careers, ai_content)
+    series = {}
+    for row in trend_series_rows(store, career_mapping) if store is not None else []:
+        series.setdefault(row["career_id"], []).append(
+            {k: row[k] for k in ("metric", "start_year", "series", "source")})
+    features = {row["career_id"]: row for row in features or []}
+    similarities = {row["career_id"]: row for row in similarities or []}
+
+    bundles = {}
+    for career_id, row in rows.items():
+        related = [rows[rp] for rp in row.get("related_paths") or [] if rp in rows]
+        similar = similarities.get(career_id, {})
+        bundles[career_id] = {
+            "career": row,
+            "trends": series.get(career_id, []),
+            "features": features.get(career_id),
+            "related": [{f: r.get(f) for f in RELATED_FIELDS} for r in related],
+            "similar": [{**{f: rows[sid].get(f) for f in RELATED_FIELDS}, "score": score}
+                        for sid, score in zip(similar.get("similar_ids", []), similar.get("scores", []))
+                        if sid in rows],
+        }
+    return bundles
+
+
+class BundleWriter:
+    """Writes content-hashed files (plus compressed siblings) under one directory."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.compress = compressors()
+        self.written = 0
+
+    def write(self, name, payload):
+        """Write `payload` as <name>.<hash>.json; return its manifest entry."""
+        data = encode(payload)
+        digest = hashlib.sha256(data).hexdigest()
+        path = f"{name}.{digest[:HASH_LENGTH]}.json"
+        entry = {"path": path, "sha256": digest, "bytes": len(data), "encodings": {}}
+        full = os.path.join(self.directory, path)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        fresh = not os.path.exists(full)
+        for ext, compress in self.compress.items():
+            encoded = compress(data)
+            entry["encodings"][ext] = len(encoded)
+            if fresh or not os.path.exists(f"{full}.{ext}"):
+                self._write(f"{full}.{ext}", encoded)
+        if fresh:
+            self._write(full, data)
+            self.written += 1
+        return entry
+
+    @staticmethod
+    def _write(path, data):
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+
+def load_manifest(directory=BUNDLE_DIR):
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def referenced_files(manifest):
+    files = set()
+    for entry in (manifest or {}).get("bundles", {}).values():
+        files.add(entry["path"])
+        files.update(f"{entry['path']}.{ext}" for ext in entry.get("encodings", {}))
+    return files
+
+
+def prune(directory, keep):
+    """Delete bundle files under `directory` not in `keep` (relative paths)."""
+    removed = 0
+    for root, _, names in os.walk(directory):
+        for name in names:
+            path = os.path.relpath(os.path.join(root, name), directory)
+            if path != MANIFEST_FILE and path not in keep:
+                os.remove(os.path.join(root, name))
+                removed += 1
+    return removed
+
+
+def write_bundles(careers, store, career_mapping, features, ai_content=None, similarities=None,
+                  directory=BUNDLE_DIR):
+    """Write every bundle, the catalog and the manifest.
+
+    Returns (manifest, bundle files newly written, stale files removed).
+    """
+    previous = load_manifest(directory)
+    writer = BundleWriter(directory)
+    entries = {}
+    catalog = []
+    bundles = career_bundles(careers, store, career_mapping, features, ai_content, similarities)
+    for career_id, bundle in sorted(bundles.items()):
+        entry = writer.write(f"careers/{career_id}", bundle)
+        entries[f"careers/{career_id}"] = entry
+        card = {f: bundle["career"].get(f) for f in CATALOG_FIELDS}
+        card["bundle"] = entry["path"]
+        catalog.append(card)
+    entries["catalog"] = writer.write("catalog", {"careers": catalog})
+
+    # Covers the encodings too, so installing brotli publishes a new manifest
+    digests = [e["sha256"] for _, e in sorted(entries.items())] + sorted(writer.compress)
+    version = hashlib.sha256("".join(digests).encode()).hexdigest()
+    manifest = {
+        "version": version[:HASH_LENGTH],
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "encodings": sorted(writer.compress),
+        "bundles": entries,
+    }
+    if previous and previous.get("version") == manifest["version"]:
+        # Nothing changed: keep the manifest, its timestamp and the generation before it
+        return previous, writer.written, 0
+    BundleWriter._write(os.path.join(directory, MANIFEST_FILE),
+                        json.dumps(manifest, indent=2, sort_keys=True).encode())
+    removed = prune(directory, referenced_files(manifest) | referenced_files(previous))
+    return manifest, writer.written, removed
+
+
+def print_summary(manifest):
+    bundles = manifest["bundles"]
+    raw = sum(e["bytes"] for e in bundles.values())
+    print(f"  version {manifest['version']}, {len(bundles)} bundles, built {manifest['generated_at'][:19]}")
+    print(f"  {'json':<6} {raw / 1024:>8.1f} KB")
+    for ext in manifest["encodings"]:
+        size = sum(e["encodings"].get(ext, 0) for e in bundles.values())
+        print(f"  {ext:<6} {size / 1024:>8.1f} KB ({size / max(raw, 1):.0%})")
+
+
+if __name__ == "__main__":
+    manifest = load_manifest()
+    if manifest is None:
+        print(f"No manifest in {BUNDLE_DIR}. Run collect_all.py --stages bundles first.")
+    else:
+        print_summary(manifest)
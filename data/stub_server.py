@@ -0,0 +1,277 @@
+"""
+Local stub server emulating every external HTTP source the pipeline uses.
+
+Endpoints:
+  POST /publicAPI/v2/timeseries/data/   BLS Public Data API v2 (OES series)
+  GET  /v1/api/jobs/us/search/1         Adzuna job search (count only)
+  POST /v1/chat/completions             OpenAI chat completions (JSON content)
+  GET  /files/<name>                    static downloads from --files
+  GET  /pages/<path>                    static HTML pages from --pages (dir -> index.html)
+  GET  /__stats                         request / throttle counters
+
+Responses are deterministic per request, so runs are reproducible. Latency and
+HTTP 429s can be injected to load-test concurrency and retry handling:
+
+  python stub_server.py --port 8765 --files raw/fixtures/1x --latency-ms 80 --error-rate 0.1
+  eval "$(python stub_server.py --print-env --port 8765)"
+  python collect_all.py --force
+
+`--rate-limit N` additionally enforces N requests/second (token bucket) and
+answers excess requests with 429 + Retry-After, like the real APIs do.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+DEFAULT_FILES_DIR = os.path.join(os.path.dirname(__file__), "raw", "fixtures", "1x")
+DEFAULT_PAGES_DIR = os.path.join(os.path.dirname(__file__), "raw", "fixtures", "pages")
+
+CONTENT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".json": "application/json",
+    ".csv": "text/csv",
+}
+
+
+def stable_int(text, lo, hi):
+    """Deterministic integer in [lo, hi) derived from text."""
+    h = int(hashlib.sha256(text.encode()).hexdigest()[:12], 16)
+    return lo + h % (hi - lo)
+
+
+class StubConfig:
+    def __init__(self, files_dir=DEFAULT_FILES_DIR, pages_dir=DEFAULT_PAGES_DIR, latency_ms=0.0,
+                 jitter_ms=0.0, error_rate=0.0, rate_limit=None, seed=0):
+        self.files_dir = files_dir
+        self.pages_dir = pages_dir
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "throttled": 0, "by_path": {}}
+        self._tokens = float(rate_limit or 0)
+        self._last_refill = time.monotonic()
+
+    def should_throttle(self):
+        with self.lock:
+            if self.error_rate and self.random.random() < self.error_rate:
+                return True
+            if not self.rate_limit:
+                return False
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._last_refill) * self.rate_limit)
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return False
+            return True
+
+    def delay(self):
+        with self.lock:
+            jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+        ms = max(0.0, self.latency_ms + jitter)
+        if ms:
+            time.sleep(ms / 1000)
+
+    def count(self, path, throttled):
+        with self.lock:
+            self.stats["requests"] += 1
+            self.stats["throttled"] += int(throttled)
+            key = path.split("?")[0]
+            self.stats["by_path"][key] = self.stats["by_path"].get(key, 0) + 1
+
+
+def bls_series_payload(payload):
+    """BLS v2 response for OEUS series: 01 = employment, 13 = median wage."""
+    start = int(payload.get("startyear", 2014))
+    end = int(payload.get("endyear", 2024))
+    series = []
+    for series_id in payload.get("seriesid", []):
+        datatype = series_id[-2:]
+        base = (stable_int(series_id, 5_000, 2_000_000) if datatype == "01"
+                else stable_int(series_id, 40_000, 200_000))
+        growth = 1 + stable_int(series_id + "g", 0, 60) / 1000
+        data = [{
+            "year": str(year), "period": "A01", "periodName": "Annual",
+            "value": f"{int(base * growth ** (year - start)):,}", "footnotes": [{}],
+        } for year in range(end, start - 1, -1)]
+        series.append({"seriesID": series_id, "data": data})
+    return {
+        "status": "REQUEST_SUCCEEDED", "responseTime": 42, "message": [],
+        "Results": {"series": series},
+    }
+
+
+def chat_completion_payload(payload):
+    messages = payload.get("messages", [])
+    prompt = messages[-1]["content"] if messages else ""
+    wants_json = (payload.get("response_format") or {}).get("type") == "json_object"
+    tag = hashlib.sha256(prompt.encode()).hexdigest()[:8]
+    if wants_json:
+        content = json.dumps({
+            "description": f"Stub description {tag}.",
+            "trajectory": f"Stub trajectory {tag}.",
+            "requirements": f"Stub requirements {tag}.",
+        })
+    else:
+        content = f"Stub analysis {tag}."
+    return {
+        "id": f"chatcmpl-stub-{tag}", "object": "chat.completion", "created": int(time.time()),
+        "model": payload.get("model", "gpt-4o-mini"),
+        "choices": [{"index": 0, "finish_reason": "stop",
+                     "message": {"role": "assistant", "content": content}}],
+        "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4,
+                  "total_tokens": (len(prompt) + len(content)) // 4},
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server_version = "PathIQStub/1.0"
+    config = None  # set by make_server
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, status, body, content_type="application/json", headers=None):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b"{}"
+        try:
+            return json.loads(raw or b"{}")
+        except ValueError:
+            return {}
+
+    def _gate(self):
+        """Apply latency and 429 injection. Returns True if the request may proceed."""
+        cfg = self.config
+        if self.path == "/__stats":
+            return True
+        throttled = cfg.should_throttle()
+        cfg.count(self.path, throttled)
+        cfg.delay()
+        if throttled:
+            self._send(429, {"error": "Too Many Requests"}, headers={"Retry-After": "1"})
+            return False
+        return True
+
+    def _serve_file(self, root, name):
+        if not root:
+            return self._send(404, {"error": "no directory configured"})
+        path = os.path.realpath(os.path.join(root, unquote(name)))
+        if os.path.isdir(path):
+            path = os.path.join(path, "index.html")
+        if not path.startswith(os.path.realpath(root) + os.sep) or not os.path.isfile(path):
+            return self._send(404, {"error": "not found"})
+        with open(path, "rb") as f:
+            body = f.read()
+        ctype = CONTENT_TYPES.get(os.path.splitext(path)[1], "application/octet-stream")
+        etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, b"", headers={"ETag": etag})
+        return self._send(200, body, ctype, headers={"ETag": etag})
+
+    def do_GET(self):
+        if not self._gate():
+            return
+        parts = urlsplit(self.path)
+        if parts.path == "/__stats":
+            return self._send(200, self.config.stats)
+        if parts.path.startswith("/v1/api/jobs/"):
+            query = parse_qs(parts.query)
+            what = query.get("what", [""])[0]
+            return self._send(200, {"count": stable_int(what, 200, 250_000), "results": [],
+                                    "mean": stable_int(what + "m", 40_000, 200_000)})
+        if parts.path.startswith("/files/"):
+            return self._serve_file(self.config.files_dir, parts.path[len("/files/"):])
+        if parts.path.startswith("/pages/"):
+            return self._serve_file(self.config.pages_dir, parts.path[len("/pages/"):])
+        return self._send(404, {"error": f"unknown path {parts.path}"})
+
+    def do_POST(self):
+        if not self._gate():
+            return
+        path = urlsplit(self.path).path
+        payload = self._read_json()
+        if path.startswith("/publicAPI/v2/timeseries/data"):
+            return self._send(200, bls_series_payload(payload))
+        if path.endswith("/chat/completions"):
+            return self._send(200, chat_completion_payload(payload))
+        return self._send(404, {"error": f"unknown path {path}"})
+
+
+def make_server(config, host="127.0.0.1", port=0):
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"config": config})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def serve_in_thread(config=None, host="127.0.0.1", port=0):
+    """Start a stub server on a daemon thread. Returns (server, base_url)."""
+    server = make_server(config or StubConfig(), host, port)
+    thread = threading.Thread(target=server.serve_forever, name="pathiq-stub", daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def stub_env(base_url):
+    """Environment variables that point every source at the stub server."""
+    return {
+        "BLS_API_URL": f"{base_url}/publicAPI/v2/timeseries/data/",
+        "BLS_API_KEY": "stub",
+        "ADZUNA_BASE": f"{base_url}/v1/api/jobs/us/search/1",
+        "ADZUNA_APP_ID": "stub",
+        "ADZUNA_APP_KEY": "stub",
+        "OPENAI_BASE_URL": f"{base_url}/v1",
+        "OEWS_URL": f"{base_url}/files/oesm24nat.zip",
+        "PROJECTIONS_URL": f"{base_url}/files/occupation_projections.xlsx",
+        "ONET_URL": f"{base_url}/files/onet_database.zip",
+        "LEVELS_BASE_URL": f"{base_url}/pages",
+        "LAYOFFS_URL": f"{base_url}/pages/layoffs/",
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stub for BLS, Adzuna, OpenAI and file downloads")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--files", default=DEFAULT_FILES_DIR, help="Directory served under /files/")
+    parser.add_argument("--pages", default=DEFAULT_PAGES_DIR, help="Directory of HTML pages served under /pages/")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--rate-limit", type=float, help="Max requests/second before 429s")
+    parser.add_argument("--print-env", action="store_true", help="Print export lines for the stub URLs and exit")
+    args = parser.parse_args()
+
+    base = f"http://{args.host}:{args.port}"
+    if args.print_env:
+        for k, v in stub_env(base).items():
+            print(f"export {k}={v}")
+        raise SystemExit(0)
+
+    cfg = StubConfig(args.files, args.pages, args.latency_ms, args.jitter_ms,
+                     args.error_rate, args.rate_limit)
+    server = make_server(cfg, args.host, args.port)
+    print(f"PathIQ stub server on {base} (files: {args.files})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping")
+        server.shutdown()
@@ -0,0 +1,438 @@
+"""
+Generate synthetic BLS and O*NET source files for offline benchmarks.
+
+Writes files with the same names, archive layout and column headers as the
+real downloads, so fetch_bls / fetch_onet parse them unchanged once RAW_DIR
+points at the fixture directory:
+
+  oesm24nat.zip                 oesm24nat/national_M2024_dl.xlsx
+  occupation_projections.xlsx   title row + National Employment Matrix table
+  onet_database.zip             db_30_1_excel/{Occupation Data,Interests,Skills}.xlsx
+                                (+ Knowledge, Abilities with --extra)
+
+Row counts at 1x match the 2024 releases (~1,400 OEWS rows, ~830 detailed
+occupations, ~58K O*NET Skills rows). Scales multiply the occupation count.
+Excel caps a sheet at 1,048,576 rows, so very large O*NET sheets are truncated
+to that limit (the real files never get close).
+
+--pages writes HTML fixtures for the Playwright scrapers to raw/fixtures/pages,
+laid out like the real sites so stub_server.py can serve them under /pages/.
+Each page pulls in an image, a web font and a video that the scrapers should
+block, and renders its data from a script after a short delay. The layoffs
+page loads an Airtable-shaped readSharedViewData.json, like the real embed.
+
+Usage:
+  python synthetic_data.py [--scale 1,10,100] [--out raw/fixtures] [--extra] [--pages]
+"""
+import argparse
+import json
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "raw", "fixtures")
+PAGES_DIR = os.path.join(FIXTURES_DIR, "pages")
+MAPPING_PATH = os.path.join(os.path.dirname(__file__), "career_mapping.json")
+
+# 2024 release sizes
+DETAILED_OCCUPATIONS = 830
+AGGREGATE_OEWS_ROWS = 570
+EXCEL_MAX_ROWS = 1_048_575
+
+RIASEC = ["Realistic", "Investigative", "Artistic", "Social", "Enterprising", "Conventional"]
+SKILLS = [
+    "Reading Comprehension", "Active Listening", "Writing", "Speaking", "Mathematics",
+    "Science", "Critical Thinking", "Active Learning", "Learning Strategies", "Monitoring",
+    "Social Perceptiveness", "Coordination", "Persuasion", "Negotiation", "Instructing",
+    "Service Orientation", "Complex Problem Solving", "Operations Analysis",
+    "Technology Design", "Equipment Selection", "Installation", "Programming",
+    "Operations Monitoring", "Operation and Control", "Equipment Maintenance",
+    "Troubleshooting", "Repairing", "Quality Control Analysis",
+    "Judgment and Decision Making", "Systems Analysis", "Systems Evaluation",
+    "Time Management", "Management of Financial Resources",
+    "Management of Material Resources", "Management of Personnel Resources",
+]
+KNOWLEDGE = [f"Knowledge Area {i + 1}" for i in range(33)]
+ABILITIES = [f"Ability {i + 1}" for i in range(52)]
+EDUCATION = [
+    "Bachelor's degree", "Master's degree", "Doctoral or professional degree",
+    "High school diploma or equivalent", "Associate's degree",
+    "Postsecondary nondegree award", "No formal educational credential",
+]
+
+
+def mapping_soc_codes():
+    with open(MAPPING_PATH) as f:
+        return sorted({c["soc_code"] for c in json.load(f).values()})
+
+
+def make_soc_codes(n, rng):
+    """n unique SOC codes, always including the real career_mapping codes."""
+    codes = mapping_soc_codes()
+    seen = set(codes)
+    while len(codes) < n:
+        batch = rng.integers(0, 1_000_000, size=max(n - len(codes), 1) * 2)
+        for v in batch:
+            code = f"{v // 10000 % 89 + 11:02d}-{v % 10000:04d}"
+            if code not in seen:
+                seen.add(code)
+                codes.append(code)
+                if len(codes) == n:
+                    break
+    return codes
+
+
+def wages(n, rng):
+    median = rng.integers(30_000, 220_000, size=n)
+    spread = rng.uniform(0.15, 0.45, size=n)
+    return {
+        "A_PCT10": (median * (1 - 1.6 * spread)).astype(int),
+        "A_PCT25": (median * (1 - spread)).astype(int),
+        "A_MEDIAN": median,
+        "A_PCT75": (median * (1 + spread)).astype(int),
+        "A_PCT90": (median * (1 + 1.8 * spread)).astype(int),
+        "A_MEAN": (median * 1.05).astype(int),
+    }
+
+
+def oews_frame(codes, rng):
+    n_detail = len(codes)
+    n_agg = int(AGGREGATE_OEWS_ROWS * n_detail / DETAILED_OCCUPATIONS)
+    agg_codes = [f"{c[:5]}00" for c in rng.choice(codes, size=n_agg)]
+    all_codes = list(codes) + agg_codes
+    n = len(all_codes)
+    w = wages(n, rng)
+
+    df = pd.DataFrame({
+        "AREA": 99, "AREA_TITLE": "U.S.", "AREA_TYPE": 1, "PRIM_STATE": "US",
+        "NAICS": "000000", "NAICS_TITLE": "Cross-industry", "I_GROUP": "cross-industry",
+        "OWN_CODE": 1235, "OCC_CODE": all_codes,
+        "OCC_TITLE": [f"Occupation {c}" for c in all_codes],
+        "O_GROUP": ["detailed"] * n_detail + list(rng.choice(["major", "minor", "broad"], size=n_agg)),
+        "TOT_EMP": rng.integers(1_000, 3_500_000, size=n),
+        "EMP_PRSE": rng.uniform(0.2, 5, size=n).round(1),
+        "H_MEAN": (w["A_MEAN"] / 2080).round(2),
+        "A_MEAN": w["A_MEAN"],
+        "MEAN_PRSE": rng.uniform(0.2, 3, size=n).round(1),
+        **{f"H_{k[2:]}": (v / 2080).round(2) for k, v in w.items() if k.startswith("A_PCT") or k == "A_MEDIAN"},
+        **{k: v for k, v in w.items() if k != "A_MEAN"},
+        "ANNUAL": None, "HOURLY": None,
+    })
+    # Suppressed cells appear as '*' / '#' in the real release
+    suppressed = rng.random(n) < 0.02
+    df["A_PCT90"] = df["A_PCT90"].astype(object)
+    df.loc[suppressed, "A_PCT90"] = "#"
+    return df
+
+
+def projections_frame(codes, rng):
+    n = len(codes)
+    emp = rng.integers(1_000, 3_500_000, size=n)
+    growth = rng.normal(4, 8, size=n).round(1)
+    return pd.DataFrame({
+        "2024 National Employment Matrix title": [f"Occupation {c}" for c in codes],
+        "2024 National Employment Matrix code": codes,
+        "Occupation type": "Line item",
+        "Employment, 2024": (emp / 1000).round(1),
+        "Employment, 2034": (emp * (1 + growth / 100) / 1000).round(1),
+        "Employment change, numeric, 2024–34": (emp * growth / 100 / 1000).round(1),
+        "Employment change, percent, 2024–34": growth,
+        "Percent self employed, 2024": rng.uniform(0, 30, size=n).round(1),
+        "Occupational openings, 2024–34 annual average": (emp * rng.uniform(0.05, 0.15, size=n) / 1000).round(1),
+        "Median annual wage, dollars, 2024[1]": rng.integers(30_000, 220_000, size=n),
+        "Typical education needed for entry": rng.choice(EDUCATION, size=n),
+        "Work experience in a related occupation": "None",
+        "Typical on-the-job training needed to attain competency in the occupation": "None",
+    })
+
+
+def onet_codes(codes):
+    return [f"{c}.00" for c in codes]
+
+
+def element_frame(codes, elements, scales, rng, extra_columns=True):
+    """Long-format O*NET table: one row per occupation x element x scale."""
+    occ = np.repeat(onet_codes(codes), len(elements) * len(scales))
+    elem = np.tile(np.repeat(elements, len(scales)), len(codes))
+    scale = np.tile(scales, len(codes) * len(elements))
+    n = len(occ)
+    values = np.where(scale == "IM", rng.uniform(1, 5, size=n), rng.uniform(0, 7, size=n)).round(2)
+    element_ids = {e: f"2.A.{i + 1}" for i, e in enumerate(elements)}
+    df = pd.DataFrame({
+        "O*NET-SOC Code": occ,
+        "Title": "Occupation " + pd.Series(occ).str[:7],
+        "Element ID": pd.Series(elem).map(element_ids),
+        "Element Name": elem,
+        "Scale ID": scale,
+        "Data Value": values,
+    })
+    if extra_columns:
+        df["N"] = 8
+        df["Standard Error"] = rng.uniform(0, 0.5, size=n).round(4)
+        df["Lower CI Bound"] = (values - 0.3).round(4)
+        df["Upper CI Bound"] = (values + 0.3).round(4)
+        df["Recommend Suppress"] = "N"
+        df["Not Relevant"] = np.where(scale == "LV", "N", None)
+    df["Date"] = "08/2024"
+    df["Domain Source"] = "Analyst"
+    if len(df) > EXCEL_MAX_ROWS:
+        print(f"    [warn] truncating {len(df):,} rows to Excel's {EXCEL_MAX_ROWS:,}-row limit")
+        df = df.iloc[:EXCEL_MAX_ROWS]
+    return df
+
+
+def write_xlsx_into_zip(zf, arcname, df, tmp_dir):
+    tmp_path = os.path.join(tmp_dir, os.path.basename(arcname))
+    df.to_excel(tmp_path, index=False)
+    zf.write(tmp_path, arcname)
+    os.remove(tmp_path)
+
+
+def generate(scale, out_dir=FIXTURES_DIR, extra=False, seed=42):
+    """Write one scale's fixtures. Returns the fixture directory."""
+    target = os.path.join(out_dir, f"{scale}x")
+    done_marker = os.path.join(target, "fixture.json")
+    if os.path.exists(done_marker):
+        print(f"  [skip] {target} already generated")
+        return target
+    os.makedirs(target, exist_ok=True)
+
+    rng = np.random.default_rng(seed)
+    codes = make_soc_codes(DETAILED_OCCUPATIONS * scale, rng)
+    print(f"\n--- Generating {scale}x fixtures ({len(codes):,} occupations) ---")
+
+    oews = oews_frame(codes, rng)
+    print(f"  [write] oesm24nat.zip ({len(oews):,} rows)")
+    with zipfile.ZipFile(os.path.join(target, "oesm24nat.zip"), "w", zipfile.ZIP_DEFLATED) as zf:
+        write_xlsx_into_zip(zf, "oesm24nat/national_M2024_dl.xlsx", oews, target)
+
+    proj = projections_frame(codes, rng)
+    print(f"  [write] occupation_projections.xlsx ({len(proj):,} rows)")
+    with pd.ExcelWriter(os.path.join(target, "occupation_projections.xlsx")) as writer:
+        # Real file has a title row above the header
+        pd.DataFrame([["Table 1.2 National Employment Matrix, 2024 and projected 2034"]]).to_excel(
+            writer, index=False, header=False, startrow=0)
+        proj.to_excel(writer, index=False, startrow=1)
+
+    tables = {
+        "Occupation Data": pd.DataFrame({
+            "O*NET-SOC Code": onet_codes(codes),
+            "Title": [f"Occupation {c}" for c in codes],
+            "Description": [f"Perform the duties of synthetic occupation {c}." for c in codes],
+        }),
+        "Interests": element_frame(codes, RIASEC, np.array(["OI"]), rng, extra_columns=False),
+        "Skills": element_frame(codes, SKILLS, np.array(["IM", "LV"]), rng),
+    }
+    if extra:
+        tables["Knowledge"] = element_frame(codes, KNOWLEDGE, np.array(["IM", "LV"]), rng)
+        tables["Abilities"] = element_frame(codes, ABILITIES, np.array(["IM", "LV"]), rng)
+
+    with zipfile.ZipFile(os.path.join(target, "onet_database.zip"), "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, df in tables.items():
+            print(f"  [write] onet_database.zip: {name}.xlsx ({len(df):,} rows)")
+            write_xlsx_into_zip(zf, f"db_30_1_excel/{name}.xlsx", df, target)
+
+    with open(done_marker, "w") as f:
+        json.dump({
+            "scale": scale,
+            "occupations": len(codes),
+            "soc_codes": codes,
+            "rows": {"oews": len(oews), "projections": len(proj),
+                     **{k: len(v) for k, v in tables.items()}},
+        }, f)
+    print(f"  [done] {target}")
+    return target
+
+
+def load_fixture_info(fixture_dir):
+    with open(os.path.join(fixture_dir, "fixture.json")) as f:
+        return json.load(f)
+
+
+def synthetic_career_mapping(soc_codes):
+    """One career per SOC code, shaped like career_mapping.json entries."""
+    mapping = {}
+    for i, soc in enumerate(soc_codes):
+        mapping[f"career-{soc}"] = {
+            "soc_code": soc,
+            "title": f"Occupation {soc}",
+            "path_type": "industry-job",
+            "category": ["tech", "finance", "healthcare", "engineering", "education"][i % 5],
+            "search_terms": [f"occupation {soc}"],
+            "preferred_majors": ["Computer Science", "Economics"][: 1 + i % 2],
+            "work_style": ["analytical", "collaborative"],
+            "industries": ["Technology"],
+            "remote_options": "hybrid",
+            "related_paths": [f"career-{soc_codes[(i + 1) % len(soc_codes)]}"],
+            "is_trending": i % 7 == 0,
+        }
+    return mapping
+
+
+def synthetic_historical(soc_codes, start_year=2014, end_year=2024, seed=42):
+    """get_historical_data-shaped dict for the given SOC codes."""
+    rng = np.random.default_rng(seed)
+    years = list(range(start_year, end_year + 1))
+    n = len(soc_codes)
+    emp0 = rng.integers(5_000, 3_000_000, size=n)
+    wage0 = rng.integers(40_000, 200_000, size=n)
+    emp_growth = rng.normal(0.02, 0.03, size=n)
+    wage_growth = rng.normal(0.03, 0.01, size=n)
+    steps = np.arange(len(years))
+    emp = (emp0[:, None] * (1 + emp_growth[:, None]) ** steps).astype(int)
+    wage = (wage0[:, None] * (1 + wage_growth[:, None]) ** steps).astype(int)
+    return {
+        soc: {
+            "employment": dict(zip(years, emp[i].tolist())),
+            "wage": dict(zip(years, wage[i].tolist())),
+        }
+        for i, soc in enumerate(soc_codes)
+    }
+
+
+
+# Onboarding interest values (src/lib/constants.ts INTEREST_OPTIONS)
+PROFILE_INTERESTS = ["technology", "business", "healthcare", "engineering", "science", "arts",
+                     "education", "law", "social-impact", "entrepreneurship"]
+PROFILE_MAJORS = ["Computer Science", "CS", "Economics", "Econ", "Biology", "Nursing", "Mathematics",
+                  "Mechanical Engineering", "Psychology", "Undeclared", ""]
+
+
+def synthetic_profiles(n, seed=42):
+    """user_profiles rows (id, major, interests, values, updated_at) for n users."""
+    rng = np.random.default_rng(seed)
+    majors = rng.integers(0, len(PROFILE_MAJORS), size=n)
+    counts = rng.integers(1, 4, size=n)
+    values = rng.integers(1, 6, size=(n, 4))
+    seconds = np.sort(rng.integers(0, 90 * 86400, size=n))
+    updated = np.datetime_as_string(np.datetime64("2026-01-01T00:00:00") + seconds.astype("timedelta64[s]"))
+    return [
+        {
+            "id": f"00000000-0000-4000-8000-{i:012d}",
+            "major": PROFILE_MAJORS[majors[i]],
+            "interests": [PROFILE_INTERESTS[j] for j in rng.choice(len(PROFILE_INTERESTS), counts[i], replace=False)],
+            "values": dict(zip(["compensation", "impact", "flexibility", "stability"], values[i].tolist())),
+            "updated_at": f"{updated[i]}+00:00",
+        }
+        for i in range(n)
+    ]
+
+# Median total comp shown on each synthetic levels.fyi leaderboard
+LEVELS_COMP = {
+    "Software-Engineer": 190000,
+    "Data-Scientist": 165000,
+    "Product-Manager": 185000,
+}
+
+PAGE_TEMPLATE = """<!doctype html>
+<html>
+<head>
+  <title>{title}</title>
+  <link rel="preload" href="/pages/assets/inter.woff2" as="font" crossorigin>
+  <style>@font-face {{ font-family: Inter; src: url(/pages/assets/inter.woff2); }}</style>
+</head>
+<body>
+  <img src="/pages/assets/hero.png" width="1200" height="400">
+  <video src="/pages/assets/promo.mp4" autoplay muted></video>
+  <main id="app">Loading...</main>
+  <script>
+    setTimeout(function () {{
+      document.getElementById("app").innerHTML = {body};
+    }}, {delay_ms});
+  </script>
+</body>
+</html>
+"""
+
+
+def write_page(path, title, body_html, delay_ms=300):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(PAGE_TEMPLATE.format(title=title, body=json.dumps(body_html), delay_ms=delay_ms))
+
+
+LAYOFF_INDUSTRIES = ["AI", "Consumer", "Crypto", "Data", "Education", "Finance", "Fitness",
+                     "Healthcare", "Hardware", "Infrastructure", "Legal", "Marketing", "Media",
+                     "Manufacturing", "Retail", "Sales", "Security", "Transportation", "Other"]
+
+LAYOFFS_PAGE = """<!doctype html>
+<html>
+<head><title>Layoffs.fyi - Tech Layoff Tracker</title></head>
+<body>
+  <img src="/pages/assets/hero.png" width="1200" height="400">
+  <main id="app">Loading...</main>
+  <script>
+    fetch("readSharedViewData.json").then(function (r) {{ return r.json(); }}).then(function (d) {{
+      document.getElementById("app").textContent = d.data.table.rows.length + " layoffs";
+    }});
+  </script>
+</body>
+</html>
+"""
+
+
+def layoff_view_payload(n_events=3000, days=730, seed=7):
+    """Airtable readSharedViewData payload shaped like the layoffs.fyi embed."""
+    rng = np.random.default_rng(seed)
+    today = pd.Timestamp.now().normalize()
+    choices = {f"sel{i:03d}": {"id": f"sel{i:03d}", "name": name}
+               for i, name in enumerate(LAYOFF_INDUSTRIES)}
+    choice_ids = list(choices)
+    dates = today - pd.to_timedelta(rng.integers(0, days, n_events), unit="D")
+    counts = rng.lognormal(4.5, 1.3, n_events).astype(int) + 1
+    industries = rng.integers(0, len(choice_ids), n_events)
+    rows = [{
+        "id": f"rec{i:06d}",
+        "cellValuesByColumnId": {
+            "fldCompany": f"Company {i % 900}",
+            "fldDate": f"{dates[i]:%Y-%m-%d}T00:00:00.000Z",
+            "fldLaidOff": int(counts[i]),
+            "fldIndustry": choice_ids[industries[i]],
+            "fldCountry": "United States",
+        },
+    } for i in range(n_events)]
+    columns = [
+        {"id": "fldCompany", "name": "Company", "type": "text"},
+        {"id": "fldDate", "name": "Date", "type": "date"},
+        {"id": "fldLaidOff", "name": "# Laid Off", "type": "number"},
+        {"id": "fldIndustry", "name": "Industry", "type": "select",
+         "typeOptions": {"choices": choices}},
+        {"id": "fldCountry", "name": "Country", "type": "text"},
+    ]
+    return {"msg": "SUCCESS", "data": {"table": {"columns": columns, "rows": rows}}}
+
+
+def write_pages(out_dir=PAGES_DIR):
+    """HTML fixtures for scrape_levels and scrape_layoffs."""
+    for levels_title, comp in LEVELS_COMP.items():
+        body = (f'<h1>{levels_title} Leaderboard</h1>'
+                f'<div class="median-total-comp">${comp // 1000}K</div>'
+                f'<table><tr><td class="company">Example Co</td>'
+                f'<td class="total-comp">${comp * 3 // 1000}K</td></tr></table>')
+        path = os.path.join(out_dir, "leaderboard", levels_title, "All-Levels",
+                            "country", "United-States", "index.html")
+        write_page(path, f"{levels_title} Leaderboard", body)
+
+    layoffs_dir = os.path.join(out_dir, "layoffs")
+    os.makedirs(layoffs_dir, exist_ok=True)
+    with open(os.path.join(layoffs_dir, "index.html"), "w") as f:
+        f.write(LAYOFFS_PAGE.format())
+    with open(os.path.join(layoffs_dir, "readSharedViewData.json"), "w") as f:
+        json.dump(layoff_view_payload(), f)
+    print(f"  [saved] page fixtures in {out_dir}")
+    return out_dir
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic BLS/O*NET fixtures")
+    parser.add_argument("--scale", default="1", help="Comma-separated scales, e.g. 1,10,100")
+    parser.add_argument("--out", default=FIXTURES_DIR)
+    parser.add_argument("--extra", action="store_true", help="Also write Knowledge and Abilities")
+    parser.add_argument("--pages", action="store_true", help="Also write HTML fixtures for the scrapers")
+    args = parser.parse_args()
+    for s in args.scale.split(","):
+        generate(int(s), args.out, extra=args.extra)
+    if args.pages:
+        write_pages(os.path.join(args.out, "pages"))
@@ -0,0 +1,138 @@
+"""
+Controlled vocabulary and inverted index for the career matching fields.
+
+Onboarding and the profile match users to careers on preferred_majors,
+interests, work_style and industries: free-text TEXT[] values ("Computer
+Science", "CS", "Business Administration") matched by scanning every
+career. vocabulary.json maps each field's canonical terms to their aliases;
+the term_index stage resolves every career value through it and builds one
+posting list per (field, term):
+
+  career_terms   field, term, career_ids[], weights[], df
+  term_aliases   field, alias (normalized), terms[]
+
+Weights follow the order of the career's list (first value 1.0, last 1/n),
+so a career's primary major outranks one it lists last. Aliases may resolve
+to several terms (the onboarding interest "technology" is both Realistic and
+Investigative). Values missing from vocabulary.json are indexed as their own
+term and listed by the stage so the vocabulary can be extended.
+
+Lookups normalize the input the same way (normalize_term here,
+normalizeTerm in src/lib/utils.ts), resolve aliases with one primary-key
+query and fetch the posting lists with another, instead of scanning careers.
+
+Usage:
+  python term_index.py                 # vocabulary coverage and top terms
+  python term_index.py majors "CS"     # resolve a value
+"""
+import json
+import os
+import re
+
+VOCABULARY_PATH = os.path.join(os.path.dirname(__file__), "vocabulary.json")
+RAW_DIR = os.path.join(os.path.dirname(__file__), "raw")
+
+# Index field -> careers column
+FIELDS = {
+    "majors": "preferred_majors",
+    "interests": "interests",
+    "work_style": "work_style",
+    "industries": "industries",
+}
+
+
+def normalize_term(value):
+    """Lookup key: lowercase, "&" as "and", no dots or apostrophes, other punctuation as one space."""
+    value = re.sub(r"[.'\u2019]", "", str(value).lower().replace("&", " and "))
+    return re.sub(r"[^a-z0-9+]+", " ", value).strip()
+
+
+def load_vocabulary(path=VOCABULARY_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+
+def alias_table(vocabulary):
+    """{field: {normalized alias: [canonical terms]}}; every term is its own alias."""
+    table = {}
+    for field, terms in vocabulary.items():
+        aliases = table.setdefault(field, {})
+        for term, names in terms.items():
+            for name in [term] + names:
+                resolved = aliases.setdefault(normalize_term(name), [])
+                if term not in resolved:
+                    resolved.append(term)
+    return table
+
+
+def resolve(aliases, field, value):
+    """Canonical terms for one value ([value] itself when it is not in the vocabulary)."""
+    return aliases.get(field, {}).get(normalize_term(value), [value])
+
+
+def build_index(careers, vocabulary=None):
+    """{"postings": [...], "aliases": [...], "unmapped": {field: [values]}} for CareerRecords."""
+    from career_record import records_to_rows
+    vocabulary = vocabulary or load_vocabulary()
+    aliases = alias_table(vocabulary)
+    postings = {}
+    unmapped = {}
+    for row in records_to_rows(careers):
+        for field, column in FIELDS.items():
+            values = row.get(column) or []
+            n = len(values)
+            for rank, value in enumerate(values):
+                key = normalize_term(value)
+                if key not in aliases.get(field, {}):
+                    unmapped.setdefault(field, set()).add(value)
+                    aliases.setdefault(field, {})[key] = [value]
+                for term in aliases[field][key]:
+                    posting = postings.setdefault((field, term), {})
+                    # A career listing two aliases of one term keeps the better rank
+                    posting[row["id"]] = max(posting.get(row["id"], 0), round((n - rank) / n, 3))
+
+    posting_rows = []
+    for (field, term), weights in sorted(postings.items()):
+        ranked = sorted(weights.items(), key=lambda kv: (-kv[1], kv[0]))
+        posting_rows.append({
+            "field": field,
+            "term": term,
+            "career_ids": [cid for cid, _ in ranked],
+            "weights": [w for _, w in ranked],
+            "df": len(ranked),
+        })
+    alias_rows = [{"field": field, "alias": alias, "terms": terms}
+                  for field, table in sorted(aliases.items()) for alias, terms in sorted(table.items())]
+    return {
+        "postings": posting_rows,
+        "aliases": alias_rows,
+        "unmapped": {field: sorted(values) for field, values in unmapped.items()},
+    }
+
+
+def print_index(index, top=5):
+    by_field = {}
+    for row in index["postings"]:
+        by_field.setdefault(row["field"], []).append(row)
+    for field in FIELDS:
+        rows = by_field.get(field, [])
+        unmapped = index["unmapped"].get(field, [])
+        common = ", ".join(f"{r['term']} ({r['df']})" for r in sorted(rows, key=lambda r: -r["df"])[:top])
+        print(f"  {field:<11} {len(rows):>3} terms, {len(unmapped):>2} outside vocabulary  {common}")
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 2:
+        print(resolve(alias_table(load_vocabulary()), sys.argv[1], sys.argv[2]))
+    else:
+        from career_record import records_from_rows
+        export_path = os.path.join(RAW_DIR, "careers_export.json")
+        if not os.path.exists(export_path):
+            print("No careers_export.json found. Run collect_all.py first.")
+        else:
+            with open(export_path) as f:
+                index = build_index(records_from_rows(json.load(f)))
+            print_index(index)
+            for field, values in index["unmapped"].items():
+                print(f"  [info] {field} not in vocabulary.json: {', '.join(values)}")
@@ -0,0 +1,235 @@
+"""
+Career transition graph with precomputed shortest paths and alternative routes.
+
+Careers are nodes. Directed edges come from the curated related_paths and
+from each career's most skill-similar careers (skill_similarity.py). Moving
+from career a to career b costs
+
+    1                                            per hop
+  + SKILL_WEIGHT     * (1 - skill cosine(a, b))  skills to pick up
+  + SALARY_WEIGHT    * relative salary cut       only when b pays less
+  + EDUCATION_WEIGHT * extra years of schooling  only when b needs more
+
+so cheap routes are short, stay close in skills, avoid pay cuts and avoid
+going back to school. All-pairs shortest paths are computed with a
+vectorized Floyd-Warshall (O(n^3) over n x n arrays, no Python loop over
+pairs), keeping a next-hop matrix; the n x n cost and next-hop arrays are
+written to raw/transitions/ and any route is rebuilt by following next hops.
+
+For every reachable pair the stage also keeps the TOP_ROUTES cheapest
+alternative routes, each starting with a different first move (first hop h,
+then the shortest path from h), and seed_career_transitions stores them in
+career_transitions, one row per (from, to) pair, so "how do I get from X to
+Y" is a primary-key lookup.
+
+Usage:
+  python transition_graph.py                                   # graph summary
+  python transition_graph.py software-engineer product-manager # routes for one pair
+"""
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+
+RAW_DIR = os.path.join(os.path.dirname(__file__), "raw")
+STORE_DIR = os.path.join(RAW_DIR, "transitions")
+
+SKILL_WEIGHT = 1.0
+SALARY_WEIGHT = 2.0
+EDUCATION_WEIGHT = 0.25
+# Skill cosine assumed for curated edges when no skill vectors are available
+DEFAULT_SIMILARITY = 0.5
+# Skill-neighbour edges per career (from the top of its similarity list)
+SKILL_EDGES = 5
+SKILL_EDGE_MIN = 0.2
+TOP_ROUTES = 3
+
+# Years of schooling after high school for BLS "typical education needed for entry"
+EDUCATION_YEARS = {
+    "No formal educational credential": 0,
+    "High school diploma or equivalent": 0,
+    "Some college, no degree": 1,
+    "Postsecondary nondegree award": 1,
+    "Associate's degree": 2,
+    "Bachelor's degree": 4,
+    "Master's degree": 6,
+    "Doctoral or professional degree": 9,
+}
+
+
+def similarity_matrix(careers, matrix, career_mapping):
+    """[n, n] skill cosine between careers (None without a skill matrix)."""
+    if matrix is None:
+        return None
+    vectors = matrix.vectors([career_mapping[cid]["soc_code"] if cid in career_mapping else ""
+                              for cid in careers])
+    return vectors @ vectors.T
+
+
+def edge_weights(rows, similarities, sims=None):
+    """[n, n] edge costs (inf = no edge) from careers rows and similarity lists."""
+    import numpy as np
+    ids = [row["id"] for row in rows]
+    index = {cid: i for i, cid in enumerate(ids)}
+    n = len(ids)
+
+    adjacent = np.zeros((n, n), dtype=bool)
+    for i, row in enumerate(rows):
+        for rp in row.get("related_paths") or []:
+            if rp in index:
+                adjacent[i, index[rp]] = True
+    for entry in similarities or []:
+        i = index.get(entry["career_id"])
+        if i is None:
+            continue
+        for sid, score in list(zip(entry["similar_ids"], entry["scores"]))[:SKILL_EDGES]:
+            if score >= SKILL_EDGE_MIN and sid in index:
+                adjacent[i, index[sid]] = True
+    np.fill_diagonal(adjacent, False)
+
+    if sims is None:
+        sims = np.full((n, n), DEFAULT_SIMILARITY)
+    sims = np.clip(sims, 0, 1)
+
+    salary = np.array([row.get("salary_median") or np.nan for row in rows], dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cut = (salary[:, None] - salary[None, :]) / salary[:, None]
+    cut = np.nan_to_num(np.clip(cut, 0, None))
+
+    years = np.array([EDUCATION_YEARS.get(row.get("minimum_degree"), 0) for row in rows], dtype=float)
+    gap = np.clip(years[None, :] - years[:, None], 0, None)
+
+    cost = 1 + SKILL_WEIGHT * (1 - sims) + SALARY_WEIGHT * cut + EDUCATION_WEIGHT * gap
+    return np.where(adjacent, cost, np.inf)
+
+
+def all_pairs(weights):
+    """(dist, next_hop) by Floyd-Warshall; next_hop[i, j] = -1 when j is unreachable."""
+    import numpy as np
+    n = len(weights)
+    dist = weights.astype(np.float64, copy=True)
+    np.fill_diagonal(dist, 0)
+    next_hop = np.where(np.isfinite(dist), np.arange(n)[None, :], -1)
+    for k in range(n):
+        via = dist[:, k:k + 1] + dist[k:k + 1, :]
+        better = via < dist
+        dist = np.where(better, via, dist)
+        next_hop = np.where(better, next_hop[:, k:k + 1], next_hop)
+    return dist, next_hop
+
+
+def path(next_hop, i, j):
+    """Node indices of the shortest path i -> j ([] when unreachable)."""
+    if next_hop[i, j] < 0:
+        return []
+    nodes = [i]
+    while i != j:
+        i = int(next_hop[i, j])
+        nodes.append(i)
+    return nodes
+
+
+def routes_from(i, weights, dist, next_hop, k=TOP_ROUTES):
+    """{j: [(cost, path)]}: up to k cheapest routes i -> j, one per first hop."""
+    import numpy as np
+    hops = np.flatnonzero(np.isfinite(weights[i]))
+    if len(hops) == 0:
+        return {}
+    # cost[h, j] = first move to h, then h's shortest path to j
+    cost = weights[i, hops][:, None] + dist[hops]
+    order = np.argsort(cost, axis=0, kind="stable")
+    result = {}
+    for j in range(len(weights)):
+        if j == i or not np.isfinite(dist[i, j]):
+            continue
+        routes = []
+        for r in order[:, j]:
+            if not np.isfinite(cost[r, j]) or len(routes) == k:
+                break
+            rest = path(next_hop, int(hops[r]), j)
+            if i in rest:
+                continue
+            routes.append((float(cost[r, j]), [i] + rest))
+        result[j] = routes
+    return result
+
+
+def build_graph(careers, career_mapping, similarities=None, matrix=None):
+    """Compute the graph for CareerRecords; returns (ids, weights, dist, next_hop)."""
+    from career_record import records_to_rows
+    rows = records_to_rows(careers)
+    ids = [row["id"] for row in rows]
+    sims = similarity_matrix(ids, matrix, career_mapping)
+    weights = edge_weights(rows, similarities, sims)
+    dist, next_hop = all_pairs(weights)
+    return ids, weights, dist, next_hop
+
+
+def save_graph(ids, weights, dist, next_hop, directory=STORE_DIR):
+    """Write the cost and next-hop matrices (plus career order) to `directory`."""
+    import numpy as np
+    tmp = directory + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    index_dtype = np.int16 if len(ids) < 2 ** 15 else np.int32
+    np.save(os.path.join(tmp, "weights.npy"), weights.astype(np.float32))
+    np.save(os.path.join(tmp, "dist.npy"), dist.astype(np.float32))
+    np.save(os.path.join(tmp, "next_hop.npy"), next_hop.astype(index_dtype))
+    index = {
+        "careers": ids,
+        "edges": int(np.isfinite(weights).sum()),
+        "weights": {"skill": SKILL_WEIGHT, "salary": SALARY_WEIGHT, "education": EDUCATION_WEIGHT},
+        "built_at": datetime.now(timezone.utc).isoformat(),
+    }
+    with open(os.path.join(tmp, "index.json"), "w") as f:
+        json.dump(index, f, indent=2)
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(tmp, directory)
+    return index
+
+
+def load_graph(directory=STORE_DIR):
+    """(ids, weights, dist, next_hop) as written by save_graph."""
+    import numpy as np
+    with open(os.path.join(directory, "index.json")) as f:
+        ids = json.load(f)["careers"]
+    arrays = [np.load(os.path.join(directory, f"{name}.npy")) for name in ("weights", "dist", "next_hop")]
+    return (ids, *arrays)
+
+
+def transition_rows(ids, weights, dist, next_hop, k=TOP_ROUTES):
+    """One career_transitions row per reachable (from, to) pair."""
+    rows = []
+    for i, from_id in enumerate(ids):
+        for j, routes in routes_from(i, weights, dist, next_hop, k).items():
+            best = path(next_hop, i, j)
+            rows.append({
+                "from_id": from_id,
+                "to_id": ids[j],
+                "cost": round(float(dist[i, j]), 3),
+                "hops": len(best) - 1,
+                "routes": [{"path": [ids[n] for n in nodes], "cost": round(cost, 3)} for cost, nodes in routes],
+            })
+    return rows
+
+
+def print_summary(ids, weights, dist):
+    import numpy as np
+    n = len(ids)
+    reachable = np.isfinite(dist).sum() - n
+    print(f"  {n} careers, {int(np.isfinite(weights).sum())} edges, "
+          f"{reachable}/{n * (n - 1)} pairs reachable")
+    unreachable = [cid for i, cid in enumerate(ids) if np.isfinite(dist[:, i]).sum() == 1]
+    if unreachable:
+        print(f"  [warn] No route into: {', '.join(unreachable)}")
+
+
+if __name__ == "__main__":
+    import sys
+    ids, weights, dist, next_hop = load_graph()
+    if len(sys.argv) > 2:
+        i, j = ids.index(sys.argv[1]), ids.index(sys.argv[2])
+        for cost, nodes in routes_from(i, weights, dist, next_hop).get(j, []):
+            print(f"  {cost:5.2f}  " + " -> ".join(ids[n] for n in nodes))
+    else:
+        print_summary(ids, weights, dist)
@@ -0,0 +1,179 @@
+"""
+Time-series features per career from the historical BLS series.
+
+Charts and comparisons used to derive growth from the raw yearly
+market_trends rows on every read. This stage computes the features once per
+pipeline run, vectorized over the SOC x year matrices of the history store
+(history_store.py: one row per SOC code, one column per year, NaN where BLS
+has no value), and seeds one row per career into career_trend_features:
+
+  wage_cagr_5y / _10y          compound annual growth of the median wage (%)
+  employment_cagr_5y / _10y    same for employment
+  wage_yoy / employment_yoy    change over the latest year (%)
+  wage_volatility / employment_volatility
+                               standard deviation of the yearly changes (pct points)
+  real_wage_cagr_5y / _10y     wage CAGR after CPI-U inflation (%), ending at the
+                               latest year covered by both the wage data and CPI_U
+  wage_trend / employment_trend
+                               least-squares slope of log(value) per year, as %/year
+
+Spans are measured back from the latest year with data; a feature is null
+when either end of its span is missing.
+
+Usage:
+  python trend_features.py          # print features from raw/history/
+"""
+import warnings
+
+# CPI-U, U.S. city average, all items, annual average (BLS series CUUR0000SA0)
+CPI_U = {
+    2014: 236.736, 2015: 237.017, 2016: 240.007, 2017: 245.120, 2018: 251.107,
+    2019: 255.657, 2020: 258.811, 2021: 270.970, 2022: 292.655, 2023: 304.702,
+    2024: 313.689,
+}
+
+METRICS = ("wage", "employment")
+CAGR_SPANS = (5, 10)
+
+FEATURE_COLUMNS = [
+    "wage_cagr_5y", "wage_cagr_10y", "employment_cagr_5y", "employment_cagr_10y",
+    "wage_yoy", "employment_yoy", "wage_volatility", "employment_volatility",
+    "real_wage_cagr_5y", "real_wage_cagr_10y", "wage_trend", "employment_trend",
+]
+
+
+def last_observed(values):
+    """Column index of each row's latest non-NaN value (-1 for empty rows)."""
+    import numpy as np
+    observed = ~np.isnan(values)
+    last = values.shape[1] - 1 - np.argmax(observed[:, ::-1], axis=1)
+    return np.where(observed.any(axis=1), last, -1)
+
+
+def cagr(values, span, end):
+    """Compound annual growth (%) over `span` years ending at column `end` per row."""
+    import numpy as np
+    rows = np.arange(values.shape[0])
+    start = end - span
+    valid = (end >= 0) & (start >= 0)
+    first = np.where(valid, values[rows, np.clip(start, 0, None)], np.nan)
+    last = np.where(valid, values[rows, np.clip(end, 0, None)], np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(first > 0, last / first, np.nan)
+        return (ratio ** (1.0 / span) - 1) * 100
+
+
+def yearly_changes(values):
+    """Year-over-year change (%) between adjacent columns, NaN when either side is missing."""
+    import numpy as np
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(values[:, :-1] > 0, values[:, 1:] / values[:, :-1] - 1, np.nan) * 100
+
+
+def log_trend(values, years):
+    """Least-squares slope of log(values) against year per row, as % per year."""
+    import numpy as np
+    with np.errstate(divide="ignore", invalid="ignore"):
+        logs = np.where(values > 0, np.log(values), np.nan)
+    mask = ~np.isnan(logs)
+    n = mask.sum(axis=1)
+    x = np.broadcast_to(np.asarray(years, dtype=float), logs.shape)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_mean = np.where(mask, x, 0).sum(axis=1) / n
+        y_mean = np.where(mask, logs, 0).sum(axis=1) / n
+        dx = np.where(mask, x - x_mean[:, None], 0)
+        dy = np.where(mask, logs - y_mean[:, None], 0)
+        slope = (dx * dy).sum(axis=1) / (dx * dx).sum(axis=1)
+    return np.where(n >= 3, np.expm1(slope) * 100, np.nan)
+
+
+def cpi_series(years):
+    """CPI_U per year, NaN for years the table does not cover (with a warning)."""
+    import numpy as np
+    newest = max(CPI_U)
+    beyond = [year for year in years if year > newest]
+    if beyond:
+        print(f"  [warn] No CPI-U for {', '.join(map(str, beyond))} in trend_features.CPI_U; "
+              f"real wage growth ends at {newest} until the table is extended")
+    return np.array([CPI_U.get(year, np.nan) for year in years])
+
+
+def compute_features(matrix, years):
+    """{feature: array per SOC row} from {metric: [soc, year] array}."""
+    import numpy as np
+    wage, employment = matrix["wage"], matrix["employment"]
+    cpi = cpi_series(years)
+    covered = np.flatnonzero(~np.isnan(cpi))
+    if len(covered):
+        # In prices of the newest CPI year; years CPI_U does not cover stay NaN
+        real_wage = wage * (cpi[covered[-1]] / cpi)
+    else:
+        real_wage = np.full_like(wage, np.nan)
+
+    features = {}
+    for metric, values in (("wage", wage), ("employment", employment)):
+        end = last_observed(values)
+        for span in CAGR_SPANS:
+            features[f"{metric}_cagr_{span}y"] = cagr(values, span, end)
+        changes = yearly_changes(values)
+        rows = np.arange(values.shape[0])
+        features[f"{metric}_yoy"] = np.where(end >= 1, changes[rows, np.clip(end - 1, 0, None)], np.nan)
+        counts = (~np.isnan(changes)).sum(axis=1)
+        with warnings.catch_warnings():
+            # nanstd warns on rows without enough changes; those are masked out
+            warnings.simplefilter("ignore", RuntimeWarning)
+            features[f"{metric}_volatility"] = np.where(counts >= 2, np.nanstd(changes, axis=1, ddof=1), np.nan)
+        features[f"{metric}_trend"] = log_trend(values, years)
+
+    end = last_observed(real_wage)
+    for span in CAGR_SPANS:
+        features[f"real_wage_cagr_{span}y"] = cagr(real_wage, span, end)
+    return features
+
+
+def _round(value):
+    return None if value != value else round(float(value), 2)
+
+
+def career_features(store, career_mapping):
+    """One row per career: career_id, soc_code, FEATURE_COLUMNS, first_year, last_year."""
+    import numpy as np
+    years = list(store.years)
+    soc_codes = sorted({info["soc_code"] for info in career_mapping.values()})
+    row_of = {soc: i for i, soc in enumerate(soc_codes)}
+    matrix = {metric: store.matrix(metric, soc_codes) for metric in METRICS}
+    features = compute_features(matrix, years)
+
+    observed = ~(np.isnan(matrix["wage"]) & np.isnan(matrix["employment"]))
+    first = np.argmax(observed, axis=1)
+    last = len(years) - 1 - np.argmax(observed[:, ::-1], axis=1)
+    has_data = observed.any(axis=1)
+
+    rows = []
+    for career_id, info in career_mapping.items():
+        i = row_of[info["soc_code"]]
+        if not has_data[i]:
+            continue
+        row = {"career_id": career_id, "soc_code": info["soc_code"]}
+        row.update({name: _round(features[name][i]) for name in FEATURE_COLUMNS})
+        row["first_year"] = years[first[i]]
+        row["last_year"] = years[last[i]]
+        rows.append(row)
+    return rows
+
+
+def print_features(rows):
+    print(f"  {'career':<28} {'wage 5y':>8} {'wage 10y':>9} {'real 10y':>9} {'emp 10y':>8} "
+          f"{'wage vol':>9} {'trend':>6}")
+    for r in sorted(rows, key=lambda r: -(r["wage_cagr_10y"] or -1e9)):
+        cells = [r["wage_cagr_5y"], r["wage_cagr_10y"], r["real_wage_cagr_10y"],
+                 r["employment_cagr_10y"], r["wage_volatility"], r["wage_trend"]]
+        widths = [8, 9, 9, 8, 9, 6]
+        text = " ".join(f"{'-' if v is None else f'{v:.1f}':>{w}}" for v, w in zip(cells, widths))
+        print(f"  {r['career_id']:<28} {text}")
+
+
+if __name__ == "__main__":
+    from fetch_bls import load_career_mapping
+    from history_store import HistoryStore
+    print_features(career_features(HistoryStore.open(), load_career_mapping()))
@@ -37,7 +37,7 @@ KNOWN_RANGES = {
 
 
 def validate_careers(careers_data):
-    """Validate career records. Returns list of warning strings."""
+    """Validate CareerRecords (or row dicts). Returns list of warning strings."""
     warnings = []
 
     for career in careers_data:
@@ -105,16 +105,23 @@ def validate_careers(careers_data):
     return warnings
 
 
-if __name__ == "__main__":
+def main():
+    """Validate raw/careers_export.json. Returns the warnings."""
     import json
     import os
+    from career_record import records_from_rows
 
     export_path = os.path.join(os.path.dirname(__file__), "raw", "careers_export.json")
-    if os.path.exists(export_path):
-        with open(export_path) as f:
-            data = json.load(f)
-        print(f"Validating {len(data)} careers from {export_path}")
-        warns = validate_careers(data)
-        print(f"\n{len(warns)} warning(s) found")
-    else:
+    if not os.path.exists(export_path):
         print("No careers_export.json found. Run collect_all.py first.")
+        return None
+    with open(export_path) as f:
+        data = records_from_rows(json.load(f))
+    print(f"Validating {len(data)} careers from {export_path}")
+    warns = validate_careers(data)
+    print(f"\n{len(warns)} warning(s) found")
+    return warns
+
+
+if __name__ == "__main__":
+    main()
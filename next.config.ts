@@ -1,7 +1,20 @@
 import type { NextConfig } from "next";
 
 const nextConfig: NextConfig = {
-  /* config options here */
+  async headers() {
+    return [
+      {
+        // Snapshot bundles (data/snapshot_bundles.py) are content-hashed
+        source: "/snapshots/:path*",
+        headers: [{ key: "Cache-Control", value: "public, max-age=31536000, immutable" }],
+      },
+      {
+        // ...except the manifest that points at the current ones
+        source: "/snapshots/manifest.json",
+        headers: [{ key: "Cache-Control", value: "public, max-age=60, must-revalidate" }],
+      },
+    ];
+  },
 };
 
 export default nextConfig;
@@ -0,0 +1,49 @@
+import { NextRequest, NextResponse } from "next/server";
+import { supabase } from "@/lib/supabase";
+import { Career, SimilarCareer } from "@/lib/types";
+import { calculateHealthScore } from "@/lib/utils";
+
+/** Careers with the most similar O*NET skill profiles, best first (precomputed). */
+export async function GET(
+  request: NextRequest,
+  { params }: { params: Promise<{ id: string }> }
+) {
+  const { id } = await params;
+
+  const { data: row, error } = await supabase
+    .from("career_similarities")
+    .select("similar_ids, scores")
+    .eq("career_id", id)
+    .maybeSingle();
+
+  if (error) {
+    return NextResponse.json({ error: error.message }, { status: 500 });
+  }
+
+  if (!row || row.similar_ids.length === 0) {
+    return NextResponse.json([]);
+  }
+
+  const { data: careers } = await supabase
+    .from("careers")
+    .select("*")
+    .in("id", row.similar_ids);
+
+  const byId = new Map((careers || []).map((c: Career) => [c.id, c]));
+  const similar: SimilarCareer[] = [];
+  row.similar_ids.forEach((similarId: string, i: number) => {
+    const career = byId.get(similarId);
+    if (!career) return;
+    similar.push({
+      id: career.id,
+      title: career.title,
+      category: career.category,
+      salary_median: career.salary_median,
+      growth_rate_numeric: career.growth_rate_numeric,
+      market_health_score: calculateHealthScore(career),
+      score: row.scores[i],
+    });
+  });
+
+  return NextResponse.json(similar);
+}
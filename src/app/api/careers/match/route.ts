@@ -0,0 +1,102 @@
+import { NextRequest, NextResponse } from "next/server";
+import { supabase } from "@/lib/supabase";
+import { CareerMatch, TermField } from "@/lib/types";
+import { normalizeTerm } from "@/lib/utils";
+
+/** Points per matched term at posting weight 1.0 (same scale as scoreCareer). */
+const FIELD_WEIGHTS: Record<TermField, number> = {
+  majors: 25,
+  interests: 20,
+  work_style: 10,
+  industries: 10,
+};
+
+/** Careers open to any major match every major at this fraction of the weight. */
+const ANY_MAJOR_WEIGHT = 0.5;
+
+const DEFAULT_LIMIT = 20;
+const MAX_LIMIT = 100;
+
+const PARAMS: Record<string, TermField> = {
+  major: "majors",
+  interests: "interests",
+  workStyle: "work_style",
+  industries: "industries",
+};
+
+/**
+ * Candidate careers for a profile from the precomputed inverted index:
+ * ?major=CS&interests=technology,arts&workStyle=analytical&industries=fintech
+ */
+export async function GET(request: NextRequest) {
+  const { searchParams } = request.nextUrl;
+  const requested = parseInt(searchParams.get("limit") || "", 10);
+  const limit = Number.isNaN(requested)
+    ? DEFAULT_LIMIT
+    : Math.min(Math.max(requested, 1), MAX_LIMIT);
+
+  const inputs: { field: TermField; alias: string }[] = [];
+  for (const [param, field] of Object.entries(PARAMS)) {
+    for (const value of (searchParams.get(param) || "").split(",")) {
+      const alias = normalizeTerm(value);
+      if (alias) inputs.push({ field, alias });
+    }
+  }
+
+  if (inputs.length === 0) {
+    return NextResponse.json(
+      { error: "At least one of major, interests, workStyle or industries is required" },
+      { status: 400 }
+    );
+  }
+
+  // 1. Resolve aliases ("cs", "comp sci") to canonical terms
+  const { data: aliasRows, error: aliasError } = await supabase
+    .from("term_aliases")
+    .select("field, alias, terms")
+    .in("alias", [...new Set(inputs.map((i) => i.alias))]);
+
+  if (aliasError) {
+    return NextResponse.json({ error: aliasError.message }, { status: 500 });
+  }
+
+  const wanted = new Map<string, { field: TermField; term: string; factor: number }>();
+  for (const { field, alias } of inputs) {
+    const row = (aliasRows || []).find((r) => r.field === field && r.alias === alias);
+    for (const term of row?.terms ?? []) {
+      wanted.set(`${field}:${term}`, { field, term, factor: 1 });
+    }
+  }
+  if (inputs.some((i) => i.field === "majors")) {
+    wanted.set("majors:Any", { field: "majors", term: "Any", factor: ANY_MAJOR_WEIGHT });
+  }
+
+  // 2. Posting lists for those terms
+  const { data: postings, error } = await supabase
+    .from("career_terms")
+    .select("field, term, career_ids, weights")
+    .in("term", [...new Set([...wanted.values()].map((w) => w.term))]);
+
+  if (error) {
+    return NextResponse.json({ error: error.message }, { status: 500 });
+  }
+
+  const matches = new Map<string, CareerMatch>();
+  for (const posting of postings || []) {
+    const want = wanted.get(`${posting.field}:${posting.term}`);
+    if (!want) continue;
+    posting.career_ids.forEach((careerId: string, i: number) => {
+      const match = matches.get(careerId) ?? { career_id: careerId, score: 0, matched: {} };
+      match.score += FIELD_WEIGHTS[want.field] * want.factor * posting.weights[i];
+      match.matched[want.field] = [...(match.matched[want.field] ?? []), want.term];
+      matches.set(careerId, match);
+    });
+  }
+
+  const ranked = [...matches.values()]
+    .map((m) => ({ ...m, score: Math.round(m.score * 10) / 10 }))
+    .sort((a, b) => b.score - a.score)
+    .slice(0, limit);
+
+  return NextResponse.json(ranked);
+}
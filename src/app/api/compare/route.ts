@@ -51,6 +51,29 @@ export async function POST(request: NextRequest) {
       }
     }
 
+    // Pre-generated, user-agnostic analysis (data/generate_comparisons.py)
+    if (!regenerate && !userProfile) {
+      const { data: shared } = await supabase
+        .from("shared_comparisons")
+        .select("ai_analysis")
+        .eq("paths_key", sortedPaths.join(","))
+        .maybeSingle();
+
+      if (shared?.ai_analysis) {
+        const { data: careers } = await supabase
+          .from("careers")
+          .select("*")
+          .in("id", pathIds);
+
+        return NextResponse.json({
+          careers: careers || [],
+          aiAnalysis: shared.ai_analysis,
+          cached: true,
+          shared: true,
+        });
+      }
+    }
+
     // Fetch career data
     const { data: careers, error } = await supabase
       .from("careers")
@@ -0,0 +1,29 @@
+import { NextResponse } from "next/server";
+import { supabase } from "@/lib/supabase";
+
+/** All precomputed market aggregates (one row per kind), keyed by kind. */
+export async function GET() {
+  const { data, error } = await supabase
+    .from("market_aggregates")
+    .select("kind, payload, computed_at");
+
+  if (error) {
+    return NextResponse.json({ error: error.message }, { status: 500 });
+  }
+
+  if (!data || data.length === 0) {
+    return NextResponse.json(
+      { error: "Market aggregates not computed yet" },
+      { status: 404 }
+    );
+  }
+
+  const aggregates: Record<string, unknown> = {
+    computed_at: data[0].computed_at,
+  };
+  for (const row of data) {
+    aggregates[row.kind] = row.payload;
+  }
+
+  return NextResponse.json(aggregates);
+}
@@ -0,0 +1,26 @@
+import { NextRequest, NextResponse } from "next/server";
+import { supabase } from "@/lib/supabase";
+
+/** Precomputed growth, volatility and trend features for one career. */
+export async function GET(
+  request: NextRequest,
+  { params }: { params: Promise<{ careerId: string }> }
+) {
+  const { careerId } = await params;
+
+  const { data, error } = await supabase
+    .from("career_trend_features")
+    .select("*")
+    .eq("career_id", careerId)
+    .maybeSingle();
+
+  if (error) {
+    return NextResponse.json({ error: error.message }, { status: 500 });
+  }
+
+  if (!data) {
+    return NextResponse.json({ error: "No trend features for this career" }, { status: 404 });
+  }
+
+  return NextResponse.json(data);
+}
@@ -1,5 +1,7 @@
 import { NextRequest, NextResponse } from "next/server";
 import { supabase } from "@/lib/supabase";
+import { TrendSeries } from "@/lib/types";
+import { unpackSeries } from "@/lib/utils";
 
 export async function GET(
   request: NextRequest,
@@ -7,6 +9,16 @@ export async function GET(
 ) {
   const { careerId } = await params;
 
+  const { data: packed } = await supabase
+    .from("market_trend_series")
+    .select("metric, start_year, series, source")
+    .eq("career_id", careerId);
+
+  if (packed && packed.length > 0) {
+    return NextResponse.json(unpackSeries(careerId, packed as TrendSeries[]));
+  }
+
+  // Databases without migration 006 (or not yet reseeded) still have per-year rows
   const { data, error } = await supabase
     .from("market_trends")
     .select("career_id, date, average_salary, employment_count, source")
@@ -0,0 +1,46 @@
+import { NextRequest, NextResponse } from "next/server";
+import { supabase } from "@/lib/supabase";
+
+/**
+ * Precomputed transition routes (data/transition_graph.py).
+ * ?from=a&to=b returns that pair; ?from=a alone lists every reachable career by cost.
+ */
+export async function GET(request: NextRequest) {
+  const from = request.nextUrl.searchParams.get("from");
+  const to = request.nextUrl.searchParams.get("to");
+
+  if (!from) {
+    return NextResponse.json({ error: "from is required" }, { status: 400 });
+  }
+
+  if (to) {
+    const { data, error } = await supabase
+      .from("career_transitions")
+      .select("from_id, to_id, cost, hops, routes")
+      .eq("from_id", from)
+      .eq("to_id", to)
+      .maybeSingle();
+
+    if (error) {
+      return NextResponse.json({ error: error.message }, { status: 500 });
+    }
+
+    if (!data) {
+      return NextResponse.json({ error: "No route between these careers" }, { status: 404 });
+    }
+
+    return NextResponse.json(data);
+  }
+
+  const { data, error } = await supabase
+    .from("career_transitions")
+    .select("from_id, to_id, cost, hops, routes")
+    .eq("from_id", from)
+    .order("cost", { ascending: true });
+
+  if (error) {
+    return NextResponse.json({ error: error.message }, { status: 500 });
+  }
+
+  return NextResponse.json(data || []);
+}
@@ -1,9 +1,7 @@
 'use client';
 
-import { useEffect, useState } from 'react';
 import { useParams, useRouter } from 'next/navigation';
 import Link from 'next/link';
-import { Career } from '@/lib/types';
 import {
   formatCurrency,
   formatGrowthRate,
@@ -20,7 +18,7 @@ import { SalaryDistributionChart } from '@/components/salary-distribution-chart'
 import { PercentileCalculator } from '@/components/percentile-calculator';
 import { HealthScoreDetail } from '@/components/health-score-badge';
 import { PremiumButton } from '@/components/auth/premium-gate';
-import { useMarketTrends } from '@/hooks/use-market-trends';
+import { useCareerSnapshot } from '@/hooks/use-career-snapshot';
 import { calculateHealthScore } from '@/lib/utils';
 import { Badge } from '@/components/ui/badge';
 import { Button } from '@/components/ui/button';
@@ -46,27 +44,8 @@ import {
 export default function CareerDetailPage() {
   const params = useParams();
   const router = useRouter();
-  const [career, setCareer] = useState<Career | null>(null);
-  const [loading, setLoading] = useState(true);
   const careerId = typeof params.id === 'string' ? params.id : '';
-  const { trends, loading: trendsLoading } = useMarketTrends(careerId);
-
-  useEffect(() => {
-    async function fetchCareer() {
-      try {
-        const res = await fetch(`/api/careers/${params.id}`);
-        if (res.ok) {
-          const data = await res.json();
-          setCareer(data);
-        }
-      } catch {
-        // handle error
-      } finally {
-        setLoading(false);
-      }
-    }
-    fetchCareer();
-  }, [params.id]);
+  const { career, trends, features, related, similar, loading } = useCareerSnapshot(careerId);
 
   if (loading) {
     return (
@@ -103,6 +82,7 @@ export default function CareerDetailPage() {
   const hasTrends = trends.length > 0;
   const description = career.ai_description || career.description;
   const healthScore = career.market_health_score ?? calculateHealthScore(career);
+  const relatedTitles = new Map(related.map((r) => [r.id, r.title]));
 
   return (
     <div className="mx-auto max-w-5xl px-4 py-8 space-y-8">
@@ -226,12 +206,35 @@ export default function CareerDetailPage() {
       </Card>
 
       {/* Historical Market Data */}
-      {!trendsLoading && hasTrends && (
+      {hasTrends && (
         <Card>
           <CardHeader>
             <CardTitle className="text-lg">Historical Market Data</CardTitle>
           </CardHeader>
           <CardContent>
+            {features && (
+              <div className="grid grid-cols-2 md:grid-cols-4 gap-3 mb-4">
+                <MetricCard
+                  label="Wage Growth (10y CAGR)"
+                  value={formatGrowthRate(features.wage_cagr_10y)}
+                  className={growthColor(features.wage_cagr_10y)}
+                />
+                <MetricCard
+                  label="Real Wage Growth (10y)"
+                  value={formatGrowthRate(features.real_wage_cagr_10y)}
+                  className={growthColor(features.real_wage_cagr_10y)}
+                />
+                <MetricCard
+                  label="Employment Growth (10y CAGR)"
+                  value={formatGrowthRate(features.employment_cagr_10y)}
+                  className={growthColor(features.employment_cagr_10y)}
+                />
+                <MetricCard
+                  label="Wage Volatility"
+                  value={features.wage_volatility != null ? `±${features.wage_volatility} pts` : 'N/A'}
+                />
+              </div>
+            )}
             <Tabs defaultValue="salary-history" className="w-full">
               <TabsList className="grid w-full grid-cols-2 max-w-sm">
                 <TabsTrigger value="salary-history" className="text-xs">
@@ -498,9 +501,10 @@ export default function CareerDetailPage() {
                     variant="outline"
                     className="cursor-pointer hover:bg-secondary text-sm py-1 px-3"
                   >
-                    {rp
-                      .replace(/-/g, ' ')
-                      .replace(/\b\w/g, (l) => l.toUpperCase())}
+                    {relatedTitles.get(rp) ??
+                      rp
+                        .replace(/-/g, ' ')
+                        .replace(/\b\w/g, (l) => l.toUpperCase())}
                   </Badge>
                 </Link>
               ))}
@@ -509,6 +513,35 @@ export default function CareerDetailPage() {
         </Card>
       )}
 
+      {/* Similar by Skills */}
+      {similar.length > 0 && (
+        <Card>
+          <CardHeader>
+            <CardTitle className="text-lg">Similar Skill Profiles</CardTitle>
+          </CardHeader>
+          <CardContent>
+            <div className="flex flex-wrap gap-2">
+              {similar.slice(0, 6).map((s) => (
+                <Link key={s.id} href={`/careers/${s.id}`}>
+                  <Badge
+                    variant="outline"
+                    className="cursor-pointer hover:bg-secondary text-sm py-1 px-3 gap-1"
+                  >
+                    {s.title}
+                    <span className="text-muted-foreground">
+                      {Math.round(s.score * 100)}%
+                    </span>
+                  </Badge>
+                </Link>
+              ))}
+            </div>
+            <p className="text-xs text-muted-foreground mt-3">
+              Based on O*NET skill importance ratings
+            </p>
+          </CardContent>
+        </Card>
+      )}
+
       {/* CTA Buttons */}
       <Separator />
       <div className="flex flex-wrap gap-3">
@@ -1,6 +1,6 @@
 "use client";
 
-import { useCareers } from "@/hooks/use-careers";
+import { useMarketAggregates } from "@/hooks/use-market-aggregates";
 import { GrowthChart } from "@/components/growth-chart";
 import { SalaryRangeChart } from "@/components/salary-range-chart";
 import { CategoryChart } from "@/components/category-chart";
@@ -12,54 +12,7 @@ import { BarChart3, TrendingUp, DollarSign, Users, Briefcase, Target } from "luc
 import { formatCompactCurrency, formatCompactNumber } from "@/lib/utils";
 
 export default function InsightsPage() {
-  const { careers, loading } = useCareers();
-
-  const avgMedian =
-    careers.length > 0
-      ? Math.round(
-          careers.reduce((sum, c) => sum + (c.salary_median || 0), 0) /
-            careers.length
-        )
-      : 0;
-
-  const totalEmployment = careers.reduce(
-    (sum, c) => sum + (c.employment_total || 0),
-    0
-  );
-
-  const totalOpenings = careers.reduce(
-    (sum, c) => sum + (c.current_openings || 0),
-    0
-  );
-
-  const avgGrowth =
-    careers.length > 0
-      ? (
-          careers.reduce(
-            (sum, c) => sum + (c.growth_rate_numeric || 0),
-            0
-          ) / careers.length
-        ).toFixed(1)
-      : "0";
-
-  const categoryAvgs = Object.entries(
-    careers.reduce<Record<string, { sum: number; count: number }>>(
-      (acc, c) => {
-        const cat = c.category;
-        if (!acc[cat]) acc[cat] = { sum: 0, count: 0 };
-        acc[cat].sum += c.salary_median || 0;
-        acc[cat].count += 1;
-        return acc;
-      },
-      {}
-    )
-  )
-    .map(([cat, { sum, count }]) => ({
-      category: cat,
-      avgSalary: Math.round(sum / count),
-      count,
-    }))
-    .sort((a, b) => b.avgSalary - a.avgSalary);
+  const { aggregates, loading } = useMarketAggregates();
 
   if (loading) {
     return (
@@ -76,6 +29,19 @@ export default function InsightsPage() {
     );
   }
 
+  if (!aggregates) {
+    return (
+      <div className="mx-auto max-w-7xl px-4 py-8">
+        <h1 className="text-3xl font-bold tracking-tight">Market Insights</h1>
+        <p className="text-muted-foreground mt-1">
+          Market aggregates are not available yet. Run the data pipeline to compute them.
+        </p>
+      </div>
+    );
+  }
+
+  const { overall, categories, quadrants } = aggregates;
+
   return (
     <div className="mx-auto max-w-7xl px-4 py-8 space-y-8">
       <div>
@@ -90,22 +56,22 @@ export default function InsightsPage() {
         <StatCard
           icon={DollarSign}
           label="Avg Median Salary"
-          value={formatCompactCurrency(avgMedian)}
+          value={formatCompactCurrency(overall.avg_salary_median ?? 0)}
         />
         <StatCard
           icon={Users}
           label="Total Employment"
-          value={formatCompactNumber(totalEmployment)}
+          value={formatCompactNumber(overall.total_employment)}
         />
         <StatCard
           icon={Briefcase}
           label="Total Openings"
-          value={formatCompactNumber(totalOpenings)}
+          value={formatCompactNumber(overall.total_openings)}
         />
         <StatCard
           icon={TrendingUp}
           label="Avg Growth Rate"
-          value={`${avgGrowth}%`}
+          value={`${(overall.avg_growth ?? 0).toFixed(1)}%`}
         />
       </div>
 
@@ -118,7 +84,7 @@ export default function InsightsPage() {
         </CardHeader>
         <CardContent>
           <div className="grid grid-cols-1 sm:grid-cols-2 md:grid-cols-3 gap-3">
-            {categoryAvgs.map((c) => (
+            {categories.map((c) => (
               <div
                 key={c.category}
                 className="flex items-center justify-between rounded-lg border p-3"
@@ -132,7 +98,7 @@ export default function InsightsPage() {
                   </p>
                 </div>
                 <p className="text-lg font-bold">
-                  {formatCompactCurrency(c.avgSalary)}
+                  {formatCompactCurrency(c.avg_salary ?? 0)}
                 </p>
               </div>
             ))}
@@ -169,25 +135,25 @@ export default function InsightsPage() {
               <p className="text-xs text-muted-foreground mb-2">
                 Career paths plotted by salary vs job openings. Bubble size = growth rate.
               </p>
-              <SweetSpotChart careers={careers} />
+              <SweetSpotChart careers={quadrants.points} />
             </TabsContent>
             <TabsContent value="growth" className="mt-4">
               <p className="text-xs text-muted-foreground mb-2">
                 Top 15 careers by projected 10-year growth rate (BLS 2023-2033)
               </p>
-              <GrowthChart careers={careers} />
+              <GrowthChart careers={aggregates.growth_leaders} />
             </TabsContent>
             <TabsContent value="salary" className="mt-4">
               <p className="text-xs text-muted-foreground mb-2">
                 Top 15 careers by median annual salary (BLS OEWS 2024)
               </p>
-              <SalaryRangeChart careers={careers} />
+              <SalaryRangeChart careers={aggregates.salary_leaders} />
             </TabsContent>
             <TabsContent value="category" className="mt-4">
               <p className="text-xs text-muted-foreground mb-2">
                 Distribution of career paths by industry category
               </p>
-              <CategoryChart careers={careers} />
+              <CategoryChart categories={categories} />
             </TabsContent>
           </Tabs>
         </CardContent>
@@ -8,10 +8,10 @@ import {
   ResponsiveContainer,
   Legend,
 } from "recharts";
-import { Career } from "@/lib/types";
+import { CategoryAggregate } from "@/lib/types";
 
 interface CategoryChartProps {
-  careers: Career[];
+  categories: Pick<CategoryAggregate, "category" | "count">[];
 }
 
 const CATEGORY_COLORS: Record<string, string> = {
@@ -38,14 +38,9 @@ const CATEGORY_LABELS: Record<string, string> = {
   alternative: "Alternative",
 };
 
-export function CategoryChart({ careers }: CategoryChartProps) {
-  const counts: Record<string, number> = {};
-  careers.forEach((c) => {
-    counts[c.category] = (counts[c.category] || 0) + 1;
-  });
-
-  const data = Object.entries(counts)
-    .map(([category, count]) => ({
+export function CategoryChart({ categories }: CategoryChartProps) {
+  const data = categories
+    .map(({ category, count }) => ({
       name: CATEGORY_LABELS[category] || category,
       value: count,
       category,
@@ -14,7 +14,7 @@ import {
 import { Career } from "@/lib/types";
 
 interface GrowthChartProps {
-  careers: Career[];
+  careers: Pick<Career, "title" | "growth_rate_numeric" | "current_openings" | "category">[];
 }
 
 function CustomTooltip({ active, payload }: {
@@ -1,7 +1,9 @@
 "use client";
 
 import { Career, UserProfile } from "@/lib/types";
-import { getRecommendations } from "@/lib/recommendations";
+import { getRecommendations, getScoredRecommendations } from "@/lib/recommendations";
+import { useUserRecommendations } from "@/hooks/use-user-recommendations";
+import { useCareerMatches } from "@/hooks/use-career-matches";
 import { CareerCard } from "@/components/career-card";
 import { Sparkles } from "lucide-react";
 
@@ -16,7 +18,16 @@ export function RecommendedCareers({
   profile,
   onCompare,
 }: RecommendedCareersProps) {
-  const recommendations = getRecommendations(careers, profile, 3);
+  const scored = useUserRecommendations(profile);
+  const { matches, loading } = useCareerMatches(profile);
+
+  // Wait for the index so the list does not reorder once its boosts arrive
+  if (!scored && loading) return null;
+
+  // Batch scores first; otherwise rank every career, boosted by its index match
+  const recommendations = scored
+    ? getScoredRecommendations(careers, profile, scored, 3)
+    : getRecommendations(careers, profile, 3, matches);
 
   if (recommendations.length === 0) return null;
 
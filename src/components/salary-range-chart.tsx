@@ -15,7 +15,10 @@ import { Career } from "@/lib/types";
 import { formatCompactCurrency, formatCurrency } from "@/lib/utils";
 
 interface SalaryRangeChartProps {
-  careers: Career[];
+  careers: Pick<
+    Career,
+    "title" | "category" | "salary_entry" | "salary_median" | "salary_p90" | "salary_year10"
+  >[];
 }
 
 function CustomTooltip({ active, payload }: {
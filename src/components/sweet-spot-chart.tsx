@@ -1,6 +1,6 @@
 "use client";
 
-import { Career } from "@/lib/types";
+import { Career, Quadrant } from "@/lib/types";
 import { formatCurrency, formatCompactNumber } from "@/lib/utils";
 import { getCategoryColor } from "@/lib/constants";
 import {
@@ -15,10 +15,22 @@ import {
   Cell,
 } from "recharts";
 
+type SweetSpotCareer = Pick<
+  Career,
+  "id" | "title" | "category" | "salary_median" | "current_openings" | "growth_rate_numeric" | "market_health_score"
+> & { quadrant?: Quadrant | null };
+
 interface SweetSpotChartProps {
-  careers: Career[];
+  careers: SweetSpotCareer[];
 }
 
+const QUADRANT_LABELS: Record<Quadrant, string> = {
+  "sweet-spot": "Sweet spot (above-median pay and growth)",
+  "high-pay": "High pay, slower growth",
+  rising: "Fast growth, lower pay",
+  lagging: "Below-median pay and growth",
+};
+
 const CATEGORY_FILL: Record<string, string> = {
   tech: "hsl(221, 83%, 53%)",
   business: "hsl(160, 60%, 45%)",
@@ -39,6 +51,7 @@ interface DataPoint {
   growth: number;
   category: string;
   healthScore: number;
+  quadrant?: Quadrant;
 }
 
 function CustomTooltip({
@@ -66,6 +79,7 @@ function CustomTooltip({
         <p>
           Health: <span className="font-medium text-foreground">{d.healthScore}/100</span>
         </p>
+        {d.quadrant && <p>{QUADRANT_LABELS[d.quadrant]}</p>}
       </div>
     </div>
   );
@@ -82,6 +96,7 @@ export function SweetSpotChart({ careers }: SweetSpotChartProps) {
       growth: c.growth_rate_numeric ?? 0,
       category: c.category,
       healthScore: c.market_health_score ?? 0,
+      quadrant: c.quadrant ?? undefined,
     }));
 
   const categories = [...new Set(data.map((d) => d.category))];
@@ -0,0 +1,50 @@
+"use client";
+
+import { useState, useEffect } from "react";
+import { CareerMatch, UserProfile } from "@/lib/types";
+
+/**
+ * Term index matches for a profile (/api/careers/match); matches is null when
+ * the profile has no major or interests, or the request failed.
+ */
+export function useCareerMatches(profile: UserProfile, limit = 50) {
+  const [matches, setMatches] = useState<CareerMatch[] | null>(null);
+  const [loading, setLoading] = useState(true);
+
+  const major = profile.major;
+  const interests = profile.interests.join(",");
+
+  useEffect(() => {
+    if (!major && !interests) {
+      setMatches(null);
+      setLoading(false);
+      return;
+    }
+
+    let cancelled = false;
+
+    async function fetchMatches() {
+      setLoading(true);
+      const params = new URLSearchParams({ limit: String(limit) });
+      if (major) params.set("major", major);
+      if (interests) params.set("interests", interests);
+      try {
+        const res = await fetch(`/api/careers/match?${params}`);
+        if (!res.ok) throw new Error("Failed to fetch career matches");
+        const data: CareerMatch[] = await res.json();
+        if (!cancelled) setMatches(data);
+      } catch {
+        if (!cancelled) setMatches(null);
+      } finally {
+        if (!cancelled) setLoading(false);
+      }
+    }
+
+    fetchMatches();
+    return () => {
+      cancelled = true;
+    };
+  }, [major, interests, limit]);
+
+  return { matches, loading };
+}
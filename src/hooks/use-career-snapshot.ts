@@ -0,0 +1,56 @@
+"use client";
+
+import { useState, useEffect } from "react";
+import { Career, CareerSnapshot, MarketTrend, SimilarCareer } from "@/lib/types";
+import { fetchCareerSnapshot } from "@/lib/snapshots";
+import { unpackSeries } from "@/lib/utils";
+
+async function fetchJson<T>(url: string): Promise<T | null> {
+  try {
+    const res = await fetch(url);
+    return res.ok ? await res.json() : null;
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * Everything the career detail page shows. Reads the static snapshot bundle
+ * when one is published and falls back to the API routes otherwise.
+ */
+export function useCareerSnapshot(careerId: string) {
+  const [career, setCareer] = useState<Career | null>(null);
+  const [trends, setTrends] = useState<MarketTrend[]>([]);
+  const [features, setFeatures] = useState<CareerSnapshot["features"]>(null);
+  const [related, setRelated] = useState<CareerSnapshot["related"]>([]);
+  const [similar, setSimilar] = useState<SimilarCareer[]>([]);
+  const [loading, setLoading] = useState(true);
+
+  useEffect(() => {
+    async function load() {
+      const snapshot = await fetchCareerSnapshot(careerId);
+      if (snapshot) {
+        setCareer(snapshot.career);
+        setTrends(unpackSeries(careerId, snapshot.trends));
+        setFeatures(snapshot.features);
+        setRelated(snapshot.related);
+        setSimilar(snapshot.similar ?? []);
+      } else {
+        const [careerData, trendData, featureData, similarData] = await Promise.all([
+          fetchJson<Career>(`/api/careers/${careerId}`),
+          fetchJson<MarketTrend[]>(`/api/market-trends/${careerId}`),
+          fetchJson<CareerSnapshot["features"]>(`/api/market-trends/${careerId}/features`),
+          fetchJson<SimilarCareer[]>(`/api/careers/${careerId}/similar`),
+        ]);
+        setCareer(careerData);
+        setTrends(trendData || []);
+        setFeatures(featureData);
+        setSimilar(similarData || []);
+      }
+      setLoading(false);
+    }
+    load();
+  }, [careerId]);
+
+  return { career, trends, features, related, similar, loading };
+}
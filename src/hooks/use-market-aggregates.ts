@@ -0,0 +1,27 @@
+"use client";
+
+import { useState, useEffect } from "react";
+import { MarketAggregates } from "@/lib/types";
+
+export function useMarketAggregates() {
+  const [aggregates, setAggregates] = useState<MarketAggregates | null>(null);
+  const [loading, setLoading] = useState(true);
+  const [error, setError] = useState<string | null>(null);
+
+  useEffect(() => {
+    async function fetchAggregates() {
+      try {
+        const res = await fetch("/api/market-aggregates");
+        if (!res.ok) throw new Error("Failed to fetch market aggregates");
+        setAggregates(await res.json());
+      } catch (e) {
+        setError(e instanceof Error ? e.message : "Unknown error");
+      } finally {
+        setLoading(false);
+      }
+    }
+    fetchAggregates();
+  }, []);
+
+  return { aggregates, loading, error };
+}
@@ -0,0 +1,53 @@
+"use client";
+
+import { useState, useEffect } from "react";
+import { UserProfile, UserRecommendations } from "@/lib/types";
+import { useAuth } from "@/lib/auth-context";
+
+/**
+ * The signed-in user's batch-scored recommendations, or null when there are
+ * none or they were scored from an older version of the profile.
+ */
+export function useUserRecommendations(profile: UserProfile) {
+  const { user, isAuthenticated, supabase } = useAuth();
+  const [recommendations, setRecommendations] = useState<UserRecommendations | null>(null);
+
+  useEffect(() => {
+    if (!isAuthenticated || !user) {
+      setRecommendations(null);
+      return;
+    }
+
+    let cancelled = false;
+
+    async function load() {
+      const [{ data: scored }, { data: saved }] = await Promise.all([
+        supabase
+          .from("user_recommendations")
+          .select("career_ids, scores, profile_updated_at")
+          .eq("user_id", user!.id)
+          .maybeSingle(),
+        supabase
+          .from("user_profiles")
+          .select("updated_at")
+          .eq("id", user!.id)
+          .maybeSingle(),
+      ]);
+
+      if (cancelled) return;
+
+      const fresh =
+        scored?.profile_updated_at &&
+        saved?.updated_at &&
+        new Date(scored.profile_updated_at).getTime() >= new Date(saved.updated_at).getTime();
+      setRecommendations(fresh ? (scored as UserRecommendations) : null);
+    }
+
+    load();
+    return () => {
+      cancelled = true;
+    };
+  }, [isAuthenticated, user, supabase, profile]);
+
+  return recommendations;
+}
@@ -1,4 +1,4 @@
-import { Career, UserProfile } from "./types";
+import { Career, CareerMatch, UserProfile, UserRecommendations } from "./types";
 
 /** Maps user interest selections to career categories. */
 const INTEREST_TO_CATEGORIES: Record<string, string[]> = {
@@ -14,8 +14,18 @@ const INTEREST_TO_CATEGORIES: Record<string, string[]> = {
   entrepreneurship: ["business", "tech", "alternative"],
 };
 
-/** Score a career against a user profile (0-100). */
-export function scoreCareer(career: Career, profile: UserProfile): number {
+/** Most points a term index match (/api/careers/match) adds to a career's score. */
+const MATCH_BOOST = 15;
+
+/** Index match score that earns the full boost: a major plus one interest term. */
+const FULL_MATCH_SCORE = 45;
+
+/**
+ * Score a career against a user profile (0-100). `matchScore` is the career's
+ * term index score, if any; it adds to the score without excluding careers
+ * the index did not match.
+ */
+export function scoreCareer(career: Career, profile: UserProfile, matchScore = 0): number {
   let score = 0;
 
   // --- Interest → category match (0-40) ---
@@ -52,6 +62,9 @@ export function scoreCareer(career: Career, profile: UserProfile): number {
   // --- Trending bonus (0-5) ---
   if (career.is_trending) score += 5;
 
+  // --- Term index boost (0-15) ---
+  score += Math.round(Math.min(matchScore / FULL_MATCH_SCORE, 1) * MATCH_BOOST);
+
   return Math.min(score, 100);
 }
 
@@ -74,39 +87,75 @@ export interface ScoredCareer {
   matchReasons: string[];
 }
 
-/** Return top-N recommended careers for a user, with match reasons. */
+/** Why a career suits a profile, for display next to the card. */
+function matchReasons(career: Career, profile: UserProfile): string[] {
+  const reasons: string[] = [];
+
+  const matchedCategories = new Set(
+    profile.interests.flatMap((i) => INTEREST_TO_CATEGORIES[i] || [])
+  );
+  if (matchedCategories.has(career.category))
+    reasons.push("Matches your interests");
+  if (
+    profile.major &&
+    career.preferred_majors.some(
+      (m) =>
+        m.toLowerCase().includes(profile.major.toLowerCase()) ||
+        profile.major.toLowerCase().includes(m.toLowerCase())
+    )
+  )
+    reasons.push("Fits your major");
+  if (career.is_trending) reasons.push("Trending");
+
+  return reasons;
+}
+
+/** Return top-N recommended careers for a user, with match reasons; `matches` boost their careers. */
 export function getRecommendations(
   careers: Career[],
   profile: UserProfile,
-  limit = 6
+  limit = 6,
+  matches: CareerMatch[] | null = null
 ): ScoredCareer[] {
   const minScore = minScoreForYear(profile.year);
+  const matchScores = new Map(matches?.map((m) => [m.career_id, m.score]));
 
-  const scored: ScoredCareer[] = careers.map((career) => {
-    const score = scoreCareer(career, profile);
-    const reasons: string[] = [];
-
-    const matchedCategories = new Set(
-      profile.interests.flatMap((i) => INTEREST_TO_CATEGORIES[i] || [])
-    );
-    if (matchedCategories.has(career.category))
-      reasons.push("Matches your interests");
-    if (
-      profile.major &&
-      career.preferred_majors.some(
-        (m) =>
-          m.toLowerCase().includes(profile.major.toLowerCase()) ||
-          profile.major.toLowerCase().includes(m.toLowerCase())
-      )
-    )
-      reasons.push("Fits your major");
-    if (career.is_trending) reasons.push("Trending");
-
-    return { career, score, matchReasons: reasons };
-  });
+  const scored: ScoredCareer[] = careers.map((career) => ({
+    career,
+    score: scoreCareer(career, profile, matchScores.get(career.id)),
+    matchReasons: matchReasons(career, profile),
+  }));
 
   return scored
     .filter((s) => s.score >= minScore)
     .sort((a, b) => b.score - a.score)
     .slice(0, limit);
 }
+
+/**
+ * Top-N careers from the batch-scored user_recommendations row, with match reasons.
+ *
+ * The batch job (data/profile_recommendations.py) uses a different model from
+ * scoreCareer: RIASEC interest overlap, term index major weights and the
+ * profile's values against salary/growth percentiles, layoff risk and remote
+ * options. Its top careers intentionally differ from the in-browser fallback,
+ * which has no values data. Both are 0-100 and share the year threshold.
+ */
+export function getScoredRecommendations(
+  careers: Career[],
+  profile: UserProfile,
+  recommendations: UserRecommendations,
+  limit = 6
+): ScoredCareer[] {
+  const minScore = minScoreForYear(profile.year);
+  const byId = new Map(careers.map((c) => [c.id, c]));
+  return recommendations.career_ids
+    .map((id, i) => ({ career: byId.get(id), score: recommendations.scores[i] }))
+    .filter((s): s is { career: Career; score: number } => !!s.career && s.score >= minScore)
+    .slice(0, limit)
+    .map(({ career, score }) => ({
+      career,
+      score: Math.round(score),
+      matchReasons: matchReasons(career, profile),
+    }));
+}
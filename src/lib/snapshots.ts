@@ -0,0 +1,30 @@
+import { CareerSnapshot, SnapshotManifest } from "./types";
+
+/** Where data/snapshot_bundles.py writes (public/snapshots, served at the site root). */
+const SNAPSHOT_ROOT = "/snapshots";
+
+let manifestRequest: Promise<SnapshotManifest | null> | null = null;
+
+/** The current manifest, fetched once per page load (null when not published). */
+export function loadSnapshotManifest(): Promise<SnapshotManifest | null> {
+  if (!manifestRequest) {
+    manifestRequest = fetch(`${SNAPSHOT_ROOT}/manifest.json`)
+      .then((res) => (res.ok ? res.json() : null))
+      .catch(() => null);
+  }
+  return manifestRequest;
+}
+
+/** A career's static bundle, or null when there is no snapshot for it. */
+export async function fetchCareerSnapshot(careerId: string): Promise<CareerSnapshot | null> {
+  const manifest = await loadSnapshotManifest();
+  const entry = manifest?.bundles[`careers/${careerId}`];
+  if (!entry) return null;
+  try {
+    // Hashed file names never change, so the browser and CDN can cache them forever
+    const res = await fetch(`${SNAPSHOT_ROOT}/${entry.path}`);
+    return res.ok ? await res.json() : null;
+  } catch {
+    return null;
+  }
+}
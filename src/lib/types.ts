@@ -98,6 +98,157 @@ export interface MarketTrend {
   source: string | null;
 }
 
+/** Precomputed by the data pipeline (data/trend_features.py); rates in %. */
+export interface TrendFeatures {
+  career_id: string;
+  soc_code: string;
+  wage_cagr_5y: number | null;
+  wage_cagr_10y: number | null;
+  employment_cagr_5y: number | null;
+  employment_cagr_10y: number | null;
+  wage_yoy: number | null;
+  employment_yoy: number | null;
+  wage_volatility: number | null;
+  employment_volatility: number | null;
+  real_wage_cagr_5y: number | null;
+  real_wage_cagr_10y: number | null;
+  wage_trend: number | null;
+  employment_trend: number | null;
+  first_year: number | null;
+  last_year: number | null;
+  computed_at: string | null;
+}
+
+/** One metric's yearly values from start_year on (market_trend_series rows). */
+export interface TrendSeries {
+  metric: "average_salary" | "employment_count" | "openings_count";
+  start_year: number;
+  series: (number | null)[];
+  source: string | null;
+}
+
+export type RelatedCareer = Pick<
+  Career,
+  "id" | "title" | "category" | "salary_median" | "growth_rate_numeric" | "market_health_score"
+>;
+
+/** Cosine similarity of O*NET skill vectors (data/skill_similarity.py); score in [-1, 1]. */
+export type SimilarCareer = RelatedCareer & { score: number };
+
+/** Precomputed by the data pipeline (data/transition_graph.py); lower cost = easier move. */
+export interface TransitionRoute {
+  path: string[];
+  cost: number;
+}
+
+export interface CareerTransition {
+  from_id: string;
+  to_id: string;
+  cost: number;
+  hops: number;
+  routes: TransitionRoute[];
+}
+
+export type TermField = "majors" | "interests" | "work_style" | "industries";
+
+/** Candidate from the inverted term index (data/term_index.py). */
+export interface CareerMatch {
+  career_id: string;
+  score: number;
+  matched: Partial<Record<TermField, string[]>>;
+}
+
+/** A user's top careers, best first, batch-scored by data/profile_recommendations.py. */
+export interface UserRecommendations {
+  career_ids: string[];
+  scores: number[];
+  profile_updated_at: string | null;
+}
+
+/** Static per-career bundle written by data/snapshot_bundles.py. */
+export interface CareerSnapshot {
+  career: Career;
+  trends: TrendSeries[];
+  features: Omit<TrendFeatures, "computed_at"> | null;
+  related: RelatedCareer[];
+  similar: SimilarCareer[];
+}
+
+export interface SnapshotManifest {
+  version: string;
+  generated_at: string;
+  encodings: string[];
+  bundles: Record<
+    string,
+    { path: string; sha256: string; bytes: number; encodings: Record<string, number> }
+  >;
+}
+
+/** Precomputed by the data pipeline (data/market_aggregates.py). */
+export interface Quartiles {
+  p25: number | null;
+  median: number | null;
+  p75: number | null;
+}
+
+export interface CategoryAggregate {
+  category: Category;
+  count: number;
+  avg_salary: number | null;
+  avg_growth: number | null;
+  salary: Quartiles;
+  growth: Quartiles;
+  employment: number | null;
+  openings: number | null;
+  growth_leader: { id: string; title: string; growth_rate_numeric: number | null } | null;
+}
+
+export type LeaderCareer = Pick<
+  Career,
+  | "id"
+  | "title"
+  | "category"
+  | "salary_entry"
+  | "salary_median"
+  | "salary_p90"
+  | "salary_year10"
+  | "growth_rate_numeric"
+  | "current_openings"
+>;
+
+export type Quadrant = "sweet-spot" | "high-pay" | "rising" | "lagging";
+
+export type QuadrantPoint = Pick<
+  Career,
+  "id" | "title" | "category" | "salary_median" | "growth_rate_numeric" | "current_openings"
+> & {
+  market_health_score: number;
+  /** null when the career has no salary or growth figure */
+  quadrant: Quadrant | null;
+};
+
+export interface MarketAggregates {
+  overall: {
+    careers: number;
+    avg_salary_median: number | null;
+    total_employment: number | null;
+    total_openings: number | null;
+    avg_growth: number | null;
+    salary: Quartiles;
+    growth: Quartiles;
+  };
+  categories: CategoryAggregate[];
+  growth_leaders: LeaderCareer[];
+  salary_leaders: LeaderCareer[];
+  quadrants: {
+    salary_split: number | null;
+    growth_split: number | null;
+    counts: Record<Quadrant, number>;
+    points: QuadrantPoint[];
+  };
+  computed_at: string | null;
+}
+
 export interface UserProfile {
   name: string;
   year: string;
@@ -1,6 +1,6 @@
 import { clsx, type ClassValue } from "clsx"
 import { twMerge } from "tailwind-merge"
-import { Career } from "./types"
+import { Career, MarketTrend, TrendSeries } from "./types"
 
 export function cn(...inputs: ClassValue[]) {
   return twMerge(clsx(inputs))
@@ -126,3 +126,37 @@ export function interpolateSalary(
   }
   return null;
 }
+
+/** Expand packed series (one row per metric) into one MarketTrend per year. */
+export function unpackSeries(careerId: string, rows: TrendSeries[]): MarketTrend[] {
+  const byYear = new Map<number, MarketTrend>();
+  for (const row of rows) {
+    const metric = row.metric;
+    if (metric === "openings_count") continue;
+    for (let i = 0; i < row.series.length; i++) {
+      const value = row.series[i];
+      if (value == null) continue;
+      const year = row.start_year + i;
+      const trend = byYear.get(year) ?? {
+        career_id: careerId,
+        date: `${year}-05-01`,
+        average_salary: null,
+        employment_count: null,
+        source: row.source,
+      };
+      trend[metric] = value;
+      byYear.set(year, trend);
+    }
+  }
+  return [...byYear.values()].sort((a, b) => a.date.localeCompare(b.date));
+}
+
+/** Vocabulary lookup key; must match normalize_term in data/term_index.py. */
+export function normalizeTerm(value: string): string {
+  return value
+    .toLowerCase()
+    .replace(/&/g, " and ")
+    .replace(/[.'\u2019]/g, "")
+    .replace(/[^a-z0-9+]+/g, " ")
+    .trim();
+}
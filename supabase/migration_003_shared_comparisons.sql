@@ -0,0 +1,24 @@
+-- PathIQ Migration 003: Shared (user-agnostic) AI comparisons
+-- Run this in Supabase SQL Editor if you already have existing tables.
+-- If setting up from scratch, just run schema.sql instead.
+--
+-- Filled by data/generate_comparisons.py. The compare API reads it when a
+-- request has no per-user cached analysis and no student profile.
+
+-- 1. Shared comparisons, keyed by the sorted career ids joined with ','
+CREATE TABLE IF NOT EXISTS shared_comparisons (
+  paths_key TEXT PRIMARY KEY,
+  paths_compared TEXT[] NOT NULL,
+  ai_analysis TEXT NOT NULL,
+  career_digests JSONB NOT NULL,
+  model TEXT,
+  generated_at TIMESTAMPTZ DEFAULT now()
+);
+
+-- 2. Public read; only the service role writes
+ALTER TABLE shared_comparisons ENABLE ROW LEVEL SECURITY;
+
+DO $$ BEGIN
+  CREATE POLICY "Public read shared comparisons" ON shared_comparisons FOR SELECT USING (true);
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
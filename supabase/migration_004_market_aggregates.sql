@@ -0,0 +1,23 @@
+-- PathIQ Migration 004: Precomputed market aggregates
+-- Run this in Supabase SQL Editor if you already have existing tables.
+-- If setting up from scratch, just run schema.sql instead.
+--
+-- Filled by the data pipeline's seed_aggregates stage (data/market_aggregates.py).
+-- The insights page reads every row in one query instead of recomputing
+-- rankings and category breakdowns from the careers table.
+
+-- 1. One row per aggregate kind (overall, categories, growth_leaders,
+--    salary_leaders, quadrants)
+CREATE TABLE IF NOT EXISTS market_aggregates (
+  kind TEXT PRIMARY KEY,
+  payload JSONB NOT NULL,
+  computed_at TIMESTAMPTZ DEFAULT now()
+);
+
+-- 2. Public read; only the service role writes
+ALTER TABLE market_aggregates ENABLE ROW LEVEL SECURITY;
+
+DO $$ BEGIN
+  CREATE POLICY "Public read market aggregates" ON market_aggregates FOR SELECT USING (true);
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
@@ -0,0 +1,36 @@
+-- PathIQ Migration 005: Precomputed time-series features per career
+-- Run this in Supabase SQL Editor if you already have existing tables.
+-- If setting up from scratch, just run schema.sql instead.
+--
+-- Filled by the data pipeline's seed_trend_features stage
+-- (data/trend_features.py) from the historical BLS series. Growth rates are
+-- percentages; volatility is in percentage points.
+
+-- 1. One row per career
+CREATE TABLE IF NOT EXISTS career_trend_features (
+  career_id TEXT PRIMARY KEY REFERENCES careers(id) ON DELETE CASCADE,
+  soc_code TEXT NOT NULL,
+  wage_cagr_5y NUMERIC(6,2),
+  wage_cagr_10y NUMERIC(6,2),
+  employment_cagr_5y NUMERIC(6,2),
+  employment_cagr_10y NUMERIC(6,2),
+  wage_yoy NUMERIC(6,2),
+  employment_yoy NUMERIC(6,2),
+  wage_volatility NUMERIC(6,2),
+  employment_volatility NUMERIC(6,2),
+  real_wage_cagr_5y NUMERIC(6,2),
+  real_wage_cagr_10y NUMERIC(6,2),
+  wage_trend NUMERIC(6,2),
+  employment_trend NUMERIC(6,2),
+  first_year INTEGER,
+  last_year INTEGER,
+  computed_at TIMESTAMPTZ DEFAULT now()
+);
+
+-- 2. Public read; only the service role writes
+ALTER TABLE career_trend_features ENABLE ROW LEVEL SECURITY;
+
+DO $$ BEGIN
+  CREATE POLICY "Public read trend features" ON career_trend_features FOR SELECT USING (true);
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
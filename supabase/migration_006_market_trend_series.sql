@@ -0,0 +1,57 @@
+-- PathIQ Migration 006: Packed market trend series
+-- Run this in Supabase SQL Editor if you already have existing tables.
+-- If setting up from scratch, just run schema.sql instead.
+--
+-- market_trends holds one row per (career, year). market_trend_series packs
+-- each career's history into one row per metric: series[i] is the value for
+-- start_year + i (May OES estimates; NULL = no value that year). The pipeline's
+-- seed_market_trends stage writes it in bulk and /api/market-trends reads one
+-- row per metric. market_trends is kept for existing readers but no longer
+-- written by the pipeline.
+
+-- 1. One row per career and metric (metric = the market_trends column name)
+CREATE TABLE IF NOT EXISTS market_trend_series (
+  career_id TEXT REFERENCES careers(id) ON DELETE CASCADE,
+  metric TEXT NOT NULL CHECK (metric IN ('average_salary', 'employment_count', 'openings_count')),
+  start_year INTEGER NOT NULL,
+  series INTEGER[] NOT NULL,
+  source TEXT,
+  updated_at TIMESTAMPTZ DEFAULT now(),
+  PRIMARY KEY (career_id, metric)
+);
+
+-- 2. Public read; only the service role writes
+ALTER TABLE market_trend_series ENABLE ROW LEVEL SECURITY;
+
+DO $$ BEGIN
+  CREATE POLICY "Public read trend series" ON market_trend_series FOR SELECT USING (true);
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+-- 3. Backfill from market_trends (safe to re-run; existing series are kept)
+WITH long AS (
+  SELECT t.career_id, EXTRACT(YEAR FROM t.date)::INTEGER AS year, t.source, m.metric,
+         CASE m.metric
+           WHEN 'average_salary' THEN t.average_salary
+           WHEN 'employment_count' THEN t.employment_count
+           ELSE t.openings_count
+         END AS value
+  FROM market_trends t
+  CROSS JOIN (VALUES ('average_salary'), ('employment_count'), ('openings_count')) AS m(metric)
+),
+bounds AS (
+  SELECT career_id, metric, MIN(year) AS first_year, MAX(year) AS last_year, MAX(source) AS source
+  FROM long
+  WHERE value IS NOT NULL
+  GROUP BY career_id, metric
+)
+INSERT INTO market_trend_series (career_id, metric, start_year, series, source)
+SELECT b.career_id, b.metric, b.first_year,
+       array_agg((SELECT MAX(l.value) FROM long l
+                  WHERE l.career_id = b.career_id AND l.metric = b.metric AND l.year = y.year)
+                 ORDER BY y.year),
+       b.source
+FROM bounds b
+CROSS JOIN LATERAL generate_series(b.first_year, b.last_year) AS y(year)
+GROUP BY b.career_id, b.metric, b.first_year, b.source
+ON CONFLICT (career_id, metric) DO NOTHING;
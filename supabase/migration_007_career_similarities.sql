@@ -0,0 +1,25 @@
+-- PathIQ Migration 007: Skill-vector similarity lists per career
+-- Run this in Supabase SQL Editor if you already have existing tables.
+-- If setting up from scratch, just run schema.sql instead.
+--
+-- Filled by the data pipeline's seed_skill_similarities stage
+-- (data/skill_similarity.py): cosine similarity of O*NET element importance
+-- vectors. similar_ids[i] scores scores[i], best first.
+
+-- 1. One row per career
+CREATE TABLE IF NOT EXISTS career_similarities (
+  career_id TEXT PRIMARY KEY REFERENCES careers(id) ON DELETE CASCADE,
+  similar_ids TEXT[] NOT NULL,
+  scores REAL[] NOT NULL,
+  method TEXT,
+  computed_at TIMESTAMPTZ DEFAULT now(),
+  CHECK (cardinality(similar_ids) = cardinality(scores))
+);
+
+-- 2. Public read; only the service role writes
+ALTER TABLE career_similarities ENABLE ROW LEVEL SECURITY;
+
+DO $$ BEGIN
+  CREATE POLICY "Public read career similarities" ON career_similarities FOR SELECT USING (true);
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
@@ -0,0 +1,27 @@
+-- PathIQ Migration 008: Precomputed career transition routes
+-- Run this in Supabase SQL Editor if you already have existing tables.
+-- If setting up from scratch, just run schema.sql instead.
+--
+-- Filled by the data pipeline's seed_transitions stage
+-- (data/transition_graph.py): one row per reachable (from, to) pair with the
+-- shortest-path cost and hop count, and up to 3 alternative routes
+-- ([{"path": [career ids], "cost": n}], cheapest first).
+
+-- 1. One row per career pair
+CREATE TABLE IF NOT EXISTS career_transitions (
+  from_id TEXT NOT NULL REFERENCES careers(id) ON DELETE CASCADE,
+  to_id TEXT NOT NULL REFERENCES careers(id) ON DELETE CASCADE,
+  cost REAL NOT NULL,
+  hops SMALLINT NOT NULL,
+  routes JSONB NOT NULL,
+  computed_at TIMESTAMPTZ DEFAULT now(),
+  PRIMARY KEY (from_id, to_id)
+);
+
+-- 2. Public read; only the service role writes
+ALTER TABLE career_transitions ENABLE ROW LEVEL SECURITY;
+
+DO $$ BEGIN
+  CREATE POLICY "Public read career transitions" ON career_transitions FOR SELECT USING (true);
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
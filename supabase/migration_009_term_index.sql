@@ -0,0 +1,50 @@
+-- PathIQ Migration 009: Controlled vocabulary and inverted index for matching
+-- Run this in Supabase SQL Editor if you already have existing tables.
+-- If setting up from scratch, just run schema.sql instead.
+--
+-- Filled by the data pipeline's seed_term_index stage (data/term_index.py,
+-- data/vocabulary.json). career_terms holds one posting list per field and
+-- canonical term (career_ids[i] has weights[i]); term_aliases resolves
+-- normalized user input ("cs", "comp sci") to canonical terms.
+
+-- 1. Posting lists
+CREATE TABLE IF NOT EXISTS career_terms (
+  field TEXT NOT NULL CHECK (field IN ('majors', 'interests', 'work_style', 'industries')),
+  term TEXT NOT NULL,
+  career_ids TEXT[] NOT NULL,
+  weights REAL[] NOT NULL,
+  df INTEGER NOT NULL,
+  computed_at TIMESTAMPTZ DEFAULT now(),
+  PRIMARY KEY (field, term),
+  CHECK (cardinality(career_ids) = cardinality(weights))
+);
+
+-- 2. Alias resolution
+CREATE TABLE IF NOT EXISTS term_aliases (
+  field TEXT NOT NULL,
+  alias TEXT NOT NULL,
+  terms TEXT[] NOT NULL,
+  computed_at TIMESTAMPTZ DEFAULT now(),
+  PRIMARY KEY (field, alias)
+);
+
+-- 3. GIN indexes for array containment/overlap filters (@>, &&)
+CREATE INDEX IF NOT EXISTS idx_career_terms_careers ON career_terms USING GIN (career_ids);
+CREATE INDEX IF NOT EXISTS idx_careers_preferred_majors ON careers USING GIN (preferred_majors);
+CREATE INDEX IF NOT EXISTS idx_careers_interests ON careers USING GIN (interests);
+CREATE INDEX IF NOT EXISTS idx_careers_work_style ON careers USING GIN (work_style);
+CREATE INDEX IF NOT EXISTS idx_careers_industries ON careers USING GIN (industries);
+
+-- 4. Public read; only the service role writes
+ALTER TABLE career_terms ENABLE ROW LEVEL SECURITY;
+ALTER TABLE term_aliases ENABLE ROW LEVEL SECURITY;
+
+DO $$ BEGIN
+  CREATE POLICY "Public read career terms" ON career_terms FOR SELECT USING (true);
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+DO $$ BEGIN
+  CREATE POLICY "Public read term aliases" ON term_aliases FOR SELECT USING (true);
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
@@ -0,0 +1,48 @@
+-- PathIQ Migration 010: Batch-scored career recommendations per user
+-- Run this in Supabase SQL Editor if you already have existing tables.
+-- If setting up from scratch, just run schema.sql instead.
+--
+-- Filled by data/profile_recommendations.py: every user's top-N careers by
+-- fit score, best first. profile_updated_at is the user_profiles.updated_at
+-- the row was scored from; the job only rescores profiles updated after the
+-- newest one, and rescores everyone when careers_version (career data,
+-- vocabulary and score weights) changes.
+
+-- 1. One row per user
+CREATE TABLE IF NOT EXISTS user_recommendations (
+  user_id UUID PRIMARY KEY REFERENCES auth.users(id) ON DELETE CASCADE,
+  career_ids TEXT[] NOT NULL,
+  scores REAL[] NOT NULL,
+  profile_updated_at TIMESTAMPTZ,
+  careers_version TEXT NOT NULL,
+  computed_at TIMESTAMPTZ DEFAULT now()
+);
+
+-- 2. Watermark lookups for incremental runs
+CREATE INDEX IF NOT EXISTS idx_user_recommendations_profile_updated
+  ON user_recommendations(profile_updated_at);
+CREATE INDEX IF NOT EXISTS idx_user_profiles_updated_at ON user_profiles(updated_at);
+
+-- 3. Server-side updated_at, so the watermark does not depend on client clocks
+CREATE OR REPLACE FUNCTION public.touch_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+  NEW.updated_at = now();
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS user_profiles_touch_updated_at ON user_profiles;
+CREATE TRIGGER user_profiles_touch_updated_at
+  BEFORE UPDATE ON user_profiles
+  FOR EACH ROW EXECUTE FUNCTION public.touch_updated_at();
+
+-- 4. Users read their own row; only the service role writes
+ALTER TABLE user_recommendations ENABLE ROW LEVEL SECURITY;
+
+DO $$ BEGIN
+  CREATE POLICY "Users can read own recommendations"
+    ON user_recommendations FOR SELECT
+    USING (auth.uid() = user_id);
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
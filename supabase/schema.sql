@@ -88,6 +88,17 @@ CREATE TABLE market_trends (
   UNIQUE(career_id, date)
 );
 
+-- Packed market trends: one row per career and metric, series[i] = start_year + i
+CREATE TABLE market_trend_series (
+  career_id TEXT REFERENCES careers(id) ON DELETE CASCADE,
+  metric TEXT NOT NULL CHECK (metric IN ('average_salary', 'employment_count', 'openings_count')),
+  start_year INTEGER NOT NULL,
+  series INTEGER[] NOT NULL,
+  source TEXT,
+  updated_at TIMESTAMPTZ DEFAULT now(),
+  PRIMARY KEY (career_id, metric)
+);
+
 -- Saved comparisons
 CREATE TABLE comparisons (
   id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -98,11 +109,96 @@ CREATE TABLE comparisons (
   created_at TIMESTAMPTZ DEFAULT now()
 );
 
+-- Shared AI comparisons (user-agnostic, pre-generated by data/generate_comparisons.py)
+CREATE TABLE shared_comparisons (
+  paths_key TEXT PRIMARY KEY,
+  paths_compared TEXT[] NOT NULL,
+  ai_analysis TEXT NOT NULL,
+  career_digests JSONB NOT NULL,
+  model TEXT,
+  generated_at TIMESTAMPTZ DEFAULT now()
+);
+
+-- Precomputed time-series features per career (seeded by the data pipeline)
+CREATE TABLE career_trend_features (
+  career_id TEXT PRIMARY KEY REFERENCES careers(id) ON DELETE CASCADE,
+  soc_code TEXT NOT NULL,
+  wage_cagr_5y NUMERIC(6,2),
+  wage_cagr_10y NUMERIC(6,2),
+  employment_cagr_5y NUMERIC(6,2),
+  employment_cagr_10y NUMERIC(6,2),
+  wage_yoy NUMERIC(6,2),
+  employment_yoy NUMERIC(6,2),
+  wage_volatility NUMERIC(6,2),
+  employment_volatility NUMERIC(6,2),
+  real_wage_cagr_5y NUMERIC(6,2),
+  real_wage_cagr_10y NUMERIC(6,2),
+  wage_trend NUMERIC(6,2),
+  employment_trend NUMERIC(6,2),
+  first_year INTEGER,
+  last_year INTEGER,
+  computed_at TIMESTAMPTZ DEFAULT now()
+);
+
+-- Skill-vector similar careers, best first (seeded by the data pipeline)
+CREATE TABLE career_similarities (
+  career_id TEXT PRIMARY KEY REFERENCES careers(id) ON DELETE CASCADE,
+  similar_ids TEXT[] NOT NULL,
+  scores REAL[] NOT NULL,
+  method TEXT,
+  computed_at TIMESTAMPTZ DEFAULT now(),
+  CHECK (cardinality(similar_ids) = cardinality(scores))
+);
+
+-- Precomputed transition routes per career pair (seeded by the data pipeline)
+CREATE TABLE career_transitions (
+  from_id TEXT NOT NULL REFERENCES careers(id) ON DELETE CASCADE,
+  to_id TEXT NOT NULL REFERENCES careers(id) ON DELETE CASCADE,
+  cost REAL NOT NULL,
+  hops SMALLINT NOT NULL,
+  routes JSONB NOT NULL,
+  computed_at TIMESTAMPTZ DEFAULT now(),
+  PRIMARY KEY (from_id, to_id)
+);
+
+-- Inverted index over majors/interests/work_style/industries (seeded by the data pipeline)
+CREATE TABLE career_terms (
+  field TEXT NOT NULL CHECK (field IN ('majors', 'interests', 'work_style', 'industries')),
+  term TEXT NOT NULL,
+  career_ids TEXT[] NOT NULL,
+  weights REAL[] NOT NULL,
+  df INTEGER NOT NULL,
+  computed_at TIMESTAMPTZ DEFAULT now(),
+  PRIMARY KEY (field, term),
+  CHECK (cardinality(career_ids) = cardinality(weights))
+);
+
+-- Normalized alias -> canonical terms (data/vocabulary.json)
+CREATE TABLE term_aliases (
+  field TEXT NOT NULL,
+  alias TEXT NOT NULL,
+  terms TEXT[] NOT NULL,
+  computed_at TIMESTAMPTZ DEFAULT now(),
+  PRIMARY KEY (field, alias)
+);
+
+-- Precomputed market aggregates (seeded by the data pipeline, read by /insights)
+CREATE TABLE market_aggregates (
+  kind TEXT PRIMARY KEY,
+  payload JSONB NOT NULL,
+  computed_at TIMESTAMPTZ DEFAULT now()
+);
+
 -- Create indexes
 CREATE INDEX idx_careers_path_type ON careers(path_type);
 CREATE INDEX idx_careers_category ON careers(category);
 CREATE INDEX idx_careers_salary ON careers(salary_median);
 CREATE INDEX idx_market_trends_career ON market_trends(career_id, date);
+CREATE INDEX idx_careers_preferred_majors ON careers USING GIN (preferred_majors);
+CREATE INDEX idx_careers_interests ON careers USING GIN (interests);
+CREATE INDEX idx_careers_work_style ON careers USING GIN (work_style);
+CREATE INDEX idx_careers_industries ON careers USING GIN (industries);
+CREATE INDEX idx_career_terms_careers ON career_terms USING GIN (career_ids);
 
 -- User profiles (for authenticated users)
 CREATE TABLE user_profiles (
@@ -118,24 +214,55 @@ CREATE TABLE user_profiles (
 );
 
 CREATE INDEX idx_user_profiles_id ON user_profiles(id);
+CREATE INDEX idx_user_profiles_updated_at ON user_profiles(updated_at);
+
+-- Top-N careers per user, best first (batch-scored by data/profile_recommendations.py)
+CREATE TABLE user_recommendations (
+  user_id UUID PRIMARY KEY REFERENCES auth.users(id) ON DELETE CASCADE,
+  career_ids TEXT[] NOT NULL,
+  scores REAL[] NOT NULL,
+  profile_updated_at TIMESTAMPTZ,
+  careers_version TEXT NOT NULL,
+  computed_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE INDEX idx_user_recommendations_profile_updated ON user_recommendations(profile_updated_at);
 
 -- Enable Row Level Security
 ALTER TABLE careers ENABLE ROW LEVEL SECURITY;
 ALTER TABLE market_trends ENABLE ROW LEVEL SECURITY;
+ALTER TABLE market_trend_series ENABLE ROW LEVEL SECURITY;
 ALTER TABLE comparisons ENABLE ROW LEVEL SECURITY;
+ALTER TABLE shared_comparisons ENABLE ROW LEVEL SECURITY;
+ALTER TABLE market_aggregates ENABLE ROW LEVEL SECURITY;
+ALTER TABLE career_trend_features ENABLE ROW LEVEL SECURITY;
+ALTER TABLE career_similarities ENABLE ROW LEVEL SECURITY;
+ALTER TABLE career_transitions ENABLE ROW LEVEL SECURITY;
+ALTER TABLE career_terms ENABLE ROW LEVEL SECURITY;
+ALTER TABLE term_aliases ENABLE ROW LEVEL SECURITY;
 ALTER TABLE user_profiles ENABLE ROW LEVEL SECURITY;
+ALTER TABLE user_recommendations ENABLE ROW LEVEL SECURITY;
 
 -- Public data policies
 CREATE POLICY "Public read careers" ON careers FOR SELECT USING (true);
 CREATE POLICY "Public read trends" ON market_trends FOR SELECT USING (true);
 CREATE POLICY "Public insert trends" ON market_trends FOR INSERT WITH CHECK (true);
 CREATE POLICY "Public update trends" ON market_trends FOR UPDATE USING (true);
+CREATE POLICY "Public read trend series" ON market_trend_series FOR SELECT USING (true);
 CREATE POLICY "Public all comparisons" ON comparisons FOR ALL USING (true);
+CREATE POLICY "Public read shared comparisons" ON shared_comparisons FOR SELECT USING (true);
+CREATE POLICY "Public read market aggregates" ON market_aggregates FOR SELECT USING (true);
+CREATE POLICY "Public read trend features" ON career_trend_features FOR SELECT USING (true);
+CREATE POLICY "Public read career similarities" ON career_similarities FOR SELECT USING (true);
+CREATE POLICY "Public read career transitions" ON career_transitions FOR SELECT USING (true);
+CREATE POLICY "Public read career terms" ON career_terms FOR SELECT USING (true);
+CREATE POLICY "Public read term aliases" ON term_aliases FOR SELECT USING (true);
 
 -- User profile policies (authenticated only)
 CREATE POLICY "Users can read own profile" ON user_profiles FOR SELECT USING (auth.uid() = id);
 CREATE POLICY "Users can insert own profile" ON user_profiles FOR INSERT WITH CHECK (auth.uid() = id);
 CREATE POLICY "Users can update own profile" ON user_profiles FOR UPDATE USING (auth.uid() = id);
+CREATE POLICY "Users can read own recommendations" ON user_recommendations FOR SELECT USING (auth.uid() = user_id);
 
 -- Auto-create profile on signup
 CREATE OR REPLACE FUNCTION public.handle_new_user()
@@ -149,3 +276,16 @@ $$ LANGUAGE plpgsql SECURITY DEFINER;
 CREATE TRIGGER on_auth_user_created
   AFTER INSERT ON auth.users
   FOR EACH ROW EXECUTE FUNCTION public.handle_new_user();
+
+-- Server-side updated_at (profile_recommendations.py uses it as its watermark)
+CREATE OR REPLACE FUNCTION public.touch_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+  NEW.updated_at = now();
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER user_profiles_touch_updated_at
+  BEFORE UPDATE ON user_profiles
+  FOR EACH ROW EXECUTE FUNCTION public.touch_updated_at();